@@ -0,0 +1,25 @@
+"""Add composite indexes for job step summaries and step pagination
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "003"
+down_revision: str | None = "002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_job_steps_job_status", "job_steps", ["job_id", "status"])
+    op.create_index("idx_job_steps_job_image", "job_steps", ["job_id", "product_image_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_job_steps_job_image", table_name="job_steps")
+    op.drop_index("idx_job_steps_job_status", table_name="job_steps")
@@ -0,0 +1,27 @@
+"""Add (updated_at, id) indexes for the change feed
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "004"
+down_revision: str | None = "003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_products_org_updated", "products", ["organization_id", "updated_at", "id"]
+    )
+    op.create_index("idx_analysis_results_updated", "analysis_results", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_analysis_results_updated", table_name="analysis_results")
+    op.drop_index("idx_products_org_updated", table_name="products")
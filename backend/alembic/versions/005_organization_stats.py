@@ -0,0 +1,74 @@
+"""Add organization_stats rollup for dashboard counters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "005"
+down_revision: str | None = "004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "organization_stats",
+        sa.Column(
+            "organization_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("total_products", sa.BigInteger, server_default="0", nullable=False),
+        sa.Column("total_images", sa.BigInteger, server_default="0", nullable=False),
+        sa.Column("completed_analyses", sa.BigInteger, server_default="0", nullable=False),
+        sa.Column("total_defects", sa.BigInteger, server_default="0", nullable=False),
+        sa.Column("processing_time_total_ms", sa.BigInteger, server_default="0", nullable=False),
+        sa.Column("processing_time_count", sa.BigInteger, server_default="0", nullable=False),
+        sa.Column("reconciled_at", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+    # Seed counters for existing organizations
+    op.execute("""
+        INSERT INTO organization_stats (
+            organization_id, total_products, total_images, completed_analyses,
+            total_defects, processing_time_total_ms, processing_time_count, reconciled_at
+        )
+        SELECT
+            o.id,
+            (SELECT count(*) FROM products p WHERE p.organization_id = o.id),
+            (SELECT count(*) FROM product_images pi
+                JOIN products p ON pi.product_id = p.id
+                WHERE p.organization_id = o.id),
+            (SELECT count(*) FROM analysis_results ar
+                JOIN product_images pi ON ar.product_image_id = pi.id
+                JOIN products p ON pi.product_id = p.id
+                WHERE p.organization_id = o.id AND ar.status = 'completed'),
+            (SELECT count(*) FROM detected_defects dd
+                JOIN analysis_results ar ON dd.analysis_result_id = ar.id
+                JOIN product_images pi ON ar.product_image_id = pi.id
+                JOIN products p ON pi.product_id = p.id
+                WHERE p.organization_id = o.id),
+            (SELECT coalesce(sum(ar.processing_time_ms), 0) FROM analysis_results ar
+                JOIN product_images pi ON ar.product_image_id = pi.id
+                JOIN products p ON pi.product_id = p.id
+                WHERE p.organization_id = o.id AND ar.status = 'completed'),
+            (SELECT count(ar.processing_time_ms) FROM analysis_results ar
+                JOIN product_images pi ON ar.product_image_id = pi.id
+                JOIN products p ON pi.product_id = p.id
+                WHERE p.organization_id = o.id AND ar.status = 'completed'),
+            now()
+        FROM organizations o
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("organization_stats")
@@ -0,0 +1,54 @@
+"""Add hourly/daily analytics rollups
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+revision: str = "006"
+down_revision: str | None = "005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_rollups",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column(
+            "organization_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("granularity", sa.String(10), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("category", sa.String(100), nullable=False),
+        sa.Column("images_processed", sa.Integer, server_default="0", nullable=False),
+        sa.Column("images_failed", sa.Integer, server_default="0", nullable=False),
+        sa.Column("images_with_defects", sa.Integer, server_default="0", nullable=False),
+        sa.Column("defect_count", sa.Integer, server_default="0", nullable=False),
+        sa.Column("fallback_descriptions", sa.Integer, server_default="0", nullable=False),
+        sa.Column("processing_time_total_ms", sa.BigInteger, server_default="0", nullable=False),
+        sa.Column("latency_histogram", ARRAY(sa.Integer), server_default="{}", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint(
+            "organization_id", "granularity", "bucket_start", "category",
+            name="uq_analytics_rollup_bucket",
+        ),
+    )
+    op.create_index(
+        "idx_analytics_rollups_granularity_bucket",
+        "analytics_rollups",
+        ["granularity", "bucket_start"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_rollups")
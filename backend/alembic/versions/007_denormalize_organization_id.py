@@ -0,0 +1,110 @@
+"""Denormalize organization_id onto analysis and job tables
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "007"
+down_revision: str | None = "006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("analysis_results", "detected_defects", "processing_jobs", "job_steps")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column("organization_id", UUID(as_uuid=True), nullable=True))
+
+    # ---- Backfill ----
+    op.execute("""
+        UPDATE analysis_results ar
+        SET organization_id = p.organization_id
+        FROM product_images pi
+        JOIN products p ON pi.product_id = p.id
+        WHERE ar.product_image_id = pi.id
+    """)
+    op.execute("""
+        UPDATE detected_defects dd
+        SET organization_id = ar.organization_id
+        FROM analysis_results ar
+        WHERE dd.analysis_result_id = ar.id
+    """)
+    # Jobs take the organization of the images their steps cover
+    op.execute("""
+        UPDATE processing_jobs j
+        SET organization_id = owner.organization_id
+        FROM (
+            SELECT DISTINCT ON (js.job_id) js.job_id, p.organization_id
+            FROM job_steps js
+            JOIN product_images pi ON js.product_image_id = pi.id
+            JOIN products p ON pi.product_id = p.id
+        ) owner
+        WHERE j.id = owner.job_id
+    """)
+    op.execute("""
+        UPDATE job_steps js
+        SET organization_id = j.organization_id
+        FROM processing_jobs j
+        WHERE js.job_id = j.id
+    """)
+
+    # Analysis rows always resolve to a product; job rows may predate organizations
+    op.alter_column("analysis_results", "organization_id", nullable=False)
+    op.alter_column("detected_defects", "organization_id", nullable=False)
+
+    for table in TABLES:
+        op.create_foreign_key(
+            f"fk_{table}_organization_id",
+            table,
+            "organizations",
+            ["organization_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+    op.create_index(
+        "idx_analysis_results_org_created", "analysis_results", ["organization_id", "created_at"]
+    )
+    op.create_index(
+        "idx_analysis_results_org_status", "analysis_results", ["organization_id", "status"]
+    )
+    op.create_index(
+        "idx_analysis_results_org_updated",
+        "analysis_results",
+        ["organization_id", "updated_at", "id"],
+    )
+    # The change feed is always scoped to one organization now
+    op.drop_index("idx_analysis_results_updated", table_name="analysis_results")
+    op.create_index(
+        "idx_detected_defects_org_type", "detected_defects", ["organization_id", "defect_type"]
+    )
+    op.create_index(
+        "idx_processing_jobs_org_created", "processing_jobs", ["organization_id", "created_at"]
+    )
+    op.create_index(
+        "idx_processing_jobs_org_status", "processing_jobs", ["organization_id", "status"]
+    )
+    op.create_index("idx_job_steps_org_status", "job_steps", ["organization_id", "status"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_job_steps_org_status", table_name="job_steps")
+    op.drop_index("idx_processing_jobs_org_status", table_name="processing_jobs")
+    op.drop_index("idx_processing_jobs_org_created", table_name="processing_jobs")
+    op.drop_index("idx_detected_defects_org_type", table_name="detected_defects")
+    op.create_index("idx_analysis_results_updated", "analysis_results", ["updated_at", "id"])
+    op.drop_index("idx_analysis_results_org_updated", table_name="analysis_results")
+    op.drop_index("idx_analysis_results_org_status", table_name="analysis_results")
+    op.drop_index("idx_analysis_results_org_created", table_name="analysis_results")
+
+    for table in TABLES:
+        op.drop_constraint(f"fk_{table}_organization_id", table, type_="foreignkey")
+        op.drop_column(table, "organization_id")
@@ -0,0 +1,56 @@
+"""Add keyset index and full-text/trigram search for products
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "008"
+down_revision: str | None = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(ai_description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column(
+        "products",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        ),
+    )
+    op.create_index(
+        "idx_products_search_vector", "products", ["search_vector"], postgresql_using="gin"
+    )
+    op.create_index(
+        "idx_products_title_trgm",
+        "products",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "idx_products_org_created", "products", ["organization_id", "created_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_products_org_created", table_name="products")
+    op.drop_index("idx_products_title_trgm", table_name="products")
+    op.drop_index("idx_products_search_vector", table_name="products")
+    op.drop_column("products", "search_vector")
@@ -0,0 +1,66 @@
+"""Add denormalized attribute/defect facets to products
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision: str = "009"
+down_revision: str | None = "008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "products", sa.Column("facets", JSONB, server_default="{}", nullable=False)
+    )
+
+    # Backfill from existing analysis output, same shape the pipeline writes
+    op.execute(
+        """
+        UPDATE products p
+        SET facets = f.facets
+        FROM (
+            SELECT product_id, jsonb_object_agg(name, vals) AS facets
+            FROM (
+                SELECT product_id, name, jsonb_agg(value ORDER BY value) AS vals
+                FROM (
+                    SELECT pi.product_id,
+                           lower(ea.attribute_name) AS name,
+                           lower(trim(ea.attribute_value)) AS value
+                    FROM extracted_attributes ea
+                    JOIN analysis_results ar ON ar.id = ea.analysis_result_id
+                    JOIN product_images pi ON pi.id = ar.product_image_id
+                    UNION
+                    SELECT pi.product_id, 'defect', lower(dd.defect_type)
+                    FROM detected_defects dd
+                    JOIN analysis_results ar ON ar.id = dd.analysis_result_id
+                    JOIN product_images pi ON pi.id = ar.product_image_id
+                ) pairs
+                GROUP BY product_id, name
+            ) grouped
+            GROUP BY product_id
+        ) f
+        WHERE p.id = f.product_id
+        """
+    )
+
+    op.create_index(
+        "idx_products_facets",
+        "products",
+        ["facets"],
+        postgresql_using="gin",
+        postgresql_ops={"facets": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_products_facets", table_name="products")
+    op.drop_column("products", "facets")
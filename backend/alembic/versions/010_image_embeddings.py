@@ -0,0 +1,56 @@
+"""Add persisted float16 image embeddings
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "010"
+down_revision: str | None = "009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    op.create_table(
+        "image_embeddings",
+        sa.Column(
+            "product_image_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("product_images.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "product_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("products.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "organization_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("model_version", sa.String(50), nullable=False),
+        sa.Column("embedding", HALFVEC(1792), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "idx_image_embeddings_org_product", "image_embeddings", ["organization_id", "product_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_image_embeddings_org_product", table_name="image_embeddings")
+    op.drop_table("image_embeddings")
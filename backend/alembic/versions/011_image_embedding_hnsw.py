@@ -0,0 +1,30 @@
+"""Add HNSW index over image embeddings for similarity search
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "011"
+down_revision: str | None = "010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_image_embeddings_hnsw",
+        "image_embeddings",
+        ["embedding"],
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"embedding": "halfvec_cosine_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_image_embeddings_hnsw", table_name="image_embeddings")
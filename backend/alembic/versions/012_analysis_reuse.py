@@ -0,0 +1,55 @@
+"""Add content hashes and reuse tracking for identical images
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision: str = "012"
+down_revision: str | None = "011"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("product_images", sa.Column("content_sha256", sa.String(64)))
+    op.create_index(
+        "ix_product_images_content_sha256", "product_images", ["content_sha256"]
+    )
+
+    op.add_column(
+        "analysis_results",
+        sa.Column("model_versions", JSONB, server_default="{}", nullable=False),
+    )
+    op.add_column(
+        "analysis_results",
+        sa.Column(
+            "reused_from_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey(
+                "analysis_results.id",
+                name="fk_analysis_results_reused_from_id",
+                ondelete="SET NULL",
+            ),
+            nullable=True,
+        ),
+    )
+
+    op.add_column(
+        "organization_stats",
+        sa.Column("reused_analyses", sa.BigInteger, server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("organization_stats", "reused_analyses")
+    op.drop_column("analysis_results", "reused_from_id")
+    op.drop_column("analysis_results", "model_versions")
+    op.drop_index("ix_product_images_content_sha256", table_name="product_images")
+    op.drop_column("product_images", "content_sha256")
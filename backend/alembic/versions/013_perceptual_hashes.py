@@ -0,0 +1,34 @@
+"""Add perceptual hashes for near-duplicate detection
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import ARRAY
+
+revision: str = "013"
+down_revision: str | None = "012"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("product_images", sa.Column("perceptual_hash", sa.BigInteger))
+    op.add_column("product_images", sa.Column("phash_bands", ARRAY(sa.Integer)))
+    op.create_index(
+        "idx_product_images_phash_bands",
+        "product_images",
+        ["phash_bands"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_product_images_phash_bands", table_name="product_images")
+    op.drop_column("product_images", "phash_bands")
+    op.drop_column("product_images", "perceptual_hash")
@@ -0,0 +1,25 @@
+"""Add organization/id index on analysis results for backfill scans
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "014"
+down_revision: str | None = "013"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_analysis_results_org_id", "analysis_results", ["organization_id", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_analysis_results_org_id", table_name="analysis_results")
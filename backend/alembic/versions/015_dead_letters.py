@@ -0,0 +1,70 @@
+"""Add dead-letter table for permanently failed pipeline tasks
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision: str = "015"
+down_revision: str | None = "014"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dead_letters",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "organization_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+        ),
+        sa.Column(
+            "job_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("processing_jobs.id", ondelete="SET NULL"),
+        ),
+        sa.Column(
+            "product_image_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("product_images.id", ondelete="CASCADE"),
+        ),
+        sa.Column("task_name", sa.String(255), nullable=False),
+        sa.Column("task_kwargs", JSONB, server_default="{}", nullable=False),
+        sa.Column("failure_kind", sa.String(20), nullable=False),
+        sa.Column("error_category", sa.String(50), nullable=False),
+        sa.Column("error_type", sa.String(255), nullable=False),
+        sa.Column("error_message", sa.Text),
+        sa.Column("traceback", sa.Text),
+        sa.Column("failed_step", sa.String(100)),
+        sa.Column("attempts", sa.Integer, server_default="1", nullable=False),
+        sa.Column("redriven_at", sa.DateTime(timezone=True)),
+        sa.Column(
+            "redrive_job_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("processing_jobs.id", ondelete="SET NULL"),
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_dead_letters_job_id", "dead_letters", ["job_id"])
+    op.create_index(
+        "idx_dead_letters_org_created", "dead_letters", ["organization_id", "created_at"]
+    )
+    op.create_index(
+        "idx_dead_letters_org_pending", "dead_letters", ["organization_id", "redriven_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_dead_letters_org_pending", table_name="dead_letters")
+    op.drop_index("idx_dead_letters_org_created", table_name="dead_letters")
+    op.drop_index("ix_dead_letters_job_id", table_name="dead_letters")
+    op.drop_table("dead_letters")
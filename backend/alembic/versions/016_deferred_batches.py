@@ -0,0 +1,28 @@
+"""Add deadline to processing jobs for deferrable batches
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "016"
+down_revision: str | None = "015"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("processing_jobs", sa.Column("deadline", sa.DateTime(timezone=True)))
+    op.create_index(
+        "idx_processing_jobs_status_deadline", "processing_jobs", ["status", "deadline"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_processing_jobs_status_deadline", table_name="processing_jobs")
+    op.drop_column("processing_jobs", "deadline")
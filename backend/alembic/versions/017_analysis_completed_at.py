@@ -0,0 +1,31 @@
+"""Add completed_at to analysis results for analytics rollups
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "017"
+down_revision: str | None = "016"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("analysis_results", sa.Column("completed_at", sa.DateTime(timezone=True)))
+    # Best available finish time for existing results
+    op.execute(
+        "UPDATE analysis_results SET completed_at = updated_at "
+        "WHERE status IN ('completed', 'failed')"
+    )
+    op.create_index("idx_analysis_results_completed", "analysis_results", ["completed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_analysis_results_completed", table_name="analysis_results")
+    op.drop_column("analysis_results", "completed_at")
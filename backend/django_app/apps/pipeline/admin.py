@@ -76,6 +76,7 @@ class ProcessingJobAdmin(admin.ModelAdmin):
             "completed": "#28a745",
             "processing": "#007bff",
             "queued": "#6c757d",
+            "deferred": "#17a2b8",
             "failed": "#dc3545",
             "cancelled": "#ffc107",
         }
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, status
+from sqlalchemy import func, select
+
+from fastapi_app.api.deps import CurrentOrg, CurrentUser, DBSession
+from fastapi_app.services.job_service import build_job_summaries
+from shared.backfill import backfill_conditions
+from shared.constants import JobStatus, JobType
+from shared.exceptions import ValidationError
+from shared.models.analysis import AnalysisResult
+from shared.models.pipeline import ProcessingJob
+from shared.schemas.pipeline import BackfillCreateRequest, ProcessingJobSummaryResponse
+
+router = APIRouter()
+
+
+@router.post("", response_model=ProcessingJobSummaryResponse, status_code=status.HTTP_201_CREATED)
+async def create_backfill(
+    data: BackfillCreateRequest,
+    db: DBSession,
+    current_user: CurrentUser,
+    current_org: CurrentOrg,
+):
+    """
+    Re-score the organization's completed analyses with a new model version.
+
+    Progress is reported on the returned processing job; cancel it like a batch job.
+    """
+    running = await db.execute(
+        select(ProcessingJob.id).where(
+            ProcessingJob.organization_id == current_org.id,
+            ProcessingJob.job_type == JobType.BACKFILL.value,
+            ProcessingJob.status.in_([JobStatus.QUEUED.value, JobStatus.PROCESSING.value]),
+        ).limit(1)
+    )
+    if running.scalar_one_or_none():
+        raise ValidationError("A backfill is already running for this organization")
+
+    conditions = backfill_conditions(current_org.id, data.model_type.value, data.model_version)
+    total = (await db.execute(
+        select(func.count(AnalysisResult.id)).where(*conditions)
+    )).scalar() or 0
+
+    job = ProcessingJob(
+        organization_id=current_org.id,
+        user_id=current_user.id,
+        job_type=JobType.BACKFILL.value,
+        status=JobStatus.QUEUED.value,
+        total_images=total,
+        metadata_={"model_type": data.model_type.value, "model_version": data.model_version},
+    )
+    db.add(job)
+    await db.flush()
+
+    from workers.tasks.backfill import start_backfill
+
+    task = start_backfill.delay(str(job.id))
+    job.celery_task_id = task.id
+    await db.flush()
+
+    return (await build_job_summaries(db, [job]))[0]
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Request
+
+from fastapi_app.api.deps import CurrentOrg, CurrentUser
+from fastapi_app.services.capacity_service import get_org_capacity
+from shared.schemas.organization import OrganizationCapacityResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=OrganizationCapacityResponse)
+async def get_capacity(
+    request: Request,
+    current_user: CurrentUser,
+    current_org: CurrentOrg,
+):
+    """Image tasks the organization is running and how many wait for a slot."""
+    return await get_org_capacity(request.app.state.redis, current_org)
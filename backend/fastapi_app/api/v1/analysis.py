@@ -1,13 +1,13 @@
 import uuid
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from fastapi_app.api.deps import CurrentOrg, CurrentUser, DBSession
+from fastapi_app.services.admission_service import admit_interactive_image, dispatch_image
 from shared.exceptions import NotFoundError
 from shared.models.analysis import AnalysisResult
-from shared.models.product import Product, ProductImage
 from shared.schemas.analysis import AnalysisResultResponse
 
 router = APIRouter()
@@ -22,15 +22,13 @@ async def get_analysis_result(
 ):
     result = await db.execute(
         select(AnalysisResult)
-        .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
-        .join(Product, ProductImage.product_id == Product.id)
         .options(
             selectinload(AnalysisResult.extracted_attributes),
             selectinload(AnalysisResult.detected_defects),
         )
         .where(
             AnalysisResult.product_image_id == image_id,
-            Product.organization_id == current_org.id,
+            AnalysisResult.organization_id == current_org.id,
         )
     )
     analysis = result.scalar_one_or_none()
@@ -42,33 +40,51 @@ async def get_analysis_result(
 @router.post("/{image_id}/retry", response_model=dict)
 async def retry_analysis(
     image_id: uuid.UUID,
+    request: Request,
     db: DBSession,
     current_user: CurrentUser,
     current_org: CurrentOrg,
+    force_recompute: bool = False,
 ):
-    from datetime import datetime, UTC
-    from shared.constants import AnalysisStatus, JobStatus, JobType, StepName, StepStatus
-    from shared.models.pipeline import ProcessingJob, JobStep
+    from datetime import UTC, datetime
+
+    from shared.constants import (
+        AdmissionAction,
+        AnalysisStatus,
+        JobStatus,
+        JobType,
+        StepName,
+        StepStatus,
+    )
+    from shared.models.pipeline import JobStep, ProcessingJob
 
     result = await db.execute(
-        select(AnalysisResult)
-        .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
-        .join(Product, ProductImage.product_id == Product.id)
-        .where(
+        select(AnalysisResult).where(
             AnalysisResult.product_image_id == image_id,
-            Product.organization_id == current_org.id,
+            AnalysisResult.organization_id == current_org.id,
         )
     )
     analysis = result.scalar_one_or_none()
     if not analysis:
         raise NotFoundError("Analysis result", str(image_id))
 
+    admission = await admit_interactive_image(request.app.state.redis)
+
     # Reset analysis
+    if analysis.status == AnalysisStatus.COMPLETED.value:
+        from fastapi_app.services.stats_service import record_org_stats
+        from shared.org_stats import completed_analysis_deltas, defect_counts
+
+        defects = dict((await db.execute(defect_counts([analysis.id]))).all())
+        await record_org_stats(db, current_org.id, **completed_analysis_deltas(
+            analysis, sign=-1, defects=defects.get(analysis.id, 0)
+        ))
     analysis.status = AnalysisStatus.PENDING.value
     analysis.error_message = None
 
     # Create new processing job
     job = ProcessingJob(
+        organization_id=current_org.id,
         user_id=current_user.id,
         job_type=JobType.SINGLE.value,
         status=JobStatus.QUEUED.value,
@@ -80,6 +96,7 @@ async def retry_analysis(
 
     for step_name in StepName:
         db.add(JobStep(
+            organization_id=current_org.id,
             job_id=job.id,
             product_image_id=image_id,
             step_name=step_name.value,
@@ -87,10 +104,16 @@ async def retry_analysis(
         ))
     await db.flush()
 
-    from workers.tasks.image_processing import process_image
-
-    task = process_image.delay(str(image_id), str(job.id))
-    job.celery_task_id = task.id
+    job.celery_task_id = await dispatch_image(
+        db, job, image_id, admission, force_recompute=force_recompute
+    )
     await db.flush()
 
-    return {"job_id": str(job.id), "status": "queued", "message": "Analysis retry started"}
+    deferred = admission.action == AdmissionAction.DEFER
+    return {
+        "job_id": str(job.id),
+        "status": "deferred" if deferred else "queued",
+        "message": "Analysis retry queued behind batch work" if deferred
+        else "Analysis retry started",
+        "estimated_wait_seconds": admission.estimated_wait_seconds,
+    }
@@ -1,11 +1,13 @@
 import uuid
-from datetime import datetime, UTC
+from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
 from fastapi_app.api.deps import CurrentOrg, CurrentUser, DBSession
+from fastapi_app.services.admission_service import admit_batch_images
+from fastapi_app.services.job_service import build_job_summaries, cancel_job
+from shared.config import get_settings
 from shared.constants import (
     AnalysisStatus,
     JobStatus,
@@ -17,14 +19,33 @@ from shared.exceptions import NotFoundError, ValidationError
 from shared.models.analysis import AnalysisResult
 from shared.models.pipeline import JobStep, ProcessingJob
 from shared.models.product import Product, ProductImage
-from shared.schemas.pipeline import BatchCreateRequest, ProcessingJobResponse
+from shared.schemas.pipeline import BatchCreateRequest, ProcessingJobSummaryResponse
 
 router = APIRouter()
+settings = get_settings()
+
+
+def _deferred_deadline(data: BatchCreateRequest) -> datetime | None:
+    if not data.deferrable and data.deadline is None:
+        return None
+    now = datetime.now(UTC)
+    if data.deadline is None:
+        return now + timedelta(hours=settings.deferred_batch_default_hours)
+    if data.deadline.tzinfo is None:
+        raise ValidationError("deadline must include a timezone")
+    if data.deadline <= now:
+        raise ValidationError("deadline must be in the future")
+    if data.deadline > now + timedelta(hours=settings.deferred_batch_max_hours):
+        raise ValidationError(
+            f"deadline can be at most {settings.deferred_batch_max_hours} hours ahead"
+        )
+    return data.deadline
 
 
-@router.post("", response_model=ProcessingJobResponse, status_code=201)
+@router.post("", response_model=ProcessingJobSummaryResponse, status_code=201)
 async def create_batch_job(
     data: BatchCreateRequest,
+    request: Request,
     db: DBSession,
     current_user: CurrentUser,
     current_org: CurrentOrg,
@@ -47,12 +68,21 @@ async def create_batch_job(
     if len(images) != len(data.image_ids):
         raise ValidationError("Some image IDs are invalid or don't belong to this product")
 
+    deadline = _deferred_deadline(data)
+    # Deferred batches are admitted when the scheduler releases them, not now
+    admission = None
+    if deadline is None:
+        admission = await admit_batch_images(request.app.state.redis, current_org.id, len(images))
+
     job = ProcessingJob(
+        organization_id=current_org.id,
         user_id=current_user.id,
         job_type=JobType.BATCH.value,
-        status=JobStatus.QUEUED.value,
+        status=JobStatus.QUEUED.value if deadline is None else JobStatus.DEFERRED.value,
         total_images=len(images),
-        started_at=datetime.now(UTC),
+        started_at=datetime.now(UTC) if deadline is None else None,
+        deadline=deadline,
+        metadata_={"force_recompute": data.force_recompute} if deadline else {},
     )
     db.add(job)
     await db.flush()
@@ -63,6 +93,7 @@ async def create_batch_job(
         )
         if not existing.scalar_one_or_none():
             db.add(AnalysisResult(
+                organization_id=current_org.id,
                 product_image_id=image.id,
                 model_version="pending",
                 status=AnalysisStatus.PENDING.value,
@@ -70,6 +101,7 @@ async def create_batch_job(
 
         for step_name in StepName:
             db.add(JobStep(
+                organization_id=current_org.id,
                 job_id=job.id,
                 product_image_id=image.id,
                 step_name=step_name.value,
@@ -78,26 +110,29 @@ async def create_batch_job(
 
     await db.flush()
 
+    if deadline is not None:
+        return (await build_job_summaries(db, [job]))[0]
+
     from workers.tasks.batch_processing import process_batch
 
-    task = process_batch.delay(str(job.id), [str(img.id) for img in images])
+    task = process_batch.delay(
+        str(job.id), [str(img.id) for img in images], force_recompute=data.force_recompute
+    )
     job.celery_task_id = task.id
     await db.flush()
-    await db.refresh(job, attribute_names=["steps"])
 
-    return job
+    summary = (await build_job_summaries(db, [job]))[0]
+    return summary.model_copy(update={"estimated_wait_seconds": admission.estimated_wait_seconds})
 
 
-@router.get("/{job_id}", response_model=ProcessingJobResponse)
+@router.get("/{job_id}", response_model=ProcessingJobSummaryResponse)
 async def get_batch_status(
     job_id: uuid.UUID,
     db: DBSession,
     current_user: CurrentUser,
 ):
     result = await db.execute(
-        select(ProcessingJob)
-        .options(selectinload(ProcessingJob.steps))
-        .where(
+        select(ProcessingJob).where(
             ProcessingJob.id == job_id,
             ProcessingJob.user_id == current_user.id,
         )
@@ -105,12 +140,13 @@ async def get_batch_status(
     job = result.scalar_one_or_none()
     if not job:
         raise NotFoundError("Batch job", str(job_id))
-    return job
+    return (await build_job_summaries(db, [job]))[0]
 
 
 @router.delete("/{job_id}", status_code=204)
 async def cancel_batch_job(
     job_id: uuid.UUID,
+    request: Request,
     db: DBSession,
     current_user: CurrentUser,
 ):
@@ -124,10 +160,4 @@ async def cancel_batch_job(
     if not job:
         raise NotFoundError("Batch job", str(job_id))
 
-    if job.celery_task_id:
-        from workers.celery_app import celery_app
-        celery_app.control.revoke(job.celery_task_id, terminate=True)
-
-    job.status = JobStatus.CANCELLED.value
-    job.completed_at = datetime.now(UTC)
-    await db.flush()
+    await cancel_job(db, request.app.state.redis, job)
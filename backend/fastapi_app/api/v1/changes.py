@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Query
+
+from fastapi_app.api.deps import CurrentOrg, CurrentUser, DBSession
+from fastapi_app.services.change_feed_service import get_changes
+from shared.schemas.changes import ChangeFeedResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=ChangeFeedResponse)
+async def list_changes(
+    db: DBSession,
+    current_user: CurrentUser,
+    current_org: CurrentOrg,
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=500),
+):
+    return await get_changes(db, current_org.id, cursor=cursor, limit=limit)
@@ -1,10 +1,13 @@
+from datetime import datetime
+
 from fastapi import APIRouter
 from sqlalchemy import func, select
 
 from fastapi_app.api.deps import CurrentOrg, CurrentUser, DBSession
-from shared.models.analysis import AnalysisResult, DetectedDefect
+from fastapi_app.services.stats_service import get_analytics_timeseries, get_org_stats
+from shared.constants import RollupGranularity
 from shared.models.pipeline import ProcessingJob
-from shared.models.product import Product, ProductImage
+from shared.models.product import Product
 
 router = APIRouter()
 
@@ -13,71 +16,44 @@ router = APIRouter()
 async def get_dashboard_stats(
     db: DBSession, current_user: CurrentUser, current_org: CurrentOrg
 ):
-    total_products = (
-        await db.execute(
-            select(func.count(Product.id)).where(Product.organization_id == current_org.id)
-        )
-    ).scalar() or 0
-
-    total_images = (
-        await db.execute(
-            select(func.count(ProductImage.id))
-            .join(Product, ProductImage.product_id == Product.id)
-            .where(Product.organization_id == current_org.id)
-        )
-    ).scalar() or 0
-
-    completed_analyses = (
-        await db.execute(
-            select(func.count(AnalysisResult.id))
-            .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
-            .join(Product, ProductImage.product_id == Product.id)
-            .where(Product.organization_id == current_org.id, AnalysisResult.status == "completed")
-        )
-    ).scalar() or 0
-
-    total_defects = (
-        await db.execute(
-            select(func.count(DetectedDefect.id))
-            .join(AnalysisResult, DetectedDefect.analysis_result_id == AnalysisResult.id)
-            .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
-            .join(Product, ProductImage.product_id == Product.id)
-            .where(Product.organization_id == current_org.id)
-        )
-    ).scalar() or 0
+    stats = await get_org_stats(db, current_org.id)
 
     active_jobs = (
         await db.execute(
             select(func.count(ProcessingJob.id)).where(
                 ProcessingJob.user_id == current_user.id,
-                ProcessingJob.status.in_(["queued", "processing"]),
+                ProcessingJob.status.in_(["queued", "deferred", "processing"]),
             )
         )
     ).scalar() or 0
 
-    avg_processing_time = (
-        await db.execute(
-            select(func.avg(AnalysisResult.processing_time_ms))
-            .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
-            .join(Product, ProductImage.product_id == Product.id)
-            .where(
-                Product.organization_id == current_org.id,
-                AnalysisResult.status == "completed",
-                AnalysisResult.processing_time_ms.isnot(None),
-            )
-        )
-    ).scalar()
-
     return {
-        "total_products": total_products,
-        "total_images": total_images,
-        "completed_analyses": completed_analyses,
-        "total_defects": total_defects,
+        "total_products": stats.total_products,
+        "total_images": stats.total_images,
+        "completed_analyses": stats.completed_analyses,
+        "total_defects": stats.total_defects,
         "active_jobs": active_jobs,
-        "avg_processing_time_ms": round(avg_processing_time) if avg_processing_time else None,
+        "avg_processing_time_ms": stats.avg_processing_time_ms,
+        "reused_analyses": stats.reused_analyses,
+        "analysis_reuse_rate": stats.analysis_reuse_rate,
     }
 
 
+@router.get("/timeseries")
+async def get_timeseries(
+    db: DBSession,
+    current_user: CurrentUser,
+    current_org: CurrentOrg,
+    granularity: RollupGranularity = RollupGranularity.HOUR,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    category: str | None = None,
+):
+    return await get_analytics_timeseries(
+        db, current_org.id, granularity, start=start, end=end, category=category
+    )
+
+
 @router.get("/recent")
 async def get_recent_activity(db: DBSession, current_user: CurrentUser):
     result = await db.execute(
@@ -0,0 +1,51 @@
+import uuid
+
+from fastapi import APIRouter, Query, Request, status
+
+from fastapi_app.api.deps import CurrentOrg, CurrentUser, DBSession
+from fastapi_app.services.dead_letter_service import list_dead_letters, redrive_dead_letters
+from fastapi_app.services.job_service import build_job_summaries
+from shared.schemas.pipeline import (
+    DeadLetterListResponse,
+    ProcessingJobSummaryResponse,
+    RedriveRequest,
+)
+
+router = APIRouter()
+
+
+@router.get("", response_model=DeadLetterListResponse)
+async def get_dead_letters(
+    db: DBSession,
+    current_user: CurrentUser,
+    current_org: CurrentOrg,
+    error_category: str | None = None,
+    job_id: uuid.UUID | None = None,
+    include_redriven: bool = False,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    """Tasks that failed permanently or exhausted their retries, newest first."""
+    return await list_dead_letters(
+        db, current_org.id, error_category, job_id, include_redriven, limit, offset
+    )
+
+
+@router.post(
+    "/redrive",
+    response_model=ProcessingJobSummaryResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def redrive(
+    data: RedriveRequest,
+    request: Request,
+    db: DBSession,
+    current_user: CurrentUser,
+    current_org: CurrentOrg,
+):
+    """Re-run the selected dead letters as one batch job, e.g. after fixing their cause."""
+    job, admission = await redrive_dead_letters(
+        db, request.app.state.redis, current_org.id, current_user.id, data
+    )
+    summary = (await build_job_summaries(db, [job]))[0]
+    return summary.model_copy(update={"estimated_wait_seconds": admission.estimated_wait_seconds})
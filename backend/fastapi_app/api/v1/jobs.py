@@ -1,13 +1,21 @@
+import json
 import uuid
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
 
 from fastapi_app.api.deps import CurrentUser, DBSession
+from fastapi_app.services.job_event_service import get_owned_job, stream_job_events
+from fastapi_app.services.job_service import build_job_summaries, list_job_steps
+from shared.constants import StepStatus
 from shared.exceptions import NotFoundError
 from shared.models.pipeline import ProcessingJob
-from shared.schemas.pipeline import ProcessingJobListResponse, ProcessingJobResponse
+from shared.schemas.pipeline import (
+    JobStepListResponse,
+    ProcessingJobListResponse,
+    ProcessingJobSummaryResponse,
+)
 
 router = APIRouter()
 
@@ -31,33 +39,78 @@ async def list_jobs(
 
     total = (await db.execute(count_query)).scalar() or 0
 
-    query = (
-        query.options(selectinload(ProcessingJob.steps))
-        .order_by(ProcessingJob.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
+    query = query.order_by(ProcessingJob.created_at.desc()).offset(offset).limit(limit)
     result = await db.execute(query)
-    items = list(result.scalars().all())
+    jobs = list(result.scalars().all())
 
-    return {"items": items, "total": total}
+    return {"items": await build_job_summaries(db, jobs), "total": total}
 
 
-@router.get("/{job_id}", response_model=ProcessingJobResponse)
+@router.get("/{job_id}", response_model=ProcessingJobSummaryResponse)
 async def get_job_detail(
     job_id: uuid.UUID,
     db: DBSession,
     current_user: CurrentUser,
 ):
-    result = await db.execute(
-        select(ProcessingJob)
-        .options(selectinload(ProcessingJob.steps))
-        .where(
-            ProcessingJob.id == job_id,
-            ProcessingJob.user_id == current_user.id,
-        )
+    job = await get_owned_job(db, job_id, current_user.id)
+    if not job:
+        raise NotFoundError("Processing job", str(job_id))
+    return (await build_job_summaries(db, [job]))[0]
+
+
+@router.get("/{job_id}/steps", response_model=JobStepListResponse)
+async def list_steps(
+    job_id: uuid.UUID,
+    db: DBSession,
+    current_user: CurrentUser,
+    status: StepStatus | None = None,
+    image_id: uuid.UUID | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    job = await get_owned_job(db, job_id, current_user.id)
+    if not job:
+        raise NotFoundError("Processing job", str(job_id))
+    return await list_job_steps(
+        db, job_id, status=status, image_id=image_id, limit=limit, offset=offset
     )
-    job = result.scalar_one_or_none()
+
+
+@router.get("/{job_id}/events")
+async def stream_job_event_log(
+    job_id: uuid.UUID,
+    request: Request,
+    db: DBSession,
+    current_user: CurrentUser,
+    last_event_id: str | None = Header(None),
+    offset: str | None = Query(None, description="Resume after this event ID"),
+):
+    """Server-Sent Events feed of a job's progress, resumable via Last-Event-ID."""
+    job = await get_owned_job(db, job_id, current_user.id)
     if not job:
         raise NotFoundError("Processing job", str(job_id))
-    return job
+    # The feed can stay open for minutes; return the connection to the pool first
+    await db.close()
+
+    redis_client = request.app.state.redis
+
+    async def event_source():
+        yield "retry: 3000\n\n"
+        async for event_id, event in stream_job_events(
+            redis_client, job, last_event_id or offset
+        ):
+            if event is None:
+                if await request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            frame = f"event: {event.get('type', 'message')}\ndata: {json.dumps(event)}\n"
+            if event_id:
+                frame = f"id: {event_id}\n{frame}"
+            yield frame + "\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Query
 
 from fastapi_app.api.deps import CurrentOrg, CurrentUser, DBSession
 from fastapi_app.services.product_service import (
@@ -10,15 +10,19 @@ from fastapi_app.services.product_service import (
     list_products,
     update_product,
 )
-from shared.constants import ProductCategory, ProductStatus
+from fastapi_app.services.similarity_service import find_duplicate_groups, find_similar_products
+from shared.constants import AttributeName, CountMode, ProductCategory, ProductStatus
+from shared.near_duplicates import MAX_NEAR_DUPLICATE_DISTANCE
+from shared.product_facets import DEFECT_FACET
 from shared.schemas.analysis import AnalysisResultResponse
 from shared.schemas.product import (
     ProductCreate,
+    ProductFilter,
     ProductListResponse,
     ProductResponse,
     ProductUpdate,
-    ProductFilter,
 )
+from shared.schemas.similarity import DuplicateReportResponse, SimilarProductsResponse
 
 router = APIRouter()
 
@@ -31,11 +35,38 @@ async def list_user_products(
     category: ProductCategory | None = None,
     status: ProductStatus | None = None,
     search: str | None = None,
+    color: list[str] | None = Query(None),
+    material: list[str] | None = Query(None),
+    brand: list[str] | None = Query(None),
+    condition: list[str] | None = Query(None),
+    pattern: list[str] | None = Query(None),
+    style: list[str] | None = Query(None),
+    has_defect: list[str] | None = Query(None),
+    facet_counts: bool = False,
+    cursor: str | None = None,
+    count: CountMode = CountMode.ESTIMATE,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
 ):
+    facets = {
+        AttributeName.COLOR.value: color,
+        AttributeName.MATERIAL.value: material,
+        AttributeName.BRAND.value: brand,
+        AttributeName.CONDITION.value: condition,
+        AttributeName.PATTERN.value: pattern,
+        AttributeName.STYLE.value: style,
+        DEFECT_FACET: has_defect,
+    }
     filters = ProductFilter(
-        category=category, status=status, search=search, page=page, page_size=page_size
+        category=category,
+        status=status,
+        search=search,
+        facets={name: values for name, values in facets.items() if values},
+        facet_counts=facet_counts,
+        cursor=cursor,
+        count=count,
+        page=page,
+        page_size=page_size,
     )
     return await list_products(db, current_org.id, filters)
 
@@ -50,6 +81,20 @@ async def create_new_product(
     return await create_product(db, current_user.id, current_org.id, data)
 
 
+@router.get("/duplicates", response_model=DuplicateReportResponse)
+async def get_duplicate_products(
+    db: DBSession,
+    current_user: CurrentUser,
+    current_org: CurrentOrg,
+    max_distance: int | None = Query(None, ge=0, le=MAX_NEAR_DUPLICATE_DISTANCE),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: uuid.UUID | None = None,
+):
+    return await find_duplicate_groups(
+        db, current_org.id, max_distance=max_distance, limit=limit, cursor=cursor
+    )
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product_detail(
     product_id: uuid.UUID,
@@ -108,3 +153,14 @@ async def get_product_analysis(
         .where(AnalysisResult.product_image_id.in_(image_ids))
     )
     return list(result.scalars().all())
+
+
+@router.get("/{product_id}/similar", response_model=SimilarProductsResponse)
+async def get_similar_products(
+    product_id: uuid.UUID,
+    db: DBSession,
+    current_user: CurrentUser,
+    current_org: CurrentOrg,
+    limit: int = Query(10, ge=1, le=50),
+):
+    return await find_similar_products(db, product_id, current_org.id, limit=limit)
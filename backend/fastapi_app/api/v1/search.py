@@ -0,0 +1,90 @@
+import asyncio
+import time
+import uuid
+
+from fastapi import APIRouter, Query, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_app.api.deps import CurrentOrg, CurrentUser, DBSession
+from fastapi_app.services.similarity_service import search_by_embedding
+from fastapi_app.services.upload_service import ALLOWED_CONTENT_TYPES, get_s3_client
+from shared.config import get_settings
+from shared.exceptions import (
+    ImageDecodeError,
+    ModelInferenceError,
+    StorageError,
+    ValidationError,
+)
+from shared.schemas.similarity import SimilarProductsResponse
+
+router = APIRouter()
+settings = get_settings()
+
+MAX_QUERY_IMAGE_BYTES = 10_000_000
+# How often the result backend is checked while the query embedding is computed
+RESULT_POLL_SECONDS = 0.05
+
+
+async def _wait_for_result(task, timeout: float):
+    """
+    Await a Celery result without parking a threadpool thread on ``task.get``.
+
+    Only the short backend reads run in the threadpool; between them the
+    handler sleeps on the event loop.
+    """
+    from celery.exceptions import TimeoutError as CeleryTimeoutError
+
+    deadline = time.monotonic() + timeout
+    while not await run_in_threadpool(task.ready):
+        if time.monotonic() >= deadline:
+            raise CeleryTimeoutError(f"Task {task.id} not ready after {timeout}s")
+        await asyncio.sleep(RESULT_POLL_SECONDS)
+    return await run_in_threadpool(task.get, timeout=timeout)
+
+
+@router.post("/by-image", response_model=SimilarProductsResponse)
+async def search_products_by_image(
+    file: UploadFile,
+    db: DBSession,
+    current_user: CurrentUser,
+    current_org: CurrentOrg,
+    limit: int = Query(10, ge=1, le=50),
+):
+    from celery.exceptions import TimeoutError as CeleryTimeoutError
+
+    from workers.tasks.feature_extraction import embed_query_image
+
+    content_type = file.content_type or "image/jpeg"
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise ValidationError(f"Content type '{content_type}' not allowed")
+
+    contents = await file.read()
+    if len(contents) > MAX_QUERY_IMAGE_BYTES:
+        raise ValidationError("File too large. Maximum 10MB.")
+
+    # The embedding is computed by an ML worker, which reads the image from S3
+    s3_key = f"search-queries/{current_org.id}/{uuid.uuid4().hex}"
+    try:
+        await run_in_threadpool(
+            get_s3_client().put_object,
+            Bucket=settings.s3_bucket_name,
+            Key=s3_key,
+            Body=contents,
+            ContentType=content_type,
+        )
+    except Exception as e:
+        raise StorageError(f"Upload failed: {e}")
+
+    task = embed_query_image.delay(
+        settings.s3_bucket_name, s3_key, settings.similarity_embedding_version
+    )
+    try:
+        embedding = await _wait_for_result(task, settings.similarity_query_timeout_seconds)
+    except CeleryTimeoutError:
+        raise ModelInferenceError("Timed out computing the query image embedding")
+    except ImageDecodeError as e:
+        raise ValidationError(e.message)
+    except Exception as e:
+        raise ModelInferenceError(f"Failed to compute the query image embedding: {e}")
+
+    return await search_by_embedding(db, current_org.id, embedding, limit=limit)
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, UploadFile
+from fastapi import APIRouter, Request, UploadFile
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind
 
 from fastapi_app.api.deps import CurrentUser, DBSession
+from fastapi_app.services.admission_service import admit_interactive_image, dispatch_image
 from fastapi_app.services.upload_service import confirm_upload, create_presigned_upload
 from shared.schemas.upload import (
     DirectUploadResponse,
@@ -9,6 +12,7 @@ from shared.schemas.upload import (
     UploadConfirmRequest,
     UploadConfirmResponse,
 )
+from shared.tracing import tracer
 
 router = APIRouter()
 
@@ -31,34 +35,65 @@ async def get_presigned_url(
 
 
 @router.post("/confirm", response_model=UploadConfirmResponse)
+@tracer.start_as_current_span("upload.confirm", kind=SpanKind.SERVER)
 async def confirm_image_upload(
     data: UploadConfirmRequest,
+    request: Request,
     db: DBSession,
     current_user: CurrentUser,
 ):
-    return await confirm_upload(db, current_user.id, data.image_id)
+    span = trace.get_current_span()
+    span.set_attributes({"request.id": request.state.request_id, "image.id": str(data.image_id)})
+    admission = await admit_interactive_image(request.app.state.redis)
+    result = await confirm_upload(db, current_user.id, data.image_id, admission)
+    span.set_attribute("job.id", str(result["job_id"]))
+    return result
 
 
 @router.post("/direct", response_model=DirectUploadResponse)
+@tracer.start_as_current_span("upload.direct", kind=SpanKind.SERVER)
 async def direct_upload(
     product_id: str,
     file: UploadFile,
+    request: Request,
     db: DBSession,
     current_user: CurrentUser,
 ):
     import uuid
+    from datetime import UTC, datetime
+
+    from sqlalchemy import select
 
-    from fastapi_app.services.upload_service import get_s3_client, generate_s3_key
+    from fastapi_app.services.stats_service import record_org_stats
+    from fastapi_app.services.upload_service import generate_s3_key, get_s3_client
+    from shared.analysis_reuse import content_sha256
     from shared.config import get_settings
-    from shared.constants import AnalysisStatus, JobStatus, JobType, StepName, StepStatus
+    from shared.constants import (
+        AdmissionAction,
+        AnalysisStatus,
+        JobStatus,
+        JobType,
+        StepName,
+        StepStatus,
+    )
+    from shared.exceptions import NotFoundError, StorageError, ValidationError
     from shared.models.analysis import AnalysisResult
     from shared.models.pipeline import JobStep, ProcessingJob
-    from shared.models.product import ProductImage
-    from shared.exceptions import ValidationError, StorageError
-    from datetime import datetime, UTC
+    from shared.models.product import Product, ProductImage
 
     settings = get_settings()
     pid = uuid.UUID(product_id)
+    span = trace.get_current_span()
+    span.set_attributes({"request.id": request.state.request_id, "product.id": product_id})
+
+    org_id = (
+        await db.execute(select(Product.organization_id).where(Product.id == pid))
+    ).scalar_one_or_none()
+    if not org_id:
+        raise NotFoundError("Product", product_id)
+
+    # Refuse before the file is stored when no lane can take the work
+    admission = await admit_interactive_image(request.app.state.redis)
 
     content_type = file.content_type or "image/jpeg"
     allowed = {"image/jpeg", "image/png", "image/webp", "image/gif"}
@@ -91,12 +126,15 @@ async def direct_upload(
         original_filename=file.filename,
         content_type=content_type,
         file_size_bytes=len(contents),
+        content_sha256=content_sha256(contents),
         upload_status="uploaded",
     )
     db.add(image)
     await db.flush()
+    await record_org_stats(db, org_id, total_images=1)
 
     analysis = AnalysisResult(
+        organization_id=org_id,
         product_image_id=image.id,
         model_version="pending",
         status=AnalysisStatus.PENDING.value,
@@ -104,6 +142,7 @@ async def direct_upload(
     db.add(analysis)
 
     job = ProcessingJob(
+        organization_id=org_id,
         user_id=current_user.id,
         job_type=JobType.SINGLE.value,
         status=JobStatus.QUEUED.value,
@@ -113,9 +152,11 @@ async def direct_upload(
     db.add(job)
     await db.flush()
     await db.refresh(job)
+    span.set_attributes({"image.id": str(image.id), "job.id": str(job.id)})
 
     for step_name in StepName:
         db.add(JobStep(
+            organization_id=org_id,
             job_id=job.id,
             product_image_id=image.id,
             step_name=step_name.value,
@@ -123,10 +164,17 @@ async def direct_upload(
         ))
     await db.flush()
 
-    from workers.tasks.image_processing import process_image
-
-    task = process_image.delay(str(image.id), str(job.id))
-    job.celery_task_id = task.id
+    job.celery_task_id = await dispatch_image(db, job, image.id, admission)
     await db.flush()
 
-    return DirectUploadResponse(image_id=image.id, job_id=job.id)
+    if admission.action == AdmissionAction.DEFER:
+        return DirectUploadResponse(
+            image_id=image.id,
+            job_id=job.id,
+            status="deferred",
+            message="Image uploaded and queued behind batch work",
+            estimated_wait_seconds=admission.estimated_wait_seconds,
+        )
+    return DirectUploadResponse(
+        image_id=image.id, job_id=job.id, estimated_wait_seconds=admission.estimated_wait_seconds
+    )
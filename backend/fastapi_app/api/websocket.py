@@ -1,15 +1,15 @@
+import asyncio
 import json
 import uuid
+from contextlib import aclosing
 
 import redis.asyncio as aioredis
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 from jose import JWTError, jwt
-from sqlalchemy import select
 
+from fastapi_app.services.job_event_service import get_owned_job, stream_job_events
 from shared.config import get_settings
 from shared.database import async_session_factory
-from shared.models.pipeline import ProcessingJob
-from shared.models.user import User
 
 settings = get_settings()
 ws_router = APIRouter()
@@ -29,16 +29,10 @@ async def authenticate_websocket(token: str) -> uuid.UUID | None:
         return None
 
 
-async def verify_job_ownership(job_id: uuid.UUID, user_id: uuid.UUID) -> bool:
-    """Check that the user owns the processing job."""
-    async with async_session_factory() as session:
-        result = await session.execute(
-            select(ProcessingJob.id).where(
-                ProcessingJob.id == job_id,
-                ProcessingJob.user_id == user_id,
-            )
-        )
-        return result.scalar_one_or_none() is not None
+async def wait_for_disconnect(websocket: WebSocket) -> None:
+    """Return once the client has gone; it sends nothing, so only the close is received."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
 
 
 @ws_router.websocket("/ws/processing/{job_id}")
@@ -46,6 +40,7 @@ async def processing_websocket(
     websocket: WebSocket,
     job_id: uuid.UUID,
     token: str = Query(...),
+    last_event_id: str | None = Query(None),
 ):
     # Authenticate
     user_id = await authenticate_websocket(token)
@@ -54,33 +49,32 @@ async def processing_websocket(
         return
 
     # Verify ownership
-    if not await verify_job_ownership(job_id, user_id):
+    async with async_session_factory() as session:
+        job = await get_owned_job(session, job_id, user_id)
+    if not job:
         await websocket.close(code=4003, reason="Access denied")
         return
 
     await websocket.accept()
 
-    # Subscribe to Redis pub/sub channel for this job
+    # Replay from the job's event stream, then tail it until a terminal event
     redis_client = aioredis.from_url(settings.redis_url, decode_responses=True)
-    pubsub = redis_client.pubsub()
-    channel = f"job:{job_id}"
-    await pubsub.subscribe(channel)
-
+    disconnected = asyncio.create_task(wait_for_disconnect(websocket))
+    events = stream_job_events(redis_client, job, last_event_id)
     try:
-        async for message in pubsub.listen():
-            if message["type"] == "message":
-                await websocket.send_text(message["data"])
-
-                # Check if this is a terminal message
-                try:
-                    data = json.loads(message["data"])
-                    if data.get("type") in ("job_complete", "job_failed"):
-                        break
-                except json.JSONDecodeError:
-                    pass
+        async with aclosing(events):
+            async for event_id, event in events:
+                # Checked on every keep-alive timeout too, so a dead socket stops polling Redis
+                if disconnected.done():
+                    return
+                if event is None:
+                    continue
+                if event_id:
+                    event["event_id"] = event_id
+                await websocket.send_text(json.dumps(event))
+        await websocket.close()
     except WebSocketDisconnect:
         pass
     finally:
-        await pubsub.unsubscribe(channel)
-        await pubsub.close()
+        disconnected.cancel()
         await redis_client.close()
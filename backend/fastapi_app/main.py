@@ -1,16 +1,20 @@
+import os
 from contextlib import asynccontextmanager
 
 import redis.asyncio as aioredis
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from fastapi_app.api.v1.router import api_router
 from fastapi_app.api.websocket import ws_router
+from fastapi_app.middleware.metrics import MetricsMiddleware
 from fastapi_app.middleware.request_id import RequestIDMiddleware
 from shared.config import get_settings
 from shared.database import engine
 from shared.exceptions import ImagineAIError
+from shared.metrics import mark_process_dead, render_metrics
+from shared.tracing import configure_tracing, shutdown_tracing
 
 settings = get_settings()
 
@@ -18,11 +22,14 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    configure_tracing("api")
     app.state.redis = aioredis.from_url(settings.redis_url, decode_responses=True)
     yield
     # Shutdown
     await app.state.redis.close()
     await engine.dispose()
+    mark_process_dead(os.getpid())
+    shutdown_tracing()
 
 
 def create_app() -> FastAPI:
@@ -47,19 +54,28 @@ def create_app() -> FastAPI:
 
     from fastapi_app.middleware.rate_limiter import RateLimitMiddleware
     app.add_middleware(RateLimitMiddleware, redis_url=settings.redis_url)
+    # Outermost, so requests turned away by the rate limiter are counted too
+    app.add_middleware(MetricsMiddleware)
 
     # Exception handlers
     @app.exception_handler(ImagineAIError)
     async def imagineai_error_handler(request: Request, exc: ImagineAIError):
+        retry_after = getattr(exc, "retry_after", None)
         return JSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.message},
+            headers={"Retry-After": str(retry_after)} if retry_after else None,
         )
 
     # Routes
     app.include_router(api_router, prefix="/api/v1")
     app.include_router(ws_router)
 
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        body, content_type = render_metrics()
+        return Response(body, media_type=content_type)
+
     # Health checks
     @app.get("/health")
     async def health():
@@ -70,9 +86,10 @@ def create_app() -> FastAPI:
         checks = {}
         # Check database
         try:
-            from shared.database import async_session_factory
             from sqlalchemy import text
 
+            from shared.database import async_session_factory
+
             async with async_session_factory() as session:
                 await session.execute(text("SELECT 1"))
             checks["database"] = "ok"
@@ -0,0 +1,45 @@
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from shared.metrics import HTTP_CONNECTIONS_ACTIVE, HTTP_REQUEST_DURATION, HTTP_REQUESTS
+
+
+def route_template(request: Request) -> str:
+    """Path template of the matched route, with the prefixes of the routers it was included in."""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Depending on the FastAPI version, routes of included routers report their path
+    # relative to the router; recover the prefix from the concrete path
+    path = request.scope["path"]
+    rendered = route.path_format.format(**{k: str(v) for k, v in request.path_params.items()})
+    if not path.endswith(rendered):
+        return route.path
+    return path[: len(path) - len(rendered)] + route.path
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Request count and latency per route template, e.g. ``/api/v1/products/{product_id}``."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if request.url.path == "/metrics":
+            return await call_next(request)
+
+        HTTP_CONNECTIONS_ACTIVE.inc()
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            HTTP_CONNECTIONS_ACTIVE.dec()
+            # Labelled by template, not raw path, so IDs don't create a series each
+            endpoint = route_template(request)
+            HTTP_REQUEST_DURATION.labels(request.method, endpoint).observe(
+                time.perf_counter() - start
+            )
+            HTTP_REQUESTS.labels(request.method, endpoint, str(status)).inc()
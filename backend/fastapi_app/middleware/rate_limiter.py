@@ -17,7 +17,7 @@ end
 return current
 """
 
-EXEMPT_PATHS = {"/health", "/ready", "/docs", "/redoc", "/openapi.json"}
+EXEMPT_PATHS = {"/health", "/ready", "/metrics", "/docs", "/redoc", "/openapi.json"}
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -0,0 +1,151 @@
+import logging
+import time
+import uuid
+
+import redis.asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from shared.admission import (
+    AdmissionDecision,
+    LaneLoad,
+    admit_batch,
+    admit_interactive,
+    drain_rate,
+    lane_completions_key,
+)
+from shared.config import get_settings
+from shared.constants import AdmissionAction, ProcessingLane
+from shared.exceptions import RateLimitExceededError, ServiceOverloadedError
+from shared.job_cancellation import image_task_id
+from shared.models.organization import Organization
+from shared.models.pipeline import ProcessingJob
+from shared.org_concurrency import batch_lane_queue_key
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# queue name -> (monotonic time read, ready messages)
+_depth_cache: dict[str, tuple[float, int]] = {}
+
+
+async def _broker_depth(queue: str) -> int:
+    """Ready messages on a broker queue, cached briefly so bursts of requests share one read."""
+    cached = _depth_cache.get(queue)
+    now = time.monotonic()
+    if cached and now - cached[0] < settings.admission_cache_seconds:
+        return cached[1]
+
+    from workers.celery_app import ready_depth
+
+    try:
+        depth = await run_in_threadpool(ready_depth, queue)
+    except Exception as e:
+        # Admission fails open: an unreachable broker surfaces on dispatch instead
+        logger.warning(f"Could not read depth of queue {queue}: {e}")
+        depth = 0
+    _depth_cache[queue] = (now, depth)
+    return depth
+
+
+async def _drain_rate(redis_client: aioredis.Redis, lane: ProcessingLane) -> float:
+    window = settings.admission_rate_window_minutes
+    minute = int(time.time() // 60)
+    # Only whole minutes; the current one is still filling up
+    counts = await redis_client.mget(
+        [lane_completions_key(lane.value, minute - i) for i in range(1, window + 1)]
+    )
+    completions = sum(int(count) for count in counts if count)
+    baseline = settings.image_processing_worker_slots / settings.admission_baseline_task_seconds
+    return drain_rate(completions, window * 60, settings.admission_min_rate_samples, baseline)
+
+
+async def _batch_backlog(redis_client: aioredis.Redis) -> int:
+    from workers.batch_lane import ORGS_KEY
+
+    orgs = await redis_client.zrange(ORGS_KEY, 0, -1)
+    queued = 0
+    if orgs:
+        pipe = redis_client.pipeline()
+        for org_id in orgs:
+            pipe.llen(batch_lane_queue_key(org_id))
+        queued = sum(await pipe.execute())
+    return queued + await _broker_depth(ProcessingLane.BATCH.value)
+
+
+async def lane_loads(redis_client: aioredis.Redis) -> dict[ProcessingLane, LaneLoad]:
+    return {
+        ProcessingLane.INTERACTIVE: LaneLoad(
+            await _broker_depth(ProcessingLane.INTERACTIVE.value),
+            await _drain_rate(redis_client, ProcessingLane.INTERACTIVE),
+        ),
+        ProcessingLane.BATCH: LaneLoad(
+            await _batch_backlog(redis_client),
+            await _drain_rate(redis_client, ProcessingLane.BATCH),
+        ),
+    }
+
+
+def _raise_if_refused(decision: AdmissionDecision) -> AdmissionDecision:
+    if decision.action == AdmissionAction.REJECT:
+        raise ServiceOverloadedError(retry_after=decision.retry_after)
+    if decision.action == AdmissionAction.THROTTLE:
+        raise RateLimitExceededError(
+            retry_after=decision.retry_after,
+            message="Too many images queued for this organization",
+        )
+    return decision
+
+
+async def admit_interactive_image(redis_client: aioredis.Redis) -> AdmissionDecision:
+    """Admit one upload or retry, raising 503 with ``Retry-After`` when no lane can take it."""
+    loads = await lane_loads(redis_client)
+    return _raise_if_refused(admit_interactive(
+        loads[ProcessingLane.INTERACTIVE],
+        loads[ProcessingLane.BATCH],
+        settings.admission_interactive_defer_seconds,
+        settings.admission_batch_reject_seconds,
+    ))
+
+
+async def admit_batch_images(
+    redis_client: aioredis.Redis, org_id: uuid.UUID, images: int
+) -> AdmissionDecision:
+    """Admit ``images`` batch images, raising 503 or 429 with ``Retry-After`` when refused."""
+    loads = await lane_loads(redis_client)
+    org_queued = await redis_client.llen(batch_lane_queue_key(str(org_id)))
+    return _raise_if_refused(admit_batch(
+        loads[ProcessingLane.BATCH],
+        images,
+        settings.admission_batch_reject_seconds,
+        org_queued,
+        settings.admission_org_max_queued_images,
+    ))
+
+
+async def dispatch_image(
+    db: AsyncSession,
+    job: ProcessingJob,
+    image_id: uuid.UUID,
+    decision: AdmissionDecision,
+    force_recompute: bool = False,
+) -> str:
+    """Start ``process_image`` in the lane chosen by admission control and return its task ID."""
+    if decision.action == AdmissionAction.DEFER:
+        from workers.batch_lane import enqueue_batch_images
+
+        plan = (await db.execute(
+            select(Organization.plan).where(Organization.id == job.organization_id)
+        )).scalar_one_or_none()
+        await run_in_threadpool(
+            enqueue_batch_images,
+            str(job.organization_id), plan, str(job.id), [str(image_id)], force_recompute,
+        )
+        job.metadata_ = {**(job.metadata_ or {}), "lane": ProcessingLane.BATCH.value}
+        return image_task_id(str(job.id), str(image_id))
+
+    from workers.tasks.image_processing import process_image
+
+    task = process_image.delay(str(image_id), str(job.id), force_recompute=force_recompute)
+    return task.id
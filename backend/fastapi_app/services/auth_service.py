@@ -1,3 +1,4 @@
+import uuid
 from datetime import UTC, datetime, timedelta
 
 from jose import jwt
@@ -84,7 +85,7 @@ async def refresh_access_token(db: AsyncSession, refresh_token: str) -> TokenPai
     except JWTError:
         raise AuthenticationError("Invalid refresh token")
 
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
     user = result.scalar_one_or_none()
     if not user or not user.is_active:
         raise AuthenticationError("User not found or disabled")
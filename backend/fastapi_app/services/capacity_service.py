@@ -0,0 +1,35 @@
+import time
+
+import redis.asyncio as aioredis
+
+from shared.models.organization import Organization
+from shared.org_concurrency import (
+    batch_lane_queue_key,
+    concurrency_limit,
+    org_deferred_key,
+    org_slots_key,
+)
+from shared.schemas.organization import OrganizationCapacityResponse
+
+
+async def get_org_capacity(
+    redis_client: aioredis.Redis, org: Organization
+) -> OrganizationCapacityResponse:
+    """Leases held and tasks waiting for one, read from the same Redis keys the workers use."""
+    org_id = str(org.id)
+    now = time.time()
+    pipe = redis_client.pipeline()
+    pipe.zcount(org_slots_key(org_id), now, "+inf")
+    pipe.zcount(org_deferred_key(org_id), now, "+inf")
+    pipe.llen(batch_lane_queue_key(org_id))
+    in_use, deferred, queued = await pipe.execute()
+
+    return OrganizationCapacityResponse(
+        organization_id=org.id,
+        plan=org.plan,
+        concurrency_limit=concurrency_limit(org.plan),
+        in_use=in_use,
+        waiting=deferred + queued,
+        deferred_interactive=deferred,
+        queued_batch=queued,
+    )
@@ -0,0 +1,124 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, literal, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from fastapi_app.services.cursor import decode_cursor, encode_cursor
+from shared.config import get_settings
+from shared.exceptions import ValidationError
+from shared.models.analysis import AnalysisResult
+from shared.models.product import Product
+from shared.schemas.analysis import AnalysisResultResponse
+from shared.schemas.changes import ChangeEntry
+from shared.schemas.product import ProductResponse
+
+settings = get_settings()
+
+ENTITY_PRODUCT = "product"
+ENTITY_ANALYSIS_RESULT = "analysis_result"
+
+
+def encode_change_cursor(updated_at: datetime, entity_id: uuid.UUID) -> str:
+    return encode_cursor({"t": updated_at.isoformat(), "id": str(entity_id)})
+
+
+def decode_change_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    payload = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(payload["t"]), uuid.UUID(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid change feed cursor")
+
+
+async def get_changes(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+    cursor: str | None = None,
+    limit: int = 100,
+) -> dict:
+    """
+    Return products and analysis results changed after ``cursor``.
+
+    Both tables are walked in ``(updated_at, id)`` order with a row-value
+    comparison, so each page is an index range scan rather than an offset.
+    Rows touched within the last ``changes_feed_settle_seconds`` are held
+    back: ``updated_at`` is the writing transaction's start time, and a
+    transaction that commits late could otherwise land behind a cursor that
+    has already moved past it.
+    """
+    settle_cutoff = func.now() - timedelta(seconds=settings.changes_feed_settle_seconds)
+
+    products = select(
+        literal(ENTITY_PRODUCT).label("entity_type"),
+        Product.id.label("id"),
+        Product.updated_at.label("updated_at"),
+    ).where(Product.organization_id == org_id, Product.updated_at < settle_cutoff)
+
+    results = select(
+        literal(ENTITY_ANALYSIS_RESULT).label("entity_type"),
+        AnalysisResult.id.label("id"),
+        AnalysisResult.updated_at.label("updated_at"),
+    ).where(
+        AnalysisResult.organization_id == org_id, AnalysisResult.updated_at < settle_cutoff
+    )
+
+    if cursor:
+        after_time, after_id = decode_change_cursor(cursor)
+        products = products.where(
+            tuple_(Product.updated_at, Product.id) > tuple_(after_time, after_id)
+        )
+        results = results.where(
+            tuple_(AnalysisResult.updated_at, AnalysisResult.id) > tuple_(after_time, after_id)
+        )
+
+    # Each branch is limited on its own so the planner stops early on both indexes
+    products = products.order_by(Product.updated_at, Product.id).limit(limit + 1)
+    results = results.order_by(AnalysisResult.updated_at, AnalysisResult.id).limit(limit + 1)
+
+    feed = union_all(products, results).subquery()
+    rows = (
+        await db.execute(
+            select(feed.c.entity_type, feed.c.id, feed.c.updated_at)
+            .order_by(feed.c.updated_at, feed.c.id)
+            .limit(limit + 1)
+        )
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    product_ids = [r.id for r in rows if r.entity_type == ENTITY_PRODUCT]
+    result_ids = [r.id for r in rows if r.entity_type == ENTITY_ANALYSIS_RESULT]
+
+    products_by_id = {}
+    if product_ids:
+        loaded = await db.execute(
+            select(Product).options(selectinload(Product.images)).where(Product.id.in_(product_ids))
+        )
+        products_by_id = {p.id: p for p in loaded.scalars().all()}
+
+    results_by_id = {}
+    if result_ids:
+        loaded = await db.execute(
+            select(AnalysisResult)
+            .options(
+                selectinload(AnalysisResult.extracted_attributes),
+                selectinload(AnalysisResult.detected_defects),
+            )
+            .where(AnalysisResult.id.in_(result_ids))
+        )
+        results_by_id = {r.id: r for r in loaded.scalars().all()}
+
+    items = []
+    for row in rows:
+        entry = ChangeEntry(entity_type=row.entity_type, id=row.id, updated_at=row.updated_at)
+        if row.entity_type == ENTITY_PRODUCT and row.id in products_by_id:
+            entry.product = ProductResponse.model_validate(products_by_id[row.id])
+        elif row.id in results_by_id:
+            entry.analysis_result = AnalysisResultResponse.model_validate(results_by_id[row.id])
+        items.append(entry)
+
+    next_cursor = encode_change_cursor(rows[-1].updated_at, rows[-1].id) if rows else cursor
+    return {"items": items, "next_cursor": next_cursor, "has_more": has_more}
@@ -0,0 +1,22 @@
+import base64
+import binascii
+import json
+
+from shared.exceptions import ValidationError
+
+
+def encode_cursor(payload: dict) -> str:
+    """Serialize a keyset position into an opaque, URL-safe cursor."""
+    raw = json.dumps(payload, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise ValidationError("Invalid cursor")
+    if not isinstance(payload, dict):
+        raise ValidationError("Invalid cursor")
+    return payload
@@ -0,0 +1,155 @@
+import uuid
+from datetime import UTC, datetime
+
+import redis.asyncio as aioredis
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.services.admission_service import admit_batch_images
+from fastapi_app.services.stats_service import record_org_stats
+from shared.admission import AdmissionDecision
+from shared.constants import AnalysisStatus, JobStatus, JobType, StepName, StepStatus
+from shared.exceptions import ValidationError
+from shared.models.analysis import AnalysisResult
+from shared.models.pipeline import DeadLetter, JobStep, ProcessingJob
+from shared.org_stats import completed_analysis_deltas, defect_counts
+from shared.schemas.pipeline import RedriveRequest
+
+# Images re-driven per request; larger backlogs are replayed in several calls
+MAX_REDRIVE_IMAGES = 1000
+
+
+def _dead_letter_filters(
+    org_id: uuid.UUID,
+    error_category: str | None = None,
+    job_id: uuid.UUID | None = None,
+    include_redriven: bool = False,
+) -> list:
+    filters = [DeadLetter.organization_id == org_id]
+    if error_category:
+        filters.append(DeadLetter.error_category == error_category)
+    if job_id:
+        filters.append(DeadLetter.job_id == job_id)
+    if not include_redriven:
+        filters.append(DeadLetter.redriven_at.is_(None))
+    return filters
+
+
+async def list_dead_letters(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+    error_category: str | None = None,
+    job_id: uuid.UUID | None = None,
+    include_redriven: bool = False,
+    limit: int = 50,
+    offset: int = 0,
+) -> dict:
+    filters = _dead_letter_filters(org_id, error_category, job_id, include_redriven)
+    total = (await db.execute(
+        select(func.count(DeadLetter.id)).where(*filters)
+    )).scalar() or 0
+    result = await db.execute(
+        select(DeadLetter)
+        .where(*filters)
+        .order_by(DeadLetter.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    return {"items": list(result.scalars().all()), "total": total}
+
+
+async def redrive_dead_letters(
+    db: AsyncSession,
+    redis_client: aioredis.Redis,
+    org_id: uuid.UUID,
+    user_id: uuid.UUID,
+    data: RedriveRequest,
+) -> tuple[ProcessingJob, AdmissionDecision]:
+    """
+    Replay pending dead letters as one batch job.
+
+    Each image is processed once even if it was dead-lettered several times;
+    every matched letter is stamped with the new job so it is not replayed again.
+    The batch goes through admission control like any other, and analyses that
+    completed since they were dead-lettered leave the dashboard counters.
+    """
+    filters = _dead_letter_filters(org_id, data.error_category, data.job_id)
+    filters.append(DeadLetter.product_image_id.is_not(None))
+    if data.ids:
+        filters.append(DeadLetter.id.in_(data.ids))
+
+    image_ids = list((await db.execute(
+        select(DeadLetter.product_image_id)
+        .where(*filters)
+        .group_by(DeadLetter.product_image_id)
+        .order_by(func.min(DeadLetter.created_at))
+        .limit(MAX_REDRIVE_IMAGES)
+    )).scalars().all())
+    if not image_ids:
+        raise ValidationError("No pending dead letters match the request")
+
+    admission = await admit_batch_images(redis_client, org_id, len(image_ids))
+
+    job = ProcessingJob(
+        organization_id=org_id,
+        user_id=user_id,
+        job_type=JobType.BATCH.value,
+        status=JobStatus.QUEUED.value,
+        total_images=len(image_ids),
+        started_at=datetime.now(UTC),
+        metadata_={"redrive": True},
+    )
+    db.add(job)
+    await db.flush()
+
+    analysis_filters = [
+        AnalysisResult.organization_id == org_id,
+        AnalysisResult.product_image_id.in_(image_ids),
+    ]
+    completed = (await db.execute(
+        select(AnalysisResult).where(
+            *analysis_filters, AnalysisResult.status == AnalysisStatus.COMPLETED.value
+        )
+    )).scalars().all()
+    defects = dict((await db.execute(defect_counts(a.id for a in completed))).all())
+    deltas: dict[str, int] = {}
+    for analysis in completed:
+        analysis_deltas = completed_analysis_deltas(
+            analysis, sign=-1, defects=defects.get(analysis.id, 0)
+        )
+        for name, value in analysis_deltas.items():
+            deltas[name] = deltas.get(name, 0) + value
+    await record_org_stats(db, org_id, **deltas)
+
+    await db.execute(
+        update(AnalysisResult)
+        .where(*analysis_filters)
+        .values(status=AnalysisStatus.PENDING.value, error_message=None)
+    )
+    for image_id in image_ids:
+        for step_name in StepName:
+            db.add(JobStep(
+                organization_id=org_id,
+                job_id=job.id,
+                product_image_id=image_id,
+                step_name=step_name.value,
+                status=StepStatus.PENDING.value,
+            ))
+
+    await db.execute(
+        update(DeadLetter)
+        .where(*filters, DeadLetter.product_image_id.in_(image_ids))
+        .values(redriven_at=datetime.now(UTC), redrive_job_id=job.id)
+    )
+    await db.flush()
+
+    from workers.tasks.batch_processing import process_batch
+
+    task = process_batch.delay(
+        str(job.id), [str(image_id) for image_id in image_ids],
+        force_recompute=data.force_recompute,
+    )
+    job.celery_task_id = task.id
+    await db.flush()
+    await db.refresh(job, attribute_names=["updated_at"])
+    return job, admission
@@ -0,0 +1,117 @@
+import json
+import uuid
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
+import redis.asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.config import get_settings
+from shared.constants import JobStatus
+from shared.job_events import TERMINAL_EVENT_TYPES, job_events_key, normalize_last_event_id
+from shared.models.pipeline import ProcessingJob
+
+settings = get_settings()
+
+TERMINAL_JOB_EVENTS = {
+    JobStatus.COMPLETED.value: "job_complete",
+    JobStatus.FAILED.value: "job_failed",
+    JobStatus.CANCELLED.value: "job_failed",
+}
+
+
+async def get_owned_job(
+    db: AsyncSession, job_id: uuid.UUID, user_id: uuid.UUID
+) -> ProcessingJob | None:
+    result = await db.execute(
+        select(ProcessingJob).where(
+            ProcessingJob.id == job_id,
+            ProcessingJob.user_id == user_id,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+def build_terminal_event(job: ProcessingJob) -> dict | None:
+    """
+    Synthesize the terminal event for a finished job.
+
+    Used when the job's stream has already expired (or was never written),
+    so late subscribers still get a definitive end-of-stream message.
+    """
+    event_type = TERMINAL_JOB_EVENTS.get(job.status)
+    if not event_type:
+        return None
+    return {
+        "type": event_type,
+        "job_id": str(job.id),
+        "status": job.status,
+        "progress": {
+            "completed": job.processed_images,
+            "total": job.total_images,
+        },
+        "data": {"error": job.error_message} if job.error_message else None,
+        "timestamp": (job.completed_at or datetime.now(UTC)).isoformat(),
+    }
+
+
+async def append_terminal_event(redis_client: aioredis.Redis, job: ProcessingJob) -> str:
+    """
+    Append the terminal event for ``job`` to its stream.
+
+    For jobs finished by the API rather than by a worker (cancellation), so
+    that open subscribers get their end-of-stream event. Returns the stream ID.
+    """
+    key = job_events_key(str(job.id))
+    async with redis_client.pipeline() as pipe:
+        pipe.xadd(
+            key,
+            {"data": json.dumps(build_terminal_event(job))},
+            maxlen=settings.job_events_stream_maxlen,
+            approximate=True,
+        )
+        pipe.expire(key, settings.job_events_ttl_seconds)
+        event_id, _ = await pipe.execute()
+    return event_id
+
+
+async def stream_job_events(
+    redis_client: aioredis.Redis,
+    job: ProcessingJob,
+    last_event_id: str | None = None,
+    block_ms: int | None = None,
+) -> AsyncIterator[tuple[str | None, dict | None]]:
+    """
+    Replay and then tail a job's event stream.
+
+    Yields ``(event_id, event)`` pairs starting after ``last_event_id``. When
+    a blocking read times out it yields ``(None, None)`` so callers can emit a
+    keep-alive or check for client disconnects. Stops after a terminal event.
+    """
+    key = job_events_key(str(job.id))
+    cursor = normalize_last_event_id(last_event_id)
+    block_ms = block_ms or settings.job_events_block_ms
+
+    if not await redis_client.exists(key):
+        terminal = build_terminal_event(job)
+        if terminal:
+            yield None, terminal
+            return
+
+    while True:
+        response = await redis_client.xread({key: cursor}, count=100, block=block_ms)
+        if not response:
+            yield None, None
+            continue
+
+        for _stream, entries in response:
+            for event_id, fields in entries:
+                cursor = event_id
+                try:
+                    event = json.loads(fields.get("data", "{}"))
+                except json.JSONDecodeError:
+                    continue
+                yield event_id, event
+                if event.get("type") in TERMINAL_EVENT_TYPES:
+                    return
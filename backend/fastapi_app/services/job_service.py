@@ -0,0 +1,163 @@
+import uuid
+from datetime import UTC, datetime
+
+import redis.asyncio as aioredis
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_app.services.job_event_service import append_terminal_event
+from shared.config import get_settings
+from shared.constants import AnalysisStatus, JobStatus, StepName, StepStatus
+from shared.job_cancellation import chunked, image_task_id, job_cancel_key
+from shared.models.analysis import AnalysisResult
+from shared.models.pipeline import JobStep, ProcessingJob
+from shared.schemas.pipeline import JobStepSummary, ProcessingJobSummaryResponse
+
+settings = get_settings()
+
+STEP_ORDER = {step.value: index for index, step in enumerate(StepName)}
+
+
+async def summarize_job_steps(
+    db: AsyncSession, job_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, list[JobStepSummary]]:
+    """
+    Aggregate job steps per (job, step_name) in a single GROUP BY query.
+
+    Status counts use ``count(*) FILTER (WHERE ...)`` and durations use
+    ``percentile_cont`` so only one row per step name leaves the database,
+    regardless of how many images the job covers.
+    """
+    if not job_ids:
+        return {}
+
+    status_columns = [
+        func.count(JobStep.id).filter(JobStep.status == status.value).label(status.value)
+        for status in StepStatus
+    ]
+    result = await db.execute(
+        select(
+            JobStep.job_id,
+            JobStep.step_name,
+            func.count(JobStep.id).label("total"),
+            *status_columns,
+            func.percentile_cont(0.5).within_group(JobStep.duration_ms).label("p50"),
+            func.percentile_cont(0.95).within_group(JobStep.duration_ms).label("p95"),
+        )
+        .where(JobStep.job_id.in_(job_ids))
+        .group_by(JobStep.job_id, JobStep.step_name)
+    )
+
+    summaries: dict[uuid.UUID, list[JobStepSummary]] = {job_id: [] for job_id in job_ids}
+    for row in result.mappings():
+        summaries[row["job_id"]].append(JobStepSummary(
+            step_name=row["step_name"],
+            total=row["total"],
+            counts={status.value: row[status.value] for status in StepStatus if row[status.value]},
+            p50_duration_ms=round(row["p50"], 1) if row["p50"] is not None else None,
+            p95_duration_ms=round(row["p95"], 1) if row["p95"] is not None else None,
+        ))
+
+    for steps in summaries.values():
+        steps.sort(key=lambda s: STEP_ORDER.get(s.step_name, len(STEP_ORDER)))
+    return summaries
+
+
+async def build_job_summaries(
+    db: AsyncSession, jobs: list[ProcessingJob]
+) -> list[ProcessingJobSummaryResponse]:
+    summaries = await summarize_job_steps(db, [job.id for job in jobs])
+    return [
+        ProcessingJobSummaryResponse.model_validate(job).model_copy(
+            update={"step_summary": summaries.get(job.id, [])}
+        )
+        for job in jobs
+    ]
+
+
+async def list_job_steps(
+    db: AsyncSession,
+    job_id: uuid.UUID,
+    status: StepStatus | None = None,
+    image_id: uuid.UUID | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> dict:
+    query = select(JobStep).where(JobStep.job_id == job_id)
+    count_query = select(func.count(JobStep.id)).where(JobStep.job_id == job_id)
+
+    if status:
+        query = query.where(JobStep.status == status.value)
+        count_query = count_query.where(JobStep.status == status.value)
+    if image_id:
+        query = query.where(JobStep.product_image_id == image_id)
+        count_query = count_query.where(JobStep.product_image_id == image_id)
+
+    total = (await db.execute(count_query)).scalar() or 0
+
+    result = await db.execute(
+        query.order_by(JobStep.product_image_id, JobStep.step_name, JobStep.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    return {"items": list(result.scalars().all()), "total": total}
+
+
+def _revoke_tasks(task_ids: list[str]) -> None:
+    from workers.celery_app import celery_app
+
+    # Queued tasks are dropped by workers on receipt; running ones stop at their
+    # next stage through the cancellation token rather than being killed mid-write.
+    for chunk in chunked(task_ids, settings.revoke_chunk_size):
+        celery_app.control.revoke(chunk)
+
+
+async def cancel_job(db: AsyncSession, redis_client: aioredis.Redis, job: ProcessingJob) -> None:
+    """
+    Stop every task of ``job``.
+
+    The Redis token is set first so that running tasks see it at their next
+    stage boundary. Then the orchestrator and the per-image tasks are revoked
+    in bulk, and images that never started are marked failed in one update.
+    Finally a ``job_failed`` event with status ``cancelled`` ends the job's
+    event stream.
+    """
+    await redis_client.set(job_cancel_key(str(job.id)), "1", ex=settings.job_cancel_ttl_seconds)
+
+    image_ids = [str(image_id) for image_id in (await db.execute(
+        select(JobStep.product_image_id).where(
+            JobStep.job_id == job.id,
+            JobStep.step_name == StepName.PREPROCESS.value,
+            JobStep.status == StepStatus.PENDING.value,
+        )
+    )).scalars()]
+    task_ids = [image_task_id(str(job.id), image_id) for image_id in image_ids]
+    if job.celery_task_id:
+        task_ids.insert(0, job.celery_task_id)
+    if task_ids:
+        await run_in_threadpool(_revoke_tasks, task_ids)
+
+    if image_ids:
+        await db.execute(
+            update(AnalysisResult)
+            .where(
+                AnalysisResult.product_image_id.in_(image_ids),
+                AnalysisResult.status == AnalysisStatus.PENDING.value,
+            )
+            .values(
+                status=AnalysisStatus.FAILED.value,
+                error_message="Processing job cancelled",
+                completed_at=func.now(),
+            )
+        )
+    await db.execute(
+        update(JobStep)
+        .where(JobStep.job_id == job.id, JobStep.status == StepStatus.PENDING.value)
+        .values(status=StepStatus.SKIPPED.value, result_data={"cancelled": True})
+    )
+
+    job.status = JobStatus.CANCELLED.value
+    job.completed_at = datetime.now(UTC)
+    await db.flush()
+    await append_terminal_event(redis_client, job)
@@ -1,14 +1,27 @@
+import json
 import math
 import uuid
+from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import func, literal_column, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
-from shared.exceptions import NotFoundError
+from fastapi_app.services.cursor import decode_cursor, encode_cursor
+from fastapi_app.services.stats_service import record_org_stats, subtract_product_stats
+from shared.config import get_settings
+from shared.constants import CountMode
+from shared.exceptions import NotFoundError, ValidationError
 from shared.models.product import Product
+from shared.product_facets import FACET_VALUE_LIMIT, facet_conditions
 from shared.schemas.product import ProductCreate, ProductFilter, ProductUpdate
 
+settings = get_settings()
+
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
 
 async def create_product(
     db: AsyncSession, user_id: uuid.UUID, org_id: uuid.UUID, data: ProductCreate
@@ -22,6 +35,7 @@ async def create_product(
     )
     db.add(product)
     await db.flush()
+    await record_org_stats(db, org_id, total_products=1)
     await db.refresh(product, attribute_names=["images"])
     return product
 
@@ -40,41 +54,169 @@ async def get_product(
     return product
 
 
+def _search_terms(search: str):
+    """
+    Build the match condition and relevance rank for a product search.
+
+    Full-text matches use the ``search_vector`` GIN index; the trigram index
+    on ``title`` serves substring and partial-word matches the stemmer misses.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, search)
+    match = or_(Product.search_vector.op("@@")(query), Product.title.ilike(f"%{search}%"))
+    rank = func.ts_rank(Product.search_vector, query) + func.similarity(Product.title, search)
+    return match, rank.label("rank")
+
+
+def _decode_product_cursor(cursor: str, ranked: bool) -> tuple:
+    payload = decode_cursor(cursor)
+    try:
+        position = (datetime.fromisoformat(payload["t"]), uuid.UUID(payload["id"]))
+        if ranked:
+            position = (float(payload["r"]),) + position
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid product cursor")
+    return position
+
+
+def _encode_product_cursor(product: Product, rank: float | None) -> str:
+    payload = {"t": product.created_at.isoformat(), "id": str(product.id)}
+    if rank is not None:
+        payload["r"] = rank
+    return encode_cursor(payload)
+
+
+class _ExplainJSON(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_ExplainJSON, "postgresql")
+def _compile_explain_json(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def _estimate_count(db: AsyncSession, query) -> int:
+    """
+    Read the planner's row estimate for ``query`` instead of counting.
+
+    ``EXPLAIN`` only consults table statistics, so the cost is independent of
+    how many rows match.
+    """
+    plan = (await db.execute(_ExplainJSON(query))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _count_products(
+    db: AsyncSession, conditions: list, mode: CountMode
+) -> tuple[int | None, bool]:
+    if mode == CountMode.NONE:
+        return None, False
+
+    count_query = select(func.count(Product.id)).where(*conditions)
+    # The planner estimate is Postgres-only; other databases get an exact count
+    if mode == CountMode.ESTIMATE and db.bind.dialect.name == "postgresql":
+        estimate = await _estimate_count(db, select(Product.id).where(*conditions))
+        if estimate >= settings.products_exact_count_threshold:
+            return estimate, True
+    return (await db.execute(count_query)).scalar() or 0, False
+
+
+async def _facet_counts(db: AsyncSession, conditions: list) -> dict[str, list[dict]]:
+    """Count products per facet value across the filtered set, most common first."""
+    facet = func.jsonb_each(Product.facets).table_valued(
+        "key", "value", joins_implicitly=True
+    ).alias("facet")
+    facet_value = func.jsonb_array_elements_text(facet.c.value).table_valued(
+        "value", joins_implicitly=True
+    ).alias("facet_value")
+
+    result = await db.execute(
+        select(facet.c.key, facet_value.c.value, func.count().label("count"))
+        .select_from(Product)
+        .where(*conditions)
+        .group_by(facet.c.key, facet_value.c.value)
+    )
+
+    counts: dict[str, list[dict]] = {}
+    for row in result.all():
+        counts.setdefault(row.key, []).append({"value": row.value, "count": row.count})
+    for values in counts.values():
+        values.sort(key=lambda v: (-v["count"], v["value"]))
+        del values[FACET_VALUE_LIMIT:]
+    return counts
+
+
 async def list_products(
     db: AsyncSession, org_id: uuid.UUID, filters: ProductFilter
 ) -> dict:
-    query = select(Product).where(Product.organization_id == org_id)
-    count_query = select(func.count(Product.id)).where(Product.organization_id == org_id)
-
+    """
+    List an organization's products, newest first or by search relevance.
+
+    Pages are addressed by an opaque keyset ``cursor`` over
+    ``(created_at, id)`` (prefixed with the rank when searching), so deep
+    pages cost the same as the first. ``page`` still works via ``OFFSET`` for
+    clients that have not moved to cursors. The total is the planner's
+    estimate on large result sets unless an exact count is requested.
+    Facet filters match the denormalized ``facets`` column and
+    ``facet_counts`` summarizes the whole filtered set, not just the page.
+    """
+    conditions = [Product.organization_id == org_id]
     if filters.category:
-        query = query.where(Product.category == filters.category.value)
-        count_query = count_query.where(Product.category == filters.category.value)
+        conditions.append(Product.category == filters.category.value)
     if filters.status:
-        query = query.where(Product.status == filters.status.value)
-        count_query = count_query.where(Product.status == filters.status.value)
-    if filters.search:
-        search_term = f"%{filters.search}%"
-        query = query.where(Product.title.ilike(search_term))
-        count_query = count_query.where(Product.title.ilike(search_term))
+        conditions.append(Product.status == filters.status.value)
+    conditions.extend(facet_conditions(filters.facets))
 
-    total = (await db.execute(count_query)).scalar() or 0
-    offset = (filters.page - 1) * filters.page_size
+    rank = None
+    if filters.search:
+        match, rank = _search_terms(filters.search)
+        conditions.append(match)
+        order_by = [rank.desc(), Product.created_at.desc(), Product.id.desc()]
+        query = select(Product, rank)
+    else:
+        order_by = [Product.created_at.desc(), Product.id.desc()]
+        query = select(Product)
+
+    total, total_is_estimate = await _count_products(db, conditions, filters.count)
+    facet_counts = await _facet_counts(db, conditions) if filters.facet_counts else {}
+
+    query = query.where(*conditions)
+    if filters.cursor:
+        position = _decode_product_cursor(filters.cursor, ranked=rank is not None)
+        keys = (Product.created_at, Product.id) if rank is None else (
+            rank, Product.created_at, Product.id
+        )
+        query = query.where(tuple_(*keys) < position)
+    else:
+        query = query.offset((filters.page - 1) * filters.page_size)
 
-    query = (
+    result = await db.execute(
         query.options(selectinload(Product.images))
-        .order_by(Product.created_at.desc())
-        .offset(offset)
-        .limit(filters.page_size)
+        .order_by(*order_by)
+        .limit(filters.page_size + 1)
     )
-    result = await db.execute(query)
-    items = list(result.scalars().all())
+    rows = result.all()
+    has_more = len(rows) > filters.page_size
+    rows = rows[:filters.page_size]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = _encode_product_cursor(last[0], last[1] if rank is not None else None)
 
     return {
-        "items": items,
+        "items": [row[0] for row in rows],
         "total": total,
+        "total_is_estimate": total_is_estimate,
         "page": filters.page,
         "page_size": filters.page_size,
-        "pages": math.ceil(total / filters.page_size) if total > 0 else 0,
+        "pages": math.ceil(total / filters.page_size) if total is not None else None,
+        "next_cursor": next_cursor,
+        "facet_counts": facet_counts,
     }
 
 
@@ -88,7 +230,8 @@ async def update_product(
             value = value.value
         setattr(product, field, value)
     await db.flush()
-    await db.refresh(product, attribute_names=["images"])
+    # updated_at is set by the database on flush and expired with it
+    await db.refresh(product, attribute_names=["images", "updated_at"])
     return product
 
 
@@ -96,5 +239,6 @@ async def delete_product(
     db: AsyncSession, product_id: uuid.UUID, org_id: uuid.UUID
 ) -> None:
     product = await get_product(db, product_id, org_id)
+    await subtract_product_stats(db, product)
     await db.delete(product)
     await db.flush()
@@ -0,0 +1,209 @@
+import uuid
+
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import String, cast, func, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_app.services.product_service import get_product
+from shared.config import get_settings
+from shared.exceptions import ValidationError
+from shared.models.embedding import IMAGE_EMBEDDING_DIM, ImageEmbedding
+from shared.models.product import Product, ProductImage
+from shared.near_duplicates import group_near_duplicates, probe_keys
+
+settings = get_settings()
+
+
+def _vector_literal(vector: list[float]) -> str:
+    if len(vector) != IMAGE_EMBEDDING_DIM:
+        raise ValidationError(f"Expected a {IMAGE_EMBEDDING_DIM}-d embedding")
+    return "[" + ",".join(f"{value:.6g}" for value in vector) + "]"
+
+
+async def _nearest_products(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+    query_vector: str,
+    limit: int,
+    exclude_product_id: uuid.UUID | None = None,
+) -> list[dict]:
+    """
+    Top ``limit`` products by cosine similarity of their closest image.
+
+    The inner query is a plain ``ORDER BY embedding <=> q LIMIT n`` so it is
+    answered by the HNSW index; iterative scans keep it returning enough rows
+    when the organization filter discards most neighbours. Candidates are
+    over-fetched and collapsed to one row per product.
+    """
+    ef_search = int(settings.similarity_hnsw_ef_search)
+    await db.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+    await db.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+
+    # Bound as text and cast server-side, so asyncpg needs no halfvec codec
+    query = cast(literal(query_vector, String), HALFVEC(IMAGE_EMBEDDING_DIM))
+    distance = ImageEmbedding.embedding.cosine_distance(query)
+
+    candidates = select(ImageEmbedding.product_id, distance.label("distance")).where(
+        ImageEmbedding.organization_id == org_id,
+        ImageEmbedding.model_version == settings.similarity_embedding_version,
+    )
+    if exclude_product_id:
+        candidates = candidates.where(ImageEmbedding.product_id != exclude_product_id)
+    candidates = (
+        candidates.order_by(distance)
+        .limit(limit * settings.similarity_candidate_factor)
+        .subquery("candidates")
+    )
+
+    best_distance = func.min(candidates.c.distance).label("distance")
+    rows = (await db.execute(
+        select(candidates.c.product_id, best_distance)
+        .group_by(candidates.c.product_id)
+        .order_by(best_distance)
+        .limit(limit)
+    )).all()
+    if not rows:
+        return []
+
+    result = await db.execute(
+        select(Product)
+        .options(selectinload(Product.images))
+        .where(Product.id.in_([row.product_id for row in rows]))
+    )
+    products = {product.id: product for product in result.scalars().all()}
+    return [
+        {"product": products[row.product_id], "similarity": round(1 - row.distance, 4)}
+        for row in rows
+        if row.product_id in products
+    ]
+
+
+async def find_similar_products(
+    db: AsyncSession, product_id: uuid.UUID, org_id: uuid.UUID, limit: int = 10
+) -> dict:
+    """Products that look most like ``product_id``, using the mean of its image embeddings."""
+    await get_product(db, product_id, org_id)
+
+    query_vector = (await db.execute(
+        select(cast(func.avg(ImageEmbedding.embedding), String)).where(
+            ImageEmbedding.product_id == product_id,
+            ImageEmbedding.model_version == settings.similarity_embedding_version,
+        )
+    )).scalar()
+    if query_vector is None:
+        return {"items": []}
+
+    items = await _nearest_products(
+        db, org_id, query_vector, limit, exclude_product_id=product_id
+    )
+    return {"items": items}
+
+
+async def search_by_embedding(
+    db: AsyncSession, org_id: uuid.UUID, embedding: list[float], limit: int = 10
+) -> dict:
+    items = await _nearest_products(db, org_id, _vector_literal(embedding), limit)
+    return {"items": items}
+
+
+async def _seed_chunk(
+    db: AsyncSession, org_id: uuid.UUID, after: uuid.UUID | None, size: int
+) -> list:
+    """The next ``size`` hashed images of the organization in ID order."""
+    query = (
+        select(ProductImage.id, ProductImage.product_id, ProductImage.perceptual_hash)
+        .join(Product, ProductImage.product_id == Product.id)
+        .where(
+            Product.organization_id == org_id,
+            ProductImage.perceptual_hash.is_not(None),
+        )
+    )
+    if after:
+        query = query.where(ProductImage.id > after)
+    return list((await db.execute(query.order_by(ProductImage.id).limit(size))).all())
+
+
+async def _band_neighbours(
+    db: AsyncSession, org_id: uuid.UUID, seeds: list, max_distance: int
+) -> list:
+    """Images sharing a probed band key with any seed, found through the GIN band index."""
+    keys = sorted({key for seed in seeds for key in probe_keys(seed.perceptual_hash, max_distance)})
+    return list((await db.execute(
+        select(ProductImage.id, ProductImage.product_id, ProductImage.perceptual_hash)
+        .join(Product, ProductImage.product_id == Product.id)
+        .where(
+            Product.organization_id == org_id,
+            ProductImage.phash_bands.overlap(keys),
+        )
+    )).all())
+
+
+async def find_duplicate_groups(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+    max_distance: int | None = None,
+    limit: int = 50,
+    cursor: uuid.UUID | None = None,
+) -> dict:
+    """
+    One page of groups of images whose perceptual hashes are within ``max_distance``.
+
+    Images are walked in ID order, ``near_duplicate_scan_chunk_size`` at a
+    time, and each chunk's near matches are fetched through the band index,
+    so a page reads its seeds and their neighbours rather than every hash in
+    the organization. A group is reported with the chunk that holds its
+    lowest image ID, so pages never repeat one. Chunks are scanned until at
+    least ``limit`` groups are found; ``next_cursor`` resumes after the last.
+    """
+    if max_distance is None:
+        max_distance = settings.near_duplicate_max_distance
+    chunk_size = settings.near_duplicate_scan_chunk_size
+
+    product_of: dict[uuid.UUID, uuid.UUID] = {}
+    clusters: list[list[uuid.UUID]] = []
+    after = cursor
+    while len(clusters) < limit:
+        seeds = await _seed_chunk(db, org_id, after, chunk_size)
+        if not seeds:
+            after = None
+            break
+        neighbours = await _band_neighbours(db, org_id, seeds, max_distance)
+        rows = {row.id: row for row in [*seeds, *neighbours]}
+        product_of.update({row.id: row.product_id for row in rows.values()})
+
+        found = await run_in_threadpool(
+            group_near_duplicates,
+            [(row.id, row.perceptual_hash) for row in rows.values()],
+            max_distance,
+        )
+        low, high = seeds[0].id, seeds[-1].id
+        clusters.extend(sorted(cluster) for cluster in found if low <= min(cluster) <= high)
+
+        after = high
+        if len(seeds) < chunk_size:
+            after = None
+            break
+    clusters.sort(key=len, reverse=True)
+
+    product_ids = {product_of[image_id] for cluster in clusters for image_id in cluster}
+    result = await db.execute(
+        select(Product)
+        .options(selectinload(Product.images))
+        .where(Product.id.in_(product_ids))
+    )
+    products = {product.id: product for product in result.scalars().all()}
+
+    groups = []
+    for cluster in clusters:
+        group_product_ids = list(dict.fromkeys(product_of[image_id] for image_id in cluster))
+        groups.append({
+            "image_ids": cluster,
+            "products": [products[pid] for pid in group_product_ids if pid in products],
+        })
+    return {
+        "groups": groups,
+        "next_cursor": str(after) if after else None,
+        "max_distance": max_distance,
+    }
@@ -0,0 +1,148 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.analytics import ROLLUP_COUNTERS, histogram_percentile, merge_histograms
+from shared.constants import RollupGranularity
+from shared.exceptions import ValidationError
+from shared.models.product import Product
+from shared.models.stats import AnalyticsRollup, OrganizationStats
+from shared.org_stats import increment_org_stats, merge_stats_rows, set_org_stats, stats_queries
+
+# granularity -> (default range, maximum range)
+TIMESERIES_SPANS = {
+    RollupGranularity.HOUR: (timedelta(days=7), timedelta(days=31)),
+    RollupGranularity.DAY: (timedelta(days=90), timedelta(days=731)),
+}
+
+
+async def record_org_stats(db: AsyncSession, org_id: uuid.UUID, **deltas: int) -> None:
+    if any(deltas.values()):
+        await db.execute(increment_org_stats(org_id, **deltas))
+
+
+async def _compute_stats(
+    db: AsyncSession,
+    org_id: uuid.UUID | None = None,
+    product_id: uuid.UUID | None = None,
+    org_ids: tuple[uuid.UUID, ...] = (),
+) -> dict[uuid.UUID, dict[str, int]]:
+    rows = []
+    for query in stats_queries(org_id=org_id, product_id=product_id):
+        rows.extend((await db.execute(query)).all())
+    return merge_stats_rows(rows, org_ids)
+
+
+async def subtract_product_stats(db: AsyncSession, product: Product) -> None:
+    """Remove a product's contribution before it (and its cascade) is deleted."""
+    stats = (
+        await _compute_stats(db, org_id=product.organization_id, product_id=product.id)
+    ).get(product.organization_id)
+    if stats:
+        await record_org_stats(
+            db, product.organization_id, **{name: -value for name, value in stats.items()}
+        )
+
+
+async def get_org_stats(db: AsyncSession, org_id: uuid.UUID) -> OrganizationStats:
+    """
+    Read an organization's precomputed counters.
+
+    Organizations without a row yet (e.g. created before the rollup existed
+    and not reconciled since) are computed once on demand and stored.
+    """
+    stats = await db.get(OrganizationStats, org_id)
+    if stats is None:
+        values = (
+            await _compute_stats(db, org_id=org_id, org_ids=(org_id,))
+        )[org_id]
+        await db.execute(set_org_stats(org_id, values))
+        stats = (
+            await db.execute(
+                select(OrganizationStats)
+                .where(OrganizationStats.organization_id == org_id)
+                .execution_options(populate_existing=True)
+            )
+        ).scalar_one()
+    return stats
+
+
+def _ratio(numerator: int, denominator: int) -> float | None:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+async def get_analytics_timeseries(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+    granularity: RollupGranularity,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    category: str | None = None,
+) -> dict:
+    """
+    Serve pipeline throughput/latency trends from the analytics rollups.
+
+    Category rows of each bucket are summed and their latency histograms
+    merged, so percentiles stay exact to the histogram resolution no matter
+    how many categories or hours a point covers.
+    """
+    default_span, max_span = TIMESERIES_SPANS[granularity]
+    end = end or datetime.now(UTC)
+    start = start or end - default_span
+    # Naive query parameters are taken as UTC
+    end = end if end.tzinfo else end.replace(tzinfo=UTC)
+    start = start if start.tzinfo else start.replace(tzinfo=UTC)
+    if start >= end:
+        raise ValidationError("start must be before end")
+    if end - start > max_span:
+        raise ValidationError(
+            f"Range too large for {granularity.value} granularity (max {max_span.days} days)"
+        )
+
+    query = select(AnalyticsRollup).where(
+        AnalyticsRollup.organization_id == org_id,
+        AnalyticsRollup.granularity == granularity.value,
+        AnalyticsRollup.bucket_start >= start,
+        AnalyticsRollup.bucket_start < end,
+    )
+    if category:
+        query = query.where(AnalyticsRollup.category == category)
+    rows = (await db.execute(query.order_by(AnalyticsRollup.bucket_start))).scalars().all()
+
+    buckets: dict[datetime, list[AnalyticsRollup]] = {}
+    for row in rows:
+        buckets.setdefault(row.bucket_start, []).append(row)
+
+    points = []
+    for bucket_start, bucket_rows in buckets.items():
+        totals = {name: sum(getattr(r, name) for r in bucket_rows) for name in ROLLUP_COUNTERS}
+        histogram = merge_histograms(r.latency_histogram for r in bucket_rows)
+        processed = totals["images_processed"]
+        points.append({
+            "bucket_start": bucket_start.isoformat(),
+            "images_processed": processed,
+            "images_failed": totals["images_failed"],
+            "failure_rate": _ratio(totals["images_failed"], processed + totals["images_failed"]),
+            "avg_processing_time_ms": (
+                round(totals["processing_time_total_ms"] / processed) if processed else None
+            ),
+            "p50_processing_time_ms": histogram_percentile(histogram, 0.50),
+            "p95_processing_time_ms": histogram_percentile(histogram, 0.95),
+            "p99_processing_time_ms": histogram_percentile(histogram, 0.99),
+            "defect_rate": _ratio(totals["images_with_defects"], processed),
+            "fallback_rate": _ratio(totals["fallback_descriptions"], processed),
+            "defect_rate_by_category": {
+                r.category: _ratio(r.images_with_defects, r.images_processed)
+                for r in bucket_rows
+                if r.images_processed
+            },
+        })
+
+    return {
+        "granularity": granularity.value,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "points": points,
+    }
@@ -1,16 +1,27 @@
 import uuid
-from datetime import datetime, UTC
+from datetime import UTC, datetime
 
 import boto3
 from botocore.config import Config as BotoConfig
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi_app.services.admission_service import dispatch_image
+from fastapi_app.services.stats_service import record_org_stats
+from shared.admission import AdmissionDecision
 from shared.config import get_settings
-from shared.constants import AnalysisStatus, JobStatus, JobType, StepName, StepStatus
+from shared.constants import (
+    AdmissionAction,
+    AnalysisStatus,
+    JobStatus,
+    JobType,
+    StepName,
+    StepStatus,
+)
 from shared.exceptions import NotFoundError, StorageError, ValidationError
 from shared.models.analysis import AnalysisResult
 from shared.models.pipeline import JobStep, ProcessingJob
 from shared.models.product import Product, ProductImage
+from shared.tracing import trace_aws_calls
 
 settings = get_settings()
 
@@ -27,7 +38,7 @@ def get_s3_client():
     }
     if settings.s3_endpoint_url:
         kwargs["endpoint_url"] = settings.s3_endpoint_url
-    return boto3.client(**kwargs)
+    return trace_aws_calls(boto3.client(**kwargs))
 
 
 def generate_s3_key(user_id: uuid.UUID, product_id: uuid.UUID, filename: str) -> str:
@@ -57,7 +68,8 @@ async def create_presigned_upload(
         query = query.where(Product.user_id == user_id)
 
     result = await db.execute(query)
-    if not result.scalar_one_or_none():
+    product = result.scalar_one_or_none()
+    if not product:
         raise NotFoundError("Product", str(product_id))
 
     s3_key = generate_s3_key(user_id, product_id, filename)
@@ -74,6 +86,7 @@ async def create_presigned_upload(
     )
     db.add(image)
     await db.flush()
+    await record_org_stats(db, product.organization_id, total_images=1)
     await db.refresh(image)
 
     # Generate presigned URL
@@ -103,6 +116,7 @@ async def confirm_upload(
     db: AsyncSession,
     user_id: uuid.UUID,
     image_id: uuid.UUID,
+    admission: AdmissionDecision,
 ) -> dict:
     from sqlalchemy import select
     from sqlalchemy.orm import selectinload
@@ -131,7 +145,9 @@ async def confirm_upload(
     image.product.status = "processing"
 
     # Create analysis result placeholder
+    org_id = image.product.organization_id
     analysis = AnalysisResult(
+        organization_id=org_id,
         product_image_id=image.id,
         model_version="pending",
         status=AnalysisStatus.PENDING.value,
@@ -140,6 +156,7 @@ async def confirm_upload(
 
     # Create processing job
     job = ProcessingJob(
+        organization_id=org_id,
         user_id=user_id,
         job_type=JobType.SINGLE.value,
         status=JobStatus.QUEUED.value,
@@ -152,6 +169,7 @@ async def confirm_upload(
     # Create job steps
     for step_name in StepName:
         step = JobStep(
+            organization_id=org_id,
             job_id=job.id,
             product_image_id=image.id,
             step_name=step_name.value,
@@ -162,16 +180,15 @@ async def confirm_upload(
     await db.flush()
 
     # Dispatch Celery task
-    from workers.tasks.image_processing import process_image
-
-    task = process_image.delay(str(image.id), str(job.id))
-    job.celery_task_id = task.id
+    job.celery_task_id = await dispatch_image(db, job, image.id, admission)
     job.started_at = datetime.now(UTC)
     await db.flush()
 
+    deferred = admission.action == AdmissionAction.DEFER
     return {
         "image_id": image.id,
         "job_id": job.id,
-        "status": "queued",
-        "message": "Image processing started",
+        "status": "deferred" if deferred else "queued",
+        "message": "Image queued behind batch work" if deferred else "Image processing started",
+        "estimated_wait_seconds": admission.estimated_wait_seconds,
     }
@@ -1,6 +1,7 @@
 import logging
 from functools import lru_cache
 
+import numpy as np
 import torch
 import torch.nn.functional as F
 from torchvision import models
@@ -38,6 +39,26 @@ def classify_image(image_tensor: torch.Tensor, version: str = "v1") -> dict:
         output = model(image_tensor)
         probabilities = F.softmax(output, dim=1)
 
+    return _build_result(probabilities, categories, version)
+
+
+def classify_features(features: np.ndarray, version: str = "v1") -> list[dict]:
+    """
+    Classify pooled backbone features (e.g. stored embeddings) with the classifier head only.
+
+    ``features`` is an (N, 1792) array; one result per row, same shape as :func:`classify_image`.
+    Valid while the classifier and the feature extractor share backbone weights.
+    """
+    model, categories = load_classifier(version)
+
+    with torch.no_grad():
+        output = model.classifier(torch.from_numpy(np.atleast_2d(features)).float())
+        probabilities = F.softmax(output, dim=1)
+
+    return [_build_result(row.unsqueeze(0), categories, version) for row in probabilities]
+
+
+def _build_result(probabilities: torch.Tensor, categories: list[str], version: str) -> dict:
     # Get top-5 predictions
     top5_prob, top5_idx = torch.topk(probabilities, 5)
     top5_prob = top5_prob.squeeze().tolist()
@@ -6,8 +6,6 @@ import torch
 from torchvision import models
 from torchvision.models import EfficientNet_B4_Weights
 
-from ml.config import COLOR_NAMES, CONDITION_LEVELS, MATERIAL_NAMES
-
 logger = logging.getLogger(__name__)
 
 
@@ -128,22 +126,33 @@ def extract_condition(features: np.ndarray) -> dict:
     return {"name": "condition", "value": condition, "confidence": round(confidence, 4)}
 
 
-def extract_attributes(image_tensor: torch.Tensor, version: str = "v1") -> list[dict]:
+def extract_features(image_tensor: torch.Tensor, version: str = "v1") -> np.ndarray:
+    """Run the backbone and return the pooled 1792-d feature vector."""
+    model = load_feature_extractor(version)
+
+    with torch.no_grad():
+        return model(image_tensor).squeeze().numpy()
+
+
+def extract_feature_attributes(features: np.ndarray) -> list[dict]:
+    """Attributes computed from backbone features alone, without the image pixels."""
+    return [extract_material(features), extract_condition(features)]
+
+
+def extract_attributes(
+    image_tensor: torch.Tensor,
+    version: str = "v1",
+    features: np.ndarray | None = None,
+) -> list[dict]:
     """
     Extract product attributes from image.
 
+    Pass ``features`` (e.g. a stored embedding) to skip the backbone forward pass.
+
     Returns:
         List of dicts with keys: name, value, confidence
     """
-    model = load_feature_extractor(version)
-
-    with torch.no_grad():
-        features = model(image_tensor).squeeze().numpy()
-
-    attributes = [
-        extract_color(image_tensor),
-        extract_material(features),
-        extract_condition(features),
-    ]
+    if features is None:
+        features = extract_features(image_tensor, version)
 
-    return attributes
+    return [extract_color(image_tensor), *extract_feature_attributes(features)]
@@ -1,5 +1,4 @@
 import base64
-import io
 import json
 import logging
 import time
@@ -7,9 +6,12 @@ import time
 import boto3
 from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
+from opentelemetry import trace
 
 from shared.config import get_settings
 from shared.exceptions import ExternalServiceError
+from shared.metrics import BEDROCK_API_CALLS
+from shared.tracing import trace_aws_calls, tracer
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -26,9 +28,10 @@ def get_bedrock_client():
             read_timeout=60,
         ),
     }
-    return boto3.client(**kwargs)
+    return trace_aws_calls(boto3.client(**kwargs))
 
 
+@tracer.start_as_current_span("bedrock.invoke_claude")
 def invoke_claude(
     prompt: str,
     image_bytes: bytes | None = None,
@@ -48,6 +51,12 @@ def invoke_claude(
         Claude's text response
     """
     client = get_bedrock_client()
+    span = trace.get_current_span()
+    span.set_attributes({
+        "bedrock.model_id": settings.bedrock_model_id,
+        "bedrock.max_tokens": max_tokens,
+        "bedrock.has_image": image_bytes is not None,
+    })
 
     # Build message content
     content = []
@@ -84,13 +93,20 @@ def invoke_claude(
         logger.info(f"Bedrock invocation took {elapsed:.2f}s")
 
         response_body = json.loads(response["body"].read())
-        return response_body["content"][0]["text"]
+        text = response_body["content"][0]["text"]
+        BEDROCK_API_CALLS.labels(status="success").inc()
+        return text
 
     except ClientError as e:
         error_code = e.response["Error"]["Code"]
         error_msg = e.response["Error"]["Message"]
+        BEDROCK_API_CALLS.labels(status=error_code).inc()
+        span.set_attribute("bedrock.error_code", error_code)
         logger.error(f"Bedrock error ({error_code}): {error_msg}")
-        raise ExternalServiceError("AWS Bedrock", f"{error_code}: {error_msg}")
+        raise ExternalServiceError(
+            "AWS Bedrock", f"{error_code}: {error_msg}", error_code=error_code
+        )
     except Exception as e:
+        BEDROCK_API_CALLS.labels(status="error").inc()
         logger.exception(f"Unexpected Bedrock error: {e}")
         raise ExternalServiceError("AWS Bedrock", str(e))
@@ -4,8 +4,10 @@ import boto3
 from botocore.config import Config as BotoConfig
 
 from ml.services.bedrock_client import invoke_claude
+from shared.analytics import FALLBACK_DESCRIPTION_MODEL
 from shared.config import get_settings
 from shared.exceptions import ExternalServiceError
+from shared.tracing import trace_aws_calls
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -66,7 +68,7 @@ def download_image_bytes(s3_bucket: str, s3_key: str) -> bytes:
     }
     if settings.s3_endpoint_url:
         kwargs["endpoint_url"] = settings.s3_endpoint_url
-    s3 = boto3.client(**kwargs)
+    s3 = trace_aws_calls(boto3.client(**kwargs))
     response = s3.get_object(Bucket=s3_bucket, Key=s3_key)
     return response["Body"].read()
 
@@ -152,5 +154,5 @@ def generate_fallback_description(
 
     return {
         "description": " ".join(parts),
-        "model": "fallback-template",
+        "model": FALLBACK_DESCRIPTION_MODEL,
     }
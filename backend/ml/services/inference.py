@@ -1,35 +1,84 @@
 import logging
+import time
+from contextlib import contextmanager
 
+import numpy as np
 import torch
 
-from ml.models.classifier import classify_image
+from ml.models.classifier import classify_features, classify_image
 from ml.models.defect_detector import detect_defects
-from ml.models.feature_extractor import extract_attributes
+from ml.models.feature_extractor import (
+    extract_attributes,
+    extract_feature_attributes,
+    extract_features,
+)
 from ml.models.model_registry import registry
+from shared.metrics import (
+    ML_CLASSIFICATION_CONFIDENCE,
+    ML_INFERENCE_DURATION,
+    ML_INFERENCE_TOTAL,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@contextmanager
+def _timed(model: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ML_INFERENCE_DURATION.labels(model=model).observe(time.perf_counter() - start)
+        ML_INFERENCE_TOTAL.labels(model=model).inc()
+
+
 def run_classification(image_tensor: torch.Tensor, version: str = "v1") -> dict:
     """Run product classification on preprocessed image tensor."""
     logger.info(f"Running product classification (version={version})...")
-    result = classify_image(image_tensor, version=version)
+    with _timed("classifier"):
+        result = classify_image(image_tensor, version=version)
+    ML_CLASSIFICATION_CONFIDENCE.observe(result["confidence"])
     logger.info(f"Classification result: {result['label']} ({result['confidence']:.4f})")
     return result
 
 
-def run_attribute_extraction(image_tensor: torch.Tensor, version: str = "v1") -> list[dict]:
+def run_classification_head(features: np.ndarray, version: str = "v1") -> list[dict]:
+    """Re-score stored backbone features with the classifier head of ``version``."""
+    logger.info(f"Running classifier head on stored features (version={version})...")
+    with _timed("classifier_head"):
+        return classify_features(features, version=version)
+
+
+def run_feature_extraction(image_tensor: torch.Tensor, version: str = "v1") -> np.ndarray:
+    """Compute the backbone embedding for a preprocessed image tensor."""
+    logger.info(f"Running feature extraction (version={version})...")
+    with _timed("feature_extractor"):
+        return extract_features(image_tensor, version=version)
+
+
+def run_attribute_extraction(
+    image_tensor: torch.Tensor,
+    version: str = "v1",
+    features: np.ndarray | None = None,
+) -> list[dict]:
     """Run attribute extraction on preprocessed image tensor."""
     logger.info(f"Running attribute extraction (version={version})...")
-    attributes = extract_attributes(image_tensor, version=version)
+    with _timed("attribute_extractor"):
+        attributes = extract_attributes(image_tensor, version=version, features=features)
     logger.info(f"Extracted {len(attributes)} attributes")
     return attributes
 
 
+def run_feature_attribute_extraction(features: np.ndarray) -> list[dict]:
+    """Attributes that depend only on backbone features (material, condition)."""
+    return extract_feature_attributes(features)
+
+
 def run_defect_detection(image_tensor: torch.Tensor, version: str = "v1") -> list[dict]:
     """Run defect detection on preprocessed image tensor."""
     logger.info(f"Running defect detection (version={version})...")
-    defects = detect_defects(image_tensor, version=version)
+    with _timed("defect_detector"):
+        defects = detect_defects(image_tensor, version=version)
     logger.info(f"Detected {len(defects)} defects")
     return defects
 
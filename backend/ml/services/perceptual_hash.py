@@ -0,0 +1,56 @@
+import io
+import logging
+
+import numpy as np
+from PIL import Image
+
+from shared.exceptions import ImageDecodeError
+
+logger = logging.getLogger(__name__)
+
+# pHash: DCT of a 32x32 grayscale thumbnail, keeping the 8x8 lowest frequencies
+PHASH_IMAGE_SIZE = 32
+PHASH_LOW_FREQ_SIZE = 8
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so ``M @ x @ M.T`` is the 2-D DCT of ``x``."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+_DCT = _dct_matrix(PHASH_IMAGE_SIZE)
+
+
+def perceptual_hash(image: Image.Image) -> int:
+    """
+    64-bit perceptual hash of an image.
+
+    Each bit says whether a low-frequency DCT coefficient is above the median,
+    so resizing and recompression flip only a few bits.
+    """
+    pixels = np.asarray(
+        image.convert("L").resize(
+            (PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE), Image.Resampling.LANCZOS
+        ),
+        dtype=np.float64,
+    )
+    low_freq = (_DCT @ pixels @ _DCT.T)[:PHASH_LOW_FREQ_SIZE, :PHASH_LOW_FREQ_SIZE]
+    # The DC term only carries overall brightness
+    bits = (low_freq > np.median(low_freq.flatten()[1:])).flatten()
+
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def perceptual_hash_from_bytes(image_bytes: bytes) -> int:
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+    except Exception as e:
+        raise ImageDecodeError(f"Failed to open image: {e}")
+    return perceptual_hash(image)
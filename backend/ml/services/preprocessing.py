@@ -4,12 +4,14 @@ import logging
 import boto3
 import torch
 from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
 from PIL import Image
 from torchvision import transforms
 
 from ml.config import CLASSIFICATION_INPUT_SIZE
 from shared.config import get_settings
-from shared.exceptions import StorageError
+from shared.exceptions import ImageDecodeError, NotFoundError, StorageError
+from shared.tracing import trace_aws_calls
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -32,7 +34,23 @@ def get_s3_client():
     }
     if settings.s3_endpoint_url:
         kwargs["endpoint_url"] = settings.s3_endpoint_url
-    return boto3.client(**kwargs)
+    return trace_aws_calls(boto3.client(**kwargs))
+
+
+def download_image(s3_bucket: str, s3_key: str) -> bytes:
+    """Download the raw image bytes from S3."""
+    logger.info(f"Downloading image from s3://{s3_bucket}/{s3_key}")
+
+    try:
+        s3 = get_s3_client()
+        response = s3.get_object(Bucket=s3_bucket, Key=s3_key)
+        return response["Body"].read()
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("NoSuchKey", "NoSuchBucket", "404"):
+            raise NotFoundError("Image object", f"s3://{s3_bucket}/{s3_key}")
+        raise StorageError(f"Failed to download image from S3: {e}")
+    except Exception as e:
+        raise StorageError(f"Failed to download image from S3: {e}")
 
 
 def download_and_preprocess(s3_bucket: str, s3_key: str) -> torch.Tensor:
@@ -42,29 +60,17 @@ def download_and_preprocess(s3_bucket: str, s3_key: str) -> torch.Tensor:
     Returns:
         Tensor of shape (1, 3, H, W) ready for model input
     """
-    logger.info(f"Downloading image from s3://{s3_bucket}/{s3_key}")
+    return preprocess_from_bytes(download_image(s3_bucket, s3_key))
 
-    try:
-        s3 = get_s3_client()
-        response = s3.get_object(Bucket=s3_bucket, Key=s3_key)
-        image_bytes = response["Body"].read()
-    except Exception as e:
-        raise StorageError(f"Failed to download image from S3: {e}")
 
+def preprocess_from_bytes(image_bytes: bytes) -> torch.Tensor:
+    """Preprocess image from raw bytes."""
     try:
         image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
     except Exception as e:
-        raise StorageError(f"Failed to open image: {e}")
+        raise ImageDecodeError(f"Failed to open image: {e}")
 
     logger.info(f"Image size: {image.size}, preprocessing for inference")
 
     # Apply transforms and add batch dimension
-    tensor = preprocess_transform(image).unsqueeze(0)
-
-    return tensor
-
-
-def preprocess_from_bytes(image_bytes: bytes) -> torch.Tensor:
-    """Preprocess image from raw bytes."""
-    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
     return preprocess_transform(image).unsqueeze(0)
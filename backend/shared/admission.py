@@ -0,0 +1,113 @@
+"""
+Admission control for the image-processing lanes.
+
+A lane's load is its backlog, divided by the rate at which it has recently
+been draining. The drain rate is counted by the workers into per-minute
+buckets. The resulting wait estimate is compared with per-lane thresholds,
+so the API can accept new work, divert it to a less loaded lane, or turn it
+away with an honest ``Retry-After``.
+"""
+import math
+from dataclasses import dataclass
+
+from shared.constants import AdmissionAction
+
+# Retry-After is capped so clients come back to check rather than give up
+MAX_RETRY_AFTER_SECONDS = 3600
+
+
+def lane_completions_key(lane: str, minute: int) -> str:
+    """Image tasks of ``lane`` finished during the epoch minute ``minute``."""
+    return f"lane_completions:{lane}:{minute}"
+
+
+@dataclass(frozen=True)
+class LaneLoad:
+    backlog: int
+    drain_rate: float  # tasks per second
+
+    def wait_seconds(self, extra: int = 0) -> float:
+        """Estimated time for the lane to work through its backlog plus ``extra`` tasks."""
+        return (self.backlog + extra) / self.drain_rate if self.drain_rate > 0 else math.inf
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    action: AdmissionAction
+    estimated_wait_seconds: int | None = None
+    retry_after: int | None = None
+
+
+def drain_rate(completions: int, window_seconds: float, min_samples: int, baseline: float) -> float:
+    """
+    Tasks per second the lane is completing.
+
+    With too few recent completions to measure, ``baseline`` is used instead.
+    An idle lane completes little, and that says nothing about its capacity.
+    """
+    if completions < min_samples:
+        return baseline
+    return completions / window_seconds
+
+
+def _retry_after(wait: float, threshold: float) -> int:
+    if math.isinf(wait):
+        return MAX_RETRY_AFTER_SECONDS
+    return max(1, min(MAX_RETRY_AFTER_SECONDS, math.ceil(wait - threshold)))
+
+
+def _estimate(wait: float) -> int | None:
+    return None if math.isinf(wait) else math.ceil(wait)
+
+
+def admit_interactive(
+    interactive: LaneLoad, batch: LaneLoad, defer_after: float, batch_reject_after: float
+) -> AdmissionDecision:
+    """
+    Decide where one interactive image should run.
+
+    The interactive lane takes it while its wait is under ``defer_after``.
+    Past that, the image is deferred to the batch lane, if that lane is
+    within its own limit. Otherwise it is rejected until the interactive lane
+    is expected to be back under its threshold.
+    """
+    wait = interactive.wait_seconds(1)
+    if wait <= defer_after:
+        return AdmissionDecision(AdmissionAction.ACCEPT, _estimate(wait))
+
+    batch_wait = batch.wait_seconds(1)
+    if batch_wait <= batch_reject_after:
+        return AdmissionDecision(AdmissionAction.DEFER, _estimate(batch_wait))
+
+    retry_after = min(
+        _retry_after(wait, defer_after), _retry_after(batch_wait, batch_reject_after)
+    )
+    return AdmissionDecision(AdmissionAction.REJECT, retry_after=retry_after)
+
+
+def admit_batch(
+    batch: LaneLoad,
+    images: int,
+    reject_after: float,
+    org_queued: int,
+    org_max_queued: int,
+) -> AdmissionDecision:
+    """
+    Decide whether ``images`` more batch images can be queued.
+
+    The whole lane is limited by its estimated wait. On top of that, each
+    organization may have at most ``org_max_queued`` images waiting. Over
+    that limit, ``THROTTLE`` tells the organization to slow down, while the
+    lane stays open to others.
+    """
+    wait = batch.wait_seconds(images)
+    if wait > reject_after:
+        return AdmissionDecision(
+            AdmissionAction.REJECT, retry_after=_retry_after(wait, reject_after)
+        )
+    if org_queued + images > org_max_queued:
+        excess = LaneLoad(org_queued + images - org_max_queued, batch.drain_rate)
+        return AdmissionDecision(
+            AdmissionAction.THROTTLE, retry_after=_retry_after(excess.wait_seconds(), 0)
+        )
+    return AdmissionDecision(AdmissionAction.ACCEPT, _estimate(wait))
@@ -0,0 +1,177 @@
+"""
+Reuse of completed analyses for byte-identical and near-duplicate images.
+
+An image whose SHA-256 matches an image that was already analysed in the
+same organization, by the same model versions, gets a copy of that result
+instead of another pass through the models and Bedrock. An image whose
+perceptual hash is merely close to an analysed one can take over its
+classification and attributes, while defects and the description are still
+produced for the new image.
+"""
+import hashlib
+
+from sqlalchemy import cast, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import BIT, insert
+from sqlalchemy.orm import Session, selectinload
+
+from shared.constants import AnalysisStatus
+from shared.models.analysis import AnalysisResult, DetectedDefect, ExtractedAttribute
+from shared.models.embedding import ImageEmbedding
+from shared.models.product import ProductImage
+from shared.near_duplicates import PHASH_BITS, probe_keys, to_signed64
+
+
+def content_sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def find_reusable_analysis(
+    session: Session,
+    analysis: AnalysisResult,
+    sha256: str,
+    model_versions: dict,
+) -> AnalysisResult | None:
+    """Most recent completed analysis of an identical image in the same organization."""
+    return session.execute(
+        select(AnalysisResult)
+        .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
+        .options(
+            selectinload(AnalysisResult.extracted_attributes),
+            selectinload(AnalysisResult.detected_defects),
+        )
+        .where(
+            ProductImage.content_sha256 == sha256,
+            AnalysisResult.organization_id == analysis.organization_id,
+            AnalysisResult.status == AnalysisStatus.COMPLETED.value,
+            AnalysisResult.model_versions == model_versions,
+            AnalysisResult.id != analysis.id,
+        )
+        .order_by(AnalysisResult.updated_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def find_near_duplicate_analysis(
+    session: Session,
+    analysis: AnalysisResult,
+    phash: int,
+    model_versions: dict,
+    max_distance: int,
+) -> tuple[AnalysisResult, int] | None:
+    """
+    Closest completed analysis of a perceptually similar image, with its Hamming distance.
+
+    Only the classifier and feature extractor versions have to match, since
+    those are the outputs that get reused.
+    """
+    distance = func.bit_count(
+        cast(ProductImage.perceptual_hash.op("#")(to_signed64(phash)), BIT(PHASH_BITS))
+    ).label("distance")
+    row = session.execute(
+        select(AnalysisResult, distance)
+        .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
+        .options(selectinload(AnalysisResult.extracted_attributes))
+        .where(
+            ProductImage.phash_bands.overlap(probe_keys(phash, max_distance)),
+            AnalysisResult.organization_id == analysis.organization_id,
+            AnalysisResult.status == AnalysisStatus.COMPLETED.value,
+            AnalysisResult.model_versions["classifier"].astext
+            == model_versions["classifier"],
+            AnalysisResult.model_versions["feature_extractor"].astext
+            == model_versions["feature_extractor"],
+            AnalysisResult.id != analysis.id,
+            distance <= max_distance,
+        )
+        .order_by(distance, AnalysisResult.updated_at.desc())
+        .limit(1)
+    ).first()
+    return (row[0], row[1]) if row else None
+
+
+def _copy_attributes(session: Session, source: AnalysisResult, target: AnalysisResult) -> None:
+    session.execute(delete(ExtractedAttribute).where(
+        ExtractedAttribute.analysis_result_id == target.id
+    ))
+    for attr in source.extracted_attributes:
+        session.add(ExtractedAttribute(
+            analysis_result_id=target.id,
+            attribute_name=attr.attribute_name,
+            attribute_value=attr.attribute_value,
+            confidence=attr.confidence,
+            metadata_=attr.metadata_,
+        ))
+
+
+def _copy_embedding(session: Session, source: AnalysisResult, image: ProductImage) -> None:
+    embeddings = ImageEmbedding.__table__
+    session.execute(
+        insert(embeddings)
+        .from_select(
+            ["product_image_id", "product_id", "organization_id", "model_version", "embedding"],
+            select(
+                literal(image.id, embeddings.c.product_image_id.type),
+                literal(image.product_id, embeddings.c.product_id.type),
+                embeddings.c.organization_id,
+                embeddings.c.model_version,
+                embeddings.c.embedding,
+            ).where(embeddings.c.product_image_id == source.product_image_id),
+        )
+        .on_conflict_do_nothing(index_elements=[embeddings.c.product_image_id])
+    )
+
+
+def copy_classification(
+    session: Session,
+    source: AnalysisResult,
+    target: AnalysisResult,
+    image: ProductImage,
+) -> None:
+    """Copy the classification, attributes and embedding of a near-duplicate."""
+    target.model_version = source.model_version
+    target.classification_label = source.classification_label
+    target.classification_confidence = source.classification_confidence
+    target.classification_scores = source.classification_scores
+    _copy_attributes(session, source, target)
+    _copy_embedding(session, source, image)
+
+
+def near_duplicate_versions(model_versions: dict, source: AnalysisResult) -> dict:
+    """
+    ``model_versions`` of an analysis that took its classification from ``source``.
+
+    The extra key keeps it out of :func:`find_reusable_analysis`, which
+    matches versions exactly: a borrowed classification is not copied on.
+    """
+    return {**model_versions, "near_duplicate_of": str(source.id)}
+
+
+def copy_analysis(
+    session: Session,
+    source: AnalysisResult,
+    target: AnalysisResult,
+    image: ProductImage,
+) -> None:
+    """Copy model output, attributes, defects and the embedding from ``source`` to ``target``."""
+    target.model_version = source.model_version
+    target.model_versions = source.model_versions
+    target.classification_label = source.classification_label
+    target.classification_confidence = source.classification_confidence
+    target.classification_scores = source.classification_scores
+    target.description_text = source.description_text
+    target.description_model = source.description_model
+    target.reused_from_id = source.id
+
+    _copy_attributes(session, source, target)
+    session.execute(delete(DetectedDefect).where(DetectedDefect.analysis_result_id == target.id))
+    for defect in source.detected_defects:
+        session.add(DetectedDefect(
+            organization_id=target.organization_id,
+            analysis_result_id=target.id,
+            defect_type=defect.defect_type,
+            severity=defect.severity,
+            confidence=defect.confidence,
+            bounding_box=defect.bounding_box,
+            description=defect.description,
+        ))
+
+    _copy_embedding(session, source, image)
@@ -0,0 +1,69 @@
+"""
+Latency histograms and helpers for the pre-aggregated analytics rollups.
+
+Percentiles cannot be averaged across buckets or categories, so each rollup
+row stores a fixed-boundary histogram of ``processing_time_ms`` instead.
+Histograms with the same boundaries merge by element-wise addition, and
+percentiles are read back by interpolating within the target bucket.
+"""
+from collections.abc import Iterable
+
+# Description model recorded when Bedrock was unavailable
+FALLBACK_DESCRIPTION_MODEL = "fallback-template"
+
+# Category used for products without one
+UNCATEGORIZED = "uncategorized"
+
+# Additive rollup columns; the latency histogram is merged separately
+ROLLUP_COUNTERS = (
+    "images_processed",
+    "images_failed",
+    "images_with_defects",
+    "defect_count",
+    "fallback_descriptions",
+    "processing_time_total_ms",
+)
+
+# Upper bounds (exclusive) of the latency buckets: 10ms to ~9min, ~25% apart.
+# Bucket 0 holds values below the first bound and the last bucket everything
+# at or above the final bound, matching Postgres ``width_bucket`` numbering.
+LATENCY_BUCKET_BOUNDS_MS: tuple[int, ...] = tuple(round(10 * 1.25**i) for i in range(50))
+HISTOGRAM_SIZE = len(LATENCY_BUCKET_BOUNDS_MS) + 1
+
+
+def empty_histogram() -> list[int]:
+    return [0] * HISTOGRAM_SIZE
+
+
+def merge_histograms(histograms: Iterable[list[int] | None]) -> list[int]:
+    merged = empty_histogram()
+    for histogram in histograms:
+        for index, count in enumerate(histogram or ()):
+            merged[index] += count
+    return merged
+
+
+def _bucket_range(index: int) -> tuple[float, float]:
+    lower = LATENCY_BUCKET_BOUNDS_MS[index - 1] if index > 0 else 0
+    if index < len(LATENCY_BUCKET_BOUNDS_MS):
+        upper = LATENCY_BUCKET_BOUNDS_MS[index]
+    else:
+        upper = LATENCY_BUCKET_BOUNDS_MS[-1] * 1.25
+    return lower, upper
+
+
+def histogram_percentile(histogram: list[int], quantile: float) -> float | None:
+    """Estimate a percentile (``quantile`` in 0..1) from a latency histogram."""
+    total = sum(histogram)
+    if not total:
+        return None
+
+    rank = quantile * total
+    cumulative = 0
+    for index, count in enumerate(histogram):
+        if count and cumulative + count >= rank:
+            lower, upper = _bucket_range(index)
+            fraction = (rank - cumulative) / count
+            return round(lower + (upper - lower) * fraction, 1)
+        cumulative += count
+    return float(_bucket_range(HISTOGRAM_SIZE - 1)[1])
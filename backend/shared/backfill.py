@@ -0,0 +1,46 @@
+"""
+Selection and partitioning for model-upgrade backfills.
+
+A backfill re-scores an organization's completed analyses with a new
+classifier or feature-extractor version. The work is split into lanes over
+disjoint ranges of analysis IDs; each lane runs one chunk at a time, so the
+number of lanes caps how many worker slots the backfill can hold.
+"""
+import uuid
+
+from sqlalchemy import func
+
+from shared.config import get_settings
+from shared.constants import AnalysisStatus
+from shared.models.analysis import AnalysisResult
+
+settings = get_settings()
+
+_UUID_SPACE = 1 << 128
+
+
+def backfill_conditions(org_id: uuid.UUID, model_type: str, model_version: str) -> list:
+    """Completed analyses in ``org_id`` not yet produced by ``model_version`` of ``model_type``."""
+    return [
+        AnalysisResult.organization_id == org_id,
+        AnalysisResult.status == AnalysisStatus.COMPLETED.value,
+        func.coalesce(AnalysisResult.model_versions[model_type].astext, "") != model_version,
+    ]
+
+
+def backfill_lane_count() -> int:
+    """Concurrent chunks a backfill may run: its share of the image-processing slots."""
+    return max(1, int(settings.image_processing_worker_slots * settings.backfill_worker_share))
+
+
+def lane_bounds(lanes: int) -> list[tuple[str | None, str | None]]:
+    """
+    Split the UUID space into ``lanes`` ``(lower, upper)`` ranges.
+
+    Analysis IDs are random UUIDs, so equal ranges hold roughly equal work.
+    ``None`` leaves a side open; the lower bound is exclusive, the upper one
+    inclusive.
+    """
+    inner = [str(uuid.UUID(int=_UUID_SPACE * i // lanes)) for i in range(1, lanes)]
+    edges = [None, *inner, None]
+    return list(zip(edges[:-1], edges[1:]))
@@ -37,6 +37,7 @@ class AnalysisStatus(str, enum.Enum):
 
 class JobStatus(str, enum.Enum):
     QUEUED = "queued"
+    DEFERRED = "deferred"  # Batch waiting for off-peak capacity or its deadline
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
@@ -46,6 +47,27 @@ class JobStatus(str, enum.Enum):
 class JobType(str, enum.Enum):
     SINGLE = "single"
     BATCH = "batch"
+    BACKFILL = "backfill"
+
+
+class ProcessingLane(str, enum.Enum):
+    """Broker queue per class of image-processing work."""
+
+    INTERACTIVE = "image_processing"
+    BATCH = "image_processing_batch"
+    BACKFILL = "image_processing_backfill"
+
+
+class AdmissionAction(str, enum.Enum):
+    ACCEPT = "accept"
+    DEFER = "defer"  # run in the batch lane instead
+    THROTTLE = "throttle"  # the organization's own backlog is too deep (429)
+    REJECT = "reject"  # the lane is overloaded (503)
+
+
+class BackfillModelType(str, enum.Enum):
+    CLASSIFIER = "classifier"
+    FEATURE_EXTRACTOR = "feature_extractor"
 
 
 class StepName(str, enum.Enum):
@@ -56,6 +78,11 @@ class StepName(str, enum.Enum):
     GENERATE_DESCRIPTION = "generate_description"
 
 
+class FailureKind(str, enum.Enum):
+    TRANSIENT = "transient"
+    PERMANENT = "permanent"
+
+
 class StepStatus(str, enum.Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -103,6 +130,21 @@ class OrgPlan(str, enum.Enum):
     ENTERPRISE = "enterprise"
 
 
+# Share of the batch lane each plan gets when several organizations have batches queued
+PLAN_SCHEDULING_WEIGHTS = {
+    OrgPlan.FREE.value: 1,
+    OrgPlan.PRO.value: 4,
+    OrgPlan.ENTERPRISE.value: 10,
+}
+
+# Image tasks an organization may run at once, across all lanes
+PLAN_CONCURRENCY_LIMITS = {
+    OrgPlan.FREE.value: 2,
+    OrgPlan.PRO.value: 8,
+    OrgPlan.ENTERPRISE.value: 32,
+}
+
+
 class WebhookEvent(str, enum.Enum):
     JOB_COMPLETED = "job.completed"
     JOB_FAILED = "job.failed"
@@ -117,6 +159,7 @@ class ExportType(str, enum.Enum):
     ANALYSIS_CSV = "analysis_csv"
     ANALYSIS_PDF = "analysis_pdf"
     PRODUCTS_CSV = "products_csv"
+    ANALYSIS_PARQUET = "analysis_parquet"
 
 
 class ExportStatus(str, enum.Enum):
@@ -124,3 +167,14 @@ class ExportStatus(str, enum.Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+
+
+class RollupGranularity(str, enum.Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class CountMode(str, enum.Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
@@ -38,18 +38,38 @@ class StorageError(ImagineAIError):
         super().__init__(message=message, status_code=502)
 
 
+class ImageDecodeError(ImagineAIError):
+    def __init__(self, message: str = "Image could not be decoded"):
+        super().__init__(message=message, status_code=422)
+
+
+class JobCancelledError(ImagineAIError):
+    def __init__(self, job_id: str = ""):
+        self.job_id = job_id
+        super().__init__(message=f"Processing job '{job_id}' was cancelled", status_code=409)
+
+
 class ModelInferenceError(ImagineAIError):
     def __init__(self, message: str = "ML model inference failed"):
         super().__init__(message=message, status_code=502)
 
 
 class ExternalServiceError(ImagineAIError):
-    def __init__(self, service: str = "external service", message: str = ""):
+    def __init__(
+        self, service: str = "external service", message: str = "", error_code: str | None = None
+    ):
+        self.error_code = error_code
         detail = f"{service} error" if not message else f"{service}: {message}"
         super().__init__(message=detail, status_code=502)
 
 
 class RateLimitExceededError(ImagineAIError):
-    def __init__(self, retry_after: int = 60):
+    def __init__(self, retry_after: int = 60, message: str = "Rate limit exceeded"):
+        self.retry_after = retry_after
+        super().__init__(message=message, status_code=429)
+
+
+class ServiceOverloadedError(ImagineAIError):
+    def __init__(self, retry_after: int = 60, message: str = "Processing capacity exhausted"):
         self.retry_after = retry_after
-        super().__init__(message="Rate limit exceeded", status_code=429)
+        super().__init__(message=message, status_code=503)
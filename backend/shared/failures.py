@@ -0,0 +1,105 @@
+"""
+Failure taxonomy for pipeline tasks.
+
+Transient failures (network, throttling, a busy database) are worth retrying
+with backoff. Permanent ones (an undecodable image, a missing object, invalid
+input, a bug) fail the same way on every attempt, so they skip the retries and
+go straight to the dead-letter table for inspection and re-drive.
+
+A missing job or analysis row is transient: the API publishes the task before
+its request transaction commits, so a fast worker can look for rows it cannot
+see yet.
+"""
+import traceback
+from dataclasses import dataclass
+
+from botocore.exceptions import ClientError
+from celery.exceptions import SoftTimeLimitExceeded
+from sqlalchemy.exc import NoResultFound, OperationalError
+
+from shared.constants import FailureKind
+from shared.exceptions import (
+    AuthorizationError,
+    ExternalServiceError,
+    ImageDecodeError,
+    NotFoundError,
+    ValidationError,
+)
+
+# AWS error codes that a later attempt can succeed on
+TRANSIENT_AWS_CODES = frozenset({
+    "ThrottlingException",
+    "Throttling",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ServiceUnavailable",
+    "ModelNotReadyException",
+    "ModelTimeoutException",
+    "InternalServerException",
+    "InternalError",
+    "SlowDown",
+    "RequestTimeout",
+})
+
+# Truncation for the traceback kept with a dead letter
+MAX_TRACEBACK_CHARS = 8000
+
+
+@dataclass(frozen=True)
+class FailureClass:
+    kind: FailureKind
+    category: str
+
+    @property
+    def is_permanent(self) -> bool:
+        return self.kind == FailureKind.PERMANENT
+
+
+def _permanent(category: str) -> FailureClass:
+    return FailureClass(FailureKind.PERMANENT, category)
+
+
+def _transient(category: str) -> FailureClass:
+    return FailureClass(FailureKind.TRANSIENT, category)
+
+
+def classify_failure(exc: BaseException) -> FailureClass:
+    """Decide whether ``exc`` is worth retrying, with a short category for diagnostics."""
+    if isinstance(exc, ImageDecodeError):
+        return _permanent("decode")
+    if isinstance(exc, NoResultFound):
+        return _transient("uncommitted")
+    if isinstance(exc, NotFoundError):
+        return _permanent("not_found")
+    if isinstance(exc, (ValidationError, AuthorizationError)):
+        return _permanent("validation")
+
+    if isinstance(exc, ExternalServiceError):
+        if exc.error_code is None or exc.error_code in TRANSIENT_AWS_CODES:
+            return _transient("external_service")
+        return _permanent("external_service")
+    if isinstance(exc, ClientError):
+        code = exc.response.get("Error", {}).get("Code", "")
+        if code in TRANSIENT_AWS_CODES:
+            return _transient("throttling")
+        if code in ("NoSuchKey", "NoSuchBucket", "404"):
+            return _permanent("not_found")
+        if code in ("AccessDenied", "AccessDeniedException", "ValidationException"):
+            return _permanent("validation")
+        return _transient("storage")
+
+    if isinstance(exc, (SoftTimeLimitExceeded, TimeoutError)):
+        return _transient("timeout")
+    if isinstance(exc, (OperationalError, ConnectionError, OSError)):
+        return _transient("network")
+
+    # Programming errors reproduce on every attempt
+    if isinstance(exc, (TypeError, ValueError, KeyError, AttributeError, IndexError)):
+        return _permanent("bug")
+
+    return _transient("unknown")
+
+
+def format_traceback(exc: BaseException) -> str:
+    text = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+    return text[-MAX_TRACEBACK_CHARS:]
@@ -0,0 +1,77 @@
+"""
+Reading and writing persisted image embeddings.
+
+Vectors are stored as pgvector ``halfvec`` (float16, 3.5 KiB per image) and
+tagged with the feature-extractor version that produced them, so a model
+upgrade never mixes incompatible vectors.
+"""
+import uuid
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from shared.models.embedding import IMAGE_EMBEDDING_DIM, ImageEmbedding
+
+
+def upsert_image_embedding(
+    image_id: uuid.UUID,
+    product_id: uuid.UUID,
+    org_id: uuid.UUID,
+    model_version: str,
+    embedding: np.ndarray,
+):
+    """Statement that stores (or replaces) the embedding of one image."""
+    vector = np.asarray(embedding, dtype=np.float16).reshape(-1)
+    if vector.shape[0] != IMAGE_EMBEDDING_DIM:
+        raise ValueError(
+            f"Expected a {IMAGE_EMBEDDING_DIM}-d embedding, got {vector.shape[0]}"
+        )
+
+    table = ImageEmbedding.__table__
+    stmt = insert(table).values(
+        product_image_id=image_id,
+        product_id=product_id,
+        organization_id=org_id,
+        model_version=model_version,
+        embedding=vector,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.product_image_id],
+        set_={
+            "model_version": stmt.excluded.model_version,
+            "embedding": stmt.excluded.embedding,
+            "updated_at": func.now(),
+        },
+    )
+
+
+def load_image_embedding(
+    session: Session, image_id: uuid.UUID, model_version: str
+) -> np.ndarray | None:
+    """Return the stored float32 features for ``image_id`` if they match ``model_version``."""
+    embedding = session.execute(
+        select(ImageEmbedding.embedding).where(
+            ImageEmbedding.product_image_id == image_id,
+            ImageEmbedding.model_version == model_version,
+        )
+    ).scalar_one_or_none()
+    if embedding is None:
+        return None
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def load_image_embeddings(
+    session: Session, image_ids: list[uuid.UUID], model_version: str
+) -> dict[uuid.UUID, np.ndarray]:
+    """Stored float32 features, keyed by image, for those of ``image_ids`` at ``model_version``."""
+    if not image_ids:
+        return {}
+    rows = session.execute(
+        select(ImageEmbedding.product_image_id, ImageEmbedding.embedding).where(
+            ImageEmbedding.product_image_id.in_(image_ids),
+            ImageEmbedding.model_version == model_version,
+        )
+    )
+    return {image_id: np.asarray(embedding, dtype=np.float32) for image_id, embedding in rows}
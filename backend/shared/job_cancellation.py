@@ -0,0 +1,21 @@
+"""
+Cancellation tokens for processing jobs.
+
+Cancelling a job sets a short Redis key that every task of the job checks
+before it starts and between pipeline stages, so in-flight work stops at the
+next stage boundary. Fanned-out image tasks get predictable IDs so the
+queued ones can be revoked in bulk without storing every ID.
+"""
+
+
+def job_cancel_key(job_id: str) -> str:
+    return f"job_cancelled:{job_id}"
+
+
+def image_task_id(job_id: str, image_id: str) -> str:
+    """Celery task ID of the ``process_image`` task for one image of a batch job."""
+    return f"process_image:{job_id}:{image_id}"
+
+
+def chunked(items: list[str], size: int) -> list[list[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,27 @@
+"""Naming and helpers for the per-job event log kept in Redis Streams."""
+
+# Job-level event types after which no further events are published for a job.
+# Images of multi-image jobs report image_complete / image_failed instead.
+TERMINAL_EVENT_TYPES = frozenset({"job_complete", "job_failed"})
+
+# Stream ID meaning "replay from the very first retained event"
+STREAM_START_ID = "0-0"
+
+
+def job_events_key(job_id: str) -> str:
+    return f"job_events:{job_id}"
+
+
+def normalize_last_event_id(last_event_id: str | None) -> str:
+    """
+    Validate a client-supplied resume offset.
+
+    Anything that is not a Redis stream ID (``<ms>-<seq>`` or ``<ms>``) falls
+    back to a full replay so a bad header never silently skips events.
+    """
+    if not last_event_id:
+        return STREAM_START_ID
+    parts = last_event_id.strip().split("-")
+    if len(parts) > 2 or not all(p.isdigit() for p in parts):
+        return STREAM_START_ID
+    return last_event_id.strip()
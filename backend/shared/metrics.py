@@ -0,0 +1,101 @@
+"""
+Prometheus metrics for the API and the ML pipeline.
+
+The API and the workers both run several processes per pod: uvicorn
+workers and the Celery prefork pool. With ``PROMETHEUS_MULTIPROC_DIR`` set,
+each process writes its samples to files in that directory, and a scrape of
+any one process reports the whole pod. Without it, metrics live in the
+process that records them, which is enough for local development.
+"""
+import glob
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+# ---- API ----
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ["method", "endpoint", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "endpoint"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_CONNECTIONS_ACTIVE = Gauge(
+    "http_connections_active", "HTTP requests in progress", multiprocess_mode="livesum"
+)
+
+# ---- ML pipeline ----
+ML_INFERENCE_DURATION = Histogram(
+    "ml_inference_duration_seconds",
+    "Model inference time",
+    ["model"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+ML_INFERENCE_TOTAL = Counter("ml_inference_total", "Model inference calls", ["model"])
+ML_CLASSIFICATION_CONFIDENCE = Histogram(
+    "ml_classification_confidence",
+    "Confidence of the top classification label",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0),
+)
+BEDROCK_API_CALLS = Counter(
+    "bedrock_api_calls_total", "Bedrock invocations by outcome or error code", ["status"]
+)
+PIPELINE_STAGE_DURATION = Histogram(
+    "image_processing_pipeline_duration_seconds",
+    "Time spent in each completed process_image stage",
+    ["stage"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+
+def metrics_registry() -> CollectorRegistry:
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition body and content type for a ``/metrics`` response."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def serve_metrics(port: int) -> None:
+    """Serve ``/metrics`` from a background thread of this process."""
+    start_http_server(port, registry=metrics_registry())
+
+
+def clear_multiproc_dir() -> None:
+    """
+    Delete the sample files of an earlier run of this pod.
+
+    The directory is on a volume that outlives container restarts, and the
+    collector sums every file in it. Call once, in the parent process,
+    before the child processes are forked.
+    """
+    if MULTIPROC_DIR:
+        for path in glob.glob(os.path.join(MULTIPROC_DIR, "*.db")):
+            os.remove(path)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of an exited process from the pod's totals."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
@@ -1,11 +1,13 @@
 from shared.models.ab_testing import ABExperiment, ABVariant, UserCohortAssignment
 from shared.models.analysis import AnalysisResult, DetectedDefect, ExtractedAttribute
 from shared.models.base import Base
+from shared.models.embedding import ImageEmbedding
 from shared.models.export import ExportJob
 from shared.models.organization import Organization, OrganizationMember
-from shared.models.pipeline import JobStep, ProcessingJob
+from shared.models.pipeline import DeadLetter, JobStep, ProcessingJob
 from shared.models.product import Product, ProductImage
 from shared.models.rate_limit import RateLimitConfig
+from shared.models.stats import AnalyticsRollup, OrganizationStats
 from shared.models.user import User
 from shared.models.webhook import WebhookDelivery, WebhookEndpoint
 
@@ -21,6 +23,7 @@ __all__ = [
     "DetectedDefect",
     "ProcessingJob",
     "JobStep",
+    "DeadLetter",
     "ABExperiment",
     "ABVariant",
     "UserCohortAssignment",
@@ -28,4 +31,7 @@ __all__ = [
     "WebhookDelivery",
     "ExportJob",
     "RateLimitConfig",
+    "OrganizationStats",
+    "AnalyticsRollup",
+    "ImageEmbedding",
 ]
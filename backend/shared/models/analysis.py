@@ -1,6 +1,7 @@
 import uuid
+from datetime import datetime
 
-from sqlalchemy import Float, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -9,7 +10,22 @@ from shared.models.base import Base, TimestampMixin, UUIDMixin
 
 class AnalysisResult(UUIDMixin, TimestampMixin, Base):
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        Index("idx_analysis_results_org_created", "organization_id", "created_at"),
+        Index("idx_analysis_results_org_status", "organization_id", "status"),
+        Index("idx_analysis_results_org_updated", "organization_id", "updated_at", "id"),
+        # Keyset scans over an organization's analyses by ID (model backfills)
+        Index("idx_analysis_results_org_id", "organization_id", "id"),
+        # Hourly analytics rollups scan by finish time
+        Index("idx_analysis_results_completed", "completed_at"),
+    )
 
+    # Denormalized from the image's product so org-scoped reads skip the joins
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
     product_image_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("product_images.id", ondelete="CASCADE"),
@@ -18,6 +34,8 @@ class AnalysisResult(UUIDMixin, TimestampMixin, Base):
         index=True,
     )
     model_version: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Every model that contributed, e.g. {"classifier": "v1", "feature_extractor": "v1", ...}
+    model_versions: Mapped[dict] = mapped_column(JSONB, default=dict, server_default="{}")
     classification_label: Mapped[str | None] = mapped_column(String(100))
     classification_confidence: Mapped[float | None] = mapped_column(Float)
     classification_scores: Mapped[dict] = mapped_column(JSONB, default=dict)
@@ -26,6 +44,16 @@ class AnalysisResult(UUIDMixin, TimestampMixin, Base):
     processing_time_ms: Mapped[int | None] = mapped_column(Integer)
     status: Mapped[str] = mapped_column(String(20), default="pending", index=True)
     error_message: Mapped[str | None] = mapped_column(Text)
+    # When the pipeline last finished the analysis (completed or failed). Unlike
+    # updated_at it does not move when the row is edited afterwards.
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Set when results were copied from an analysis of a byte-identical image, or
+    # when the classification was taken from a near-duplicate
+    reused_from_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("analysis_results.id", ondelete="SET NULL"),
+        nullable=True,
+    )
 
     # A/B experiment tracking
     experiment_id: Mapped[uuid.UUID | None] = mapped_column(
@@ -75,7 +103,15 @@ class ExtractedAttribute(UUIDMixin, Base):
 
 class DetectedDefect(UUIDMixin, Base):
     __tablename__ = "detected_defects"
+    __table_args__ = (
+        Index("idx_detected_defects_org_type", "organization_id", "defect_type"),
+    )
 
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
     analysis_result_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("analysis_results.id", ondelete="CASCADE"),
@@ -0,0 +1,52 @@
+import uuid
+
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from shared.models.base import Base, TimestampMixin
+
+# Width of the EfficientNet-B4 pooled feature vector
+IMAGE_EMBEDDING_DIM = 1792
+
+
+class ImageEmbedding(TimestampMixin, Base):
+    """Backbone feature vector of a product image, stored as float16."""
+
+    __tablename__ = "image_embeddings"
+    __table_args__ = (
+        Index("idx_image_embeddings_org_product", "organization_id", "product_id"),
+        Index(
+            "idx_image_embeddings_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
+        ),
+    )
+
+    product_image_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("product_images.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Denormalized so similarity queries stay within one table
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    model_version: Mapped[str] = mapped_column(String(50), nullable=False)
+    embedding: Mapped[list[float]] = mapped_column(HALFVEC(IMAGE_EMBEDDING_DIM), nullable=False)
+
+    # Relationships
+    product_image = relationship("ProductImage")
+
+    def __repr__(self) -> str:
+        return f"<ImageEmbedding {self.product_image_id} ({self.model_version})>"
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,7 +10,17 @@ from shared.models.base import Base, TimestampMixin, UUIDMixin
 
 class ProcessingJob(UUIDMixin, TimestampMixin, Base):
     __tablename__ = "processing_jobs"
+    __table_args__ = (
+        Index("idx_processing_jobs_org_created", "organization_id", "created_at"),
+        Index("idx_processing_jobs_org_status", "organization_id", "status"),
+        Index("idx_processing_jobs_status_deadline", "status", "deadline"),
+    )
 
+    # Nullable: jobs created before organizations existed may have no owner org
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+    )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
@@ -26,6 +36,8 @@ class ProcessingJob(UUIDMixin, TimestampMixin, Base):
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     error_message: Mapped[str | None] = mapped_column(Text)
+    # Deferred batches: when the results are needed; the scheduler releases the job in time
+    deadline: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     metadata_: Mapped[dict] = mapped_column("metadata", JSONB, default=dict)
 
     # Relationships
@@ -38,7 +50,16 @@ class ProcessingJob(UUIDMixin, TimestampMixin, Base):
 
 class JobStep(UUIDMixin, Base):
     __tablename__ = "job_steps"
+    __table_args__ = (
+        Index("idx_job_steps_job_status", "job_id", "status"),
+        Index("idx_job_steps_job_image", "job_id", "product_image_id"),
+        Index("idx_job_steps_org_status", "organization_id", "status"),
+    )
 
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+    )
     job_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("processing_jobs.id", ondelete="CASCADE"),
@@ -62,3 +83,45 @@ class JobStep(UUIDMixin, Base):
 
     def __repr__(self) -> str:
         return f"<JobStep {self.step_name} ({self.status})>"
+
+
+class DeadLetter(UUIDMixin, TimestampMixin, Base):
+    """A pipeline task that failed permanently or ran out of retries."""
+
+    __tablename__ = "dead_letters"
+    __table_args__ = (
+        Index("idx_dead_letters_org_created", "organization_id", "created_at"),
+        Index("idx_dead_letters_org_pending", "organization_id", "redriven_at"),
+    )
+
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+    )
+    job_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("processing_jobs.id", ondelete="SET NULL"),
+        index=True,
+    )
+    product_image_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("product_images.id", ondelete="CASCADE"),
+    )
+    task_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Task keyword arguments needed to replay it, e.g. {"force_recompute": false}
+    task_kwargs: Mapped[dict] = mapped_column(JSONB, default=dict)
+    failure_kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    error_category: Mapped[str] = mapped_column(String(50), nullable=False)
+    error_type: Mapped[str] = mapped_column(String(255), nullable=False)
+    error_message: Mapped[str | None] = mapped_column(Text)
+    traceback: Mapped[str | None] = mapped_column(Text)
+    failed_step: Mapped[str | None] = mapped_column(String(100))
+    attempts: Mapped[int] = mapped_column(Integer, default=1)
+    redriven_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    redrive_job_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("processing_jobs.id", ondelete="SET NULL"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<DeadLetter {self.task_name} ({self.error_category})>"
@@ -1,7 +1,17 @@
 import uuid
 
-from sqlalchemy import BigInteger, Boolean, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Computed,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from shared.models.base import Base, TimestampMixin, UUIDMixin
@@ -9,6 +19,23 @@ from shared.models.base import Base, TimestampMixin, UUIDMixin
 
 class Product(UUIDMixin, TimestampMixin, Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("idx_products_org_updated", "organization_id", "updated_at", "id"),
+        Index("idx_products_org_created", "organization_id", "created_at", "id"),
+        Index("idx_products_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "idx_products_facets",
+            "facets",
+            postgresql_using="gin",
+            postgresql_ops={"facets": "jsonb_path_ops"},
+        ),
+        Index(
+            "idx_products_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
@@ -26,6 +53,19 @@ class Product(UUIDMixin, TimestampMixin, Base):
     ai_description: Mapped[str | None] = mapped_column(Text)
     status: Mapped[str] = mapped_column(String(20), default="draft", index=True)
     metadata_: Mapped[dict] = mapped_column("metadata", JSONB, default=dict)
+    # Attribute/defect values from analysis, kept in sync by the pipeline
+    facets: Mapped[dict] = mapped_column(JSONB, default=dict, server_default="{}")
+    # Maintained by Postgres; weights rank title matches above AI and user descriptions
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR().with_variant(Text, "sqlite"),
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(ai_description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     # Relationships
     user = relationship("User", back_populates="products")
@@ -38,6 +78,9 @@ class Product(UUIDMixin, TimestampMixin, Base):
 
 class ProductImage(UUIDMixin, Base):
     __tablename__ = "product_images"
+    __table_args__ = (
+        Index("idx_product_images_phash_bands", "phash_bands", postgresql_using="gin"),
+    )
 
     product_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -50,6 +93,11 @@ class ProductImage(UUIDMixin, Base):
     original_filename: Mapped[str | None] = mapped_column(String(500))
     content_type: Mapped[str | None] = mapped_column(String(100))
     file_size_bytes: Mapped[int | None] = mapped_column(BigInteger)
+    # Hex SHA-256 of the uploaded bytes, used to reuse analyses of identical images
+    content_sha256: Mapped[str | None] = mapped_column(String(64), index=True)
+    # 64-bit pHash stored signed, and its band keys for near-duplicate lookups
+    perceptual_hash: Mapped[int | None] = mapped_column(BigInteger)
+    phash_bands: Mapped[list[int] | None] = mapped_column(ARRAY(Integer).with_variant(JSON, "sqlite"))
     width: Mapped[int | None] = mapped_column(Integer)
     height: Mapped[int | None] = mapped_column(Integer)
     is_primary: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -0,0 +1,103 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.models.base import Base, UUIDMixin
+
+
+class OrganizationStats(Base):
+    """Precomputed dashboard counters, one row per organization."""
+
+    __tablename__ = "organization_stats"
+
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total_products: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    total_images: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    completed_analyses: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    total_defects: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    processing_time_total_ms: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0"
+    )
+    processing_time_count: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    reused_analyses: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    reconciled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    @property
+    def avg_processing_time_ms(self) -> int | None:
+        if not self.processing_time_count:
+            return None
+        return round(self.processing_time_total_ms / self.processing_time_count)
+
+    @property
+    def analysis_reuse_rate(self) -> float | None:
+        if not self.completed_analyses:
+            return None
+        return round(self.reused_analyses / self.completed_analyses, 4)
+
+    def __repr__(self) -> str:
+        return f"<OrganizationStats {self.organization_id}>"
+
+
+class AnalyticsRollup(UUIDMixin, Base):
+    """Pipeline throughput and latency for one organization, time bucket and category."""
+
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id", "granularity", "bucket_start", "category",
+            name="uq_analytics_rollup_bucket",
+        ),
+        Index("idx_analytics_rollups_granularity_bucket", "granularity", "bucket_start"),
+    )
+
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    granularity: Mapped[str] = mapped_column(String(10), nullable=False)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    category: Mapped[str] = mapped_column(String(100), nullable=False)
+    images_processed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    images_failed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    images_with_defects: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    defect_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    fallback_descriptions: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    processing_time_total_ms: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0"
+    )
+    latency_histogram: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer).with_variant(JSON, "sqlite"), default=list
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<AnalyticsRollup {self.granularity} {self.bucket_start} {self.category}>"
@@ -0,0 +1,104 @@
+"""
+Multi-index hashing over 64-bit perceptual hashes.
+
+A hash is split into ``PHASH_BANDS`` 16-bit bands. If two hashes are within
+Hamming distance ``d`` then, by pigeonhole, at least one band differs in at
+most ``d // PHASH_BANDS`` bits. Each image stores its exact band keys in an
+indexed array; a lookup probes every band value within that radius and only
+verifies the full distance for the candidates that share a key, so the cost
+depends on the number of near matches rather than on catalog size.
+"""
+from collections import defaultdict
+from collections.abc import Hashable, Iterable
+from itertools import combinations
+
+PHASH_BITS = 64
+PHASH_BANDS = 4
+BAND_BITS = PHASH_BITS // PHASH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+HASH_MASK = (1 << PHASH_BITS) - 1
+
+# Probing more than two bits per band expands each lookup to thousands of keys
+MAX_BAND_RADIUS = 2
+MAX_NEAR_DUPLICATE_DISTANCE = PHASH_BANDS * (MAX_BAND_RADIUS + 1) - 1
+
+
+def to_signed64(value: int) -> int:
+    """Store an unsigned 64-bit hash in a signed BIGINT column."""
+    value &= HASH_MASK
+    return value - (1 << PHASH_BITS) if value >> (PHASH_BITS - 1) else value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return ((a ^ b) & HASH_MASK).bit_count()
+
+
+def _band_values(phash: int) -> list[int]:
+    phash &= HASH_MASK
+    return [(phash >> (band * BAND_BITS)) & BAND_MASK for band in range(PHASH_BANDS)]
+
+
+def _band_key(band: int, value: int) -> int:
+    return (band << BAND_BITS) | value
+
+
+def band_keys(phash: int) -> list[int]:
+    """The keys an image is indexed under, one per band."""
+    return [_band_key(band, value) for band, value in enumerate(_band_values(phash))]
+
+
+def probe_keys(phash: int, max_distance: int) -> list[int]:
+    """Every band key an image within ``max_distance`` of ``phash`` must share at least one of."""
+    if not 0 <= max_distance <= MAX_NEAR_DUPLICATE_DISTANCE:
+        raise ValueError(f"max_distance must be between 0 and {MAX_NEAR_DUPLICATE_DISTANCE}")
+
+    radius = max_distance // PHASH_BANDS
+    keys = []
+    for band, value in enumerate(_band_values(phash)):
+        for flipped in range(radius + 1):
+            for bits in combinations(range(BAND_BITS), flipped):
+                mask = 0
+                for bit in bits:
+                    mask |= 1 << bit
+                keys.append(_band_key(band, value ^ mask))
+    return keys
+
+
+def group_near_duplicates(
+    items: Iterable[tuple[Hashable, int]], max_distance: int
+) -> list[list[Hashable]]:
+    """
+    Cluster ``(item_id, phash)`` pairs whose hashes are within ``max_distance``.
+
+    Clusters are connected components, so an item may be further than
+    ``max_distance`` from some members of its cluster. Only clusters with at
+    least two items are returned.
+    """
+    members: dict[int, list[Hashable]] = defaultdict(list)
+    for item_id, phash in items:
+        members[phash & HASH_MASK].append(item_id)
+
+    hashes = list(members)
+    index: dict[int, list[int]] = defaultdict(list)
+    for position, phash in enumerate(hashes):
+        for key in band_keys(phash):
+            index[key].append(position)
+
+    parent = list(range(len(hashes)))
+
+    def find(position: int) -> int:
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    for position, phash in enumerate(hashes):
+        for key in probe_keys(phash, max_distance):
+            for other in index.get(key, ()):
+                if other > position and hamming_distance(phash, hashes[other]) <= max_distance:
+                    parent[find(other)] = find(position)
+
+    clusters: dict[int, list[Hashable]] = defaultdict(list)
+    for position, phash in enumerate(hashes):
+        clusters[find(position)].extend(members[phash])
+    return [cluster for cluster in clusters.values() if len(cluster) > 1]
@@ -0,0 +1,40 @@
+"""
+Per-organization limits on concurrently running pipeline tasks.
+
+Each organization has a Redis sorted set of leases: one member per running
+``process_image`` task, scored by the time its lease expires. A task takes a
+lease before doing any work and gives it back when it finishes. If a worker
+dies, its lease simply expires, so a crashed task can never hold a slot for
+longer than the task time limit.
+"""
+from shared.constants import PLAN_CONCURRENCY_LIMITS
+
+ACQUIRE_LUA_SCRIPT = """
+local now, limit = tonumber(ARGV[1]), tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZSCORE', KEYS[1], ARGV[3]) or redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[4]), ARGV[3])
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+    redis.call('ZREM', KEYS[2], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+def org_slots_key(org_id: str) -> str:
+    return f"org_slots:{org_id}"
+
+
+def org_deferred_key(org_id: str) -> str:
+    """Interactive tasks deferred because the organization was at its limit."""
+    return f"org_deferred:{org_id}"
+
+
+def batch_lane_queue_key(org_id: str) -> str:
+    """Redis list of the organization's batch images waiting for the batch lane."""
+    return f"batch_lane:org:{org_id}"
+
+
+def concurrency_limit(plan: str | None) -> int:
+    return PLAN_CONCURRENCY_LIMITS.get(plan or "", PLAN_CONCURRENCY_LIMITS["free"])
@@ -0,0 +1,174 @@
+"""
+Statements for maintaining the per-organization dashboard counters.
+
+Writers apply deltas with :func:`increment_org_stats` in the same transaction
+as the change they describe; :func:`stats_queries` recomputes the counters
+from source tables for reconciliation. Both return plain statements so they
+can be executed from the async API session and the sync worker session alike.
+"""
+import uuid
+from collections.abc import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from shared.constants import AnalysisStatus
+from shared.models.analysis import AnalysisResult, DetectedDefect
+from shared.models.product import Product, ProductImage
+from shared.models.stats import OrganizationStats
+
+STAT_COLUMNS = (
+    "total_products",
+    "total_images",
+    "completed_analyses",
+    "total_defects",
+    "processing_time_total_ms",
+    "processing_time_count",
+    "reused_analyses",
+)
+
+
+def increment_org_stats(org_id: uuid.UUID, **deltas: int):
+    """Upsert that adds ``deltas`` to an organization's counters."""
+    deltas = {name: value for name, value in deltas.items() if value}
+    unknown = set(deltas) - set(STAT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown stat columns: {sorted(unknown)}")
+
+    table = OrganizationStats.__table__
+    stmt = insert(table).values(organization_id=org_id, **deltas)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.organization_id],
+        set_={
+            **{name: table.c[name] + stmt.excluded[name] for name in deltas},
+            "updated_at": func.now(),
+        },
+    )
+
+
+def set_org_stats(org_id: uuid.UUID, values: dict[str, int]):
+    """Upsert that overwrites an organization's counters with recomputed values."""
+    table = OrganizationStats.__table__
+    stmt = insert(table).values(
+        organization_id=org_id, reconciled_at=func.now(), **values
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.organization_id],
+        set_={
+            **{name: stmt.excluded[name] for name in values},
+            "reconciled_at": stmt.excluded.reconciled_at,
+            "updated_at": func.now(),
+        },
+    )
+
+
+def stats_queries(
+    org_id: uuid.UUID | None = None, product_id: uuid.UUID | None = None
+) -> list:
+    """
+    Aggregate queries yielding ``(organization_id, <stat columns>...)`` rows.
+
+    Scoped to one organization and/or a single product (when its contribution
+    has to be subtracted); unscoped, they cover every organization. Analysis
+    and defect counts group on their own ``organization_id`` and only join
+    up to the image when narrowed to a product.
+    """
+    products = select(
+        Product.organization_id,
+        func.count(Product.id).label("total_products"),
+    ).group_by(Product.organization_id)
+
+    images = (
+        select(
+            Product.organization_id,
+            func.count(ProductImage.id).label("total_images"),
+        )
+        .join(Product, ProductImage.product_id == Product.id)
+        .group_by(Product.organization_id)
+    )
+
+    analyses = (
+        select(
+            AnalysisResult.organization_id,
+            func.count(AnalysisResult.id).label("completed_analyses"),
+            func.coalesce(func.sum(AnalysisResult.processing_time_ms), 0).label(
+                "processing_time_total_ms"
+            ),
+            func.count(AnalysisResult.processing_time_ms).label("processing_time_count"),
+            func.count(AnalysisResult.reused_from_id).label("reused_analyses"),
+        )
+        .where(AnalysisResult.status == AnalysisStatus.COMPLETED.value)
+        .group_by(AnalysisResult.organization_id)
+    )
+
+    defects = select(
+        DetectedDefect.organization_id,
+        func.count(DetectedDefect.id).label("total_defects"),
+    ).group_by(DetectedDefect.organization_id)
+
+    if org_id:
+        products = products.where(Product.organization_id == org_id)
+        images = images.where(Product.organization_id == org_id)
+        analyses = analyses.where(AnalysisResult.organization_id == org_id)
+        defects = defects.where(DetectedDefect.organization_id == org_id)
+    if product_id:
+        products = products.where(Product.id == product_id)
+        images = images.where(Product.id == product_id)
+        analyses = analyses.join(
+            ProductImage, AnalysisResult.product_image_id == ProductImage.id
+        ).where(ProductImage.product_id == product_id)
+        defects = (
+            defects.join(AnalysisResult, DetectedDefect.analysis_result_id == AnalysisResult.id)
+            .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
+            .where(ProductImage.product_id == product_id)
+        )
+
+    return [products, images, analyses, defects]
+
+
+def merge_stats_rows(
+    rows: Iterable, org_ids: Iterable[uuid.UUID] = ()
+) -> dict[uuid.UUID, dict[str, int]]:
+    """
+    Fold rows from :func:`stats_queries` into ``{org_id: {column: value}}``.
+
+    Organizations listed in ``org_ids`` start at zero so that counters of an
+    organization with no remaining rows are reset rather than left stale.
+    """
+    merged = {org_id: dict.fromkeys(STAT_COLUMNS, 0) for org_id in org_ids}
+    for row in rows:
+        values = row._mapping
+        stats = merged.setdefault(values["organization_id"], dict.fromkeys(STAT_COLUMNS, 0))
+        for name in STAT_COLUMNS:
+            if name in values:
+                stats[name] = int(values[name] or 0)
+    return merged
+
+
+def defect_counts(analysis_ids: Iterable[uuid.UUID]):
+    """``(analysis_result_id, count)`` rows for the analyses that have defects."""
+    return (
+        select(DetectedDefect.analysis_result_id, func.count(DetectedDefect.id))
+        .where(DetectedDefect.analysis_result_id.in_(list(analysis_ids)))
+        .group_by(DetectedDefect.analysis_result_id)
+    )
+
+
+def completed_analysis_deltas(
+    analysis: AnalysisResult, sign: int = 1, defects: int = 0
+) -> dict[str, int]:
+    """
+    Counter deltas for an analysis entering (``sign=1``) or leaving the completed state.
+
+    ``defects`` is the number of defects the analysis has: a re-run replaces
+    them, so they stop counting along with the analysis.
+    """
+    deltas = {"completed_analyses": sign}
+    if defects:
+        deltas["total_defects"] = sign * defects
+    if analysis.processing_time_ms is not None:
+        deltas["processing_time_total_ms"] = sign * analysis.processing_time_ms
+        deltas["processing_time_count"] = sign
+    if analysis.reused_from_id is not None:
+        deltas["reused_analyses"] = sign
+    return deltas
@@ -0,0 +1,90 @@
+"""
+Denormalized attribute/defect facets stored on ``products.facets``.
+
+The column holds ``{"color": ["red"], "material": ["leather"], "defect":
+["scratch"]}`` built from the extracted attributes and detected defects of
+every image of a product. Values are lower-cased so filters match regardless
+of how the model spelled them. :func:`refresh_product_facets` returns a plain
+statement so the pipeline (sync session) and the API (async session) can both
+run it.
+"""
+import uuid
+
+from sqlalchemy import func, literal, or_, select, union, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from shared.models.analysis import AnalysisResult, DetectedDefect, ExtractedAttribute
+from shared.models.product import Product, ProductImage
+
+DEFECT_FACET = "defect"
+
+# Most common values returned per facet in listing responses
+FACET_VALUE_LIMIT = 20
+
+
+def normalize_facet_value(value: str) -> str:
+    return value.strip().lower()
+
+
+def product_facets_query(product_id):
+    """Scalar subquery building the facets document for ``product_id``."""
+    attributes = (
+        select(
+            func.lower(ExtractedAttribute.attribute_name).label("name"),
+            func.lower(func.trim(ExtractedAttribute.attribute_value)).label("value"),
+        )
+        .join(AnalysisResult, ExtractedAttribute.analysis_result_id == AnalysisResult.id)
+        .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
+        .where(ProductImage.product_id == product_id)
+    )
+    defects = (
+        select(
+            literal(DEFECT_FACET).label("name"),
+            func.lower(DetectedDefect.defect_type).label("value"),
+        )
+        .join(AnalysisResult, DetectedDefect.analysis_result_id == AnalysisResult.id)
+        .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
+        .where(ProductImage.product_id == product_id)
+    )
+    pairs = union(attributes, defects).subquery("pairs")
+
+    grouped = (
+        select(
+            pairs.c.name,
+            func.jsonb_agg(aggregate_order_by(pairs.c.value, pairs.c.value)).label("vals"),
+        )
+        .group_by(pairs.c.name)
+        .subquery("grouped")
+    )
+    return select(
+        func.coalesce(
+            func.jsonb_object_agg(grouped.c.name, grouped.c.vals),
+            literal({}, Product.facets.type),
+        )
+    ).scalar_subquery()
+
+
+def refresh_product_facets(product_id: uuid.UUID):
+    """Statement that recomputes ``products.facets`` for one product."""
+    return (
+        update(Product)
+        .where(Product.id == product_id)
+        .values(facets=product_facets_query(product_id))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def facet_conditions(facets: dict[str, list[str]]) -> list:
+    """
+    Containment filters served by the ``jsonb_path_ops`` GIN index.
+
+    Values within one facet are OR-ed; separate facets are AND-ed.
+    """
+    conditions = []
+    for name, values in facets.items():
+        values = [normalize_facet_value(v) for v in values if v and v.strip()]
+        if values:
+            conditions.append(
+                or_(*(Product.facets.contains({name: [value]}) for value in values))
+            )
+    return conditions
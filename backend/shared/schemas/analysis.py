@@ -26,8 +26,10 @@ class DetectedDefectResponse(BaseModel):
 
 class AnalysisResultResponse(BaseModel):
     id: uuid.UUID
+    organization_id: uuid.UUID
     product_image_id: uuid.UUID
     model_version: str
+    model_versions: dict = {}
     classification_label: str | None
     classification_confidence: float | None
     classification_scores: dict
@@ -38,6 +40,7 @@ class AnalysisResultResponse(BaseModel):
     error_message: str | None
     experiment_id: uuid.UUID | None = None
     variant_id: uuid.UUID | None = None
+    reused_from_id: uuid.UUID | None = None
     extracted_attributes: list[ExtractedAttributeResponse] = []
     detected_defects: list[DetectedDefectResponse] = []
     created_at: datetime
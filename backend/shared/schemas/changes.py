@@ -0,0 +1,21 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from shared.schemas.analysis import AnalysisResultResponse
+from shared.schemas.product import ProductResponse
+
+
+class ChangeEntry(BaseModel):
+    entity_type: str
+    id: uuid.UUID
+    updated_at: datetime
+    product: ProductResponse | None = None
+    analysis_result: AnalysisResultResponse | None = None
+
+
+class ChangeFeedResponse(BaseModel):
+    items: list[ChangeEntry]
+    next_cursor: str | None
+    has_more: bool
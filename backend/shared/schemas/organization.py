@@ -44,3 +44,15 @@ class InviteMemberRequest(BaseModel):
 
 class UpdateMemberRoleRequest(BaseModel):
     role: str
+
+
+class OrganizationCapacityResponse(BaseModel):
+    """Pipeline concurrency of an organization right now."""
+
+    organization_id: uuid.UUID
+    plan: str
+    concurrency_limit: int
+    in_use: int
+    waiting: int
+    deferred_interactive: int
+    queued_batch: int
@@ -1,11 +1,14 @@
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from shared.constants import BackfillModelType
 
 
 class JobStepResponse(BaseModel):
     id: uuid.UUID
+    product_image_id: uuid.UUID | None = None
     step_name: str
     status: str
     started_at: datetime | None
@@ -17,9 +20,20 @@ class JobStepResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class ProcessingJobResponse(BaseModel):
+class JobStepSummary(BaseModel):
+    """Per-step rollup computed in SQL instead of shipping every JobStep row."""
+
+    step_name: str
+    total: int
+    counts: dict[str, int]  # {"completed": 998, "failed": 2, ...}
+    p50_duration_ms: float | None = None
+    p95_duration_ms: float | None = None
+
+
+class ProcessingJobSummaryResponse(BaseModel):
     id: uuid.UUID
     user_id: uuid.UUID
+    organization_id: uuid.UUID | None = None
     job_type: str
     status: str
     total_images: int
@@ -29,7 +43,10 @@ class ProcessingJobResponse(BaseModel):
     started_at: datetime | None
     completed_at: datetime | None
     error_message: str | None
-    steps: list[JobStepResponse] = []
+    deadline: datetime | None = None
+    step_summary: list[JobStepSummary] = []
+    # Set when the job is submitted: admission control's estimate of the wait before it runs
+    estimated_wait_seconds: int | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -37,14 +54,19 @@ class ProcessingJobResponse(BaseModel):
 
 
 class ProcessingJobListResponse(BaseModel):
-    items: list[ProcessingJobResponse]
+    items: list[ProcessingJobSummaryResponse]
+    total: int
+
+
+class JobStepListResponse(BaseModel):
+    items: list[JobStepResponse]
     total: int
 
 
 class ProcessingUpdate(BaseModel):
     """WebSocket message format for real-time processing updates."""
 
-    type: str  # "step_update", "job_complete", "job_failed"
+    type: str  # "step_update", "image_complete", "image_failed", "job_complete", "job_failed"
     job_id: str
     image_id: str | None = None
     step: str | None = None
@@ -57,3 +79,46 @@ class ProcessingUpdate(BaseModel):
 class BatchCreateRequest(BaseModel):
     product_id: uuid.UUID
     image_ids: list[uuid.UUID]
+    # Run the models even when an identical image already has a completed analysis
+    force_recompute: bool = False
+    # Hold the batch until the cluster is idle or ``deadline`` draws near; a deadline implies it
+    deferrable: bool = False
+    deadline: datetime | None = None
+
+
+class BackfillCreateRequest(BaseModel):
+    model_type: BackfillModelType
+    model_version: str = Field(min_length=1, max_length=50)
+
+
+class DeadLetterResponse(BaseModel):
+    id: uuid.UUID
+    job_id: uuid.UUID | None
+    product_image_id: uuid.UUID | None
+    task_name: str
+    failure_kind: str
+    error_category: str
+    error_type: str
+    error_message: str | None
+    traceback: str | None
+    failed_step: str | None
+    attempts: int
+    redriven_at: datetime | None
+    redrive_job_id: uuid.UUID | None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class DeadLetterListResponse(BaseModel):
+    items: list[DeadLetterResponse]
+    total: int
+
+
+class RedriveRequest(BaseModel):
+    """Select dead letters to replay; with no filters every pending one is re-driven."""
+
+    ids: list[uuid.UUID] | None = None
+    error_category: str | None = None
+    job_id: uuid.UUID | None = None
+    force_recompute: bool = False
@@ -3,7 +3,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
-from shared.constants import ProductCategory, ProductStatus
+from shared.constants import CountMode, ProductCategory, ProductStatus
 
 
 class ProductCreate(BaseModel):
@@ -25,6 +25,7 @@ class ProductImageResponse(BaseModel):
     original_filename: str | None
     content_type: str | None
     file_size_bytes: int | None
+    content_sha256: str | None = None
     width: int | None
     height: int | None
     is_primary: bool
@@ -45,6 +46,7 @@ class ProductResponse(BaseModel):
     ai_description: str | None
     status: str
     metadata_: dict = Field(alias="metadata_")
+    facets: dict[str, list[str]] = {}
     images: list[ProductImageResponse] = []
     created_at: datetime
     updated_at: datetime
@@ -52,17 +54,29 @@ class ProductResponse(BaseModel):
     model_config = {"from_attributes": True, "populate_by_name": True}
 
 
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
 class ProductListResponse(BaseModel):
     items: list[ProductResponse]
-    total: int
+    total: int | None
+    total_is_estimate: bool = False
     page: int
     page_size: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None
+    facet_counts: dict[str, list[FacetCount]] = {}
 
 
 class ProductFilter(BaseModel):
     category: ProductCategory | None = None
     status: ProductStatus | None = None
     search: str | None = None
+    cursor: str | None = None
+    count: CountMode = CountMode.ESTIMATE
+    facets: dict[str, list[str]] = {}
+    facet_counts: bool = False
     page: int = Field(1, ge=1)
     page_size: int = Field(20, ge=1, le=100)
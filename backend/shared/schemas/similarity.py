@@ -0,0 +1,25 @@
+import uuid
+
+from pydantic import BaseModel
+
+from shared.schemas.product import ProductResponse
+
+
+class SimilarProduct(BaseModel):
+    product: ProductResponse
+    similarity: float
+
+
+class SimilarProductsResponse(BaseModel):
+    items: list[SimilarProduct]
+
+
+class DuplicateGroup(BaseModel):
+    image_ids: list[uuid.UUID]
+    products: list[ProductResponse]
+
+
+class DuplicateReportResponse(BaseModel):
+    groups: list[DuplicateGroup]
+    next_cursor: str | None = None
+    max_distance: int
@@ -24,8 +24,9 @@ class UploadConfirmRequest(BaseModel):
 class UploadConfirmResponse(BaseModel):
     image_id: uuid.UUID
     job_id: uuid.UUID
-    status: str = "queued"
+    status: str = "queued"  # "deferred" when admitted to the batch lane under load
     message: str = "Image processing started"
+    estimated_wait_seconds: int | None = None
 
 
 class DirectUploadResponse(BaseModel):
@@ -33,3 +34,4 @@ class DirectUploadResponse(BaseModel):
     job_id: uuid.UUID
     status: str = "queued"
     message: str = "Image uploaded and processing started"
+    estimated_wait_seconds: int | None = None
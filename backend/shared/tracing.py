@@ -0,0 +1,150 @@
+"""
+OpenTelemetry tracing for the API and the workers.
+
+Code records spans through ``tracer`` and the OpenTelemetry API. The API
+alone records nothing. A process exports spans only once
+``configure_tracing`` has installed the SDK provider with the exporter named
+by ``TRACING_EXPORTER``. The API calls it at startup; each worker pool
+process calls it after the fork. The exporter is one of:
+
+- ``none``: tracing is off (the default);
+- ``console``: spans are printed to stdout;
+- ``file``: one JSON span per line, appended to ``TRACING_FILE_PATH``;
+- ``otlp``: spans are sent to the collector at ``OTEL_EXPORTER_OTLP_ENDPOINT``;
+- ``package.module:factory``: any callable that returns a ``SpanExporter``.
+
+Trace context crosses from the API to Celery in the task message headers.
+See ``inject_context`` and ``extract_context``.
+"""
+import importlib
+
+from opentelemetry import propagate, trace
+from opentelemetry.context import Context
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy.orm import Session
+
+from shared.config import get_settings
+
+settings = get_settings()
+
+tracer = trace.get_tracer("imagineai")
+
+_provider = None
+
+
+def _span_exporter(name: str):
+    if name == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    if name == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        # Line-buffered, so the processes of a pod can append to one file
+        return ConsoleSpanExporter(
+            out=open(settings.tracing_file_path, "a", buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter()
+
+    module, _, factory = name.partition(":")
+    if not factory:
+        raise ValueError(f"Unknown tracing exporter '{name}'")
+    return getattr(importlib.import_module(module), factory)()
+
+
+def configure_tracing(component: str) -> None:
+    """Export this process's spans as ``<OTEL_SERVICE_NAME>-<component>``."""
+    global _provider
+    if settings.tracing_exporter == "none" or _provider is not None:
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": f"{settings.otel_service_name}-{component}"}),
+        # Workers follow the API's decision, so a trace is kept or dropped as a whole
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(_span_exporter(settings.tracing_exporter)))
+    trace.set_tracer_provider(_provider)
+
+
+def shutdown_tracing() -> None:
+    """Flush the spans still buffered in this process."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def inject_context(carrier: dict) -> None:
+    """Add the current trace context to ``carrier``, e.g. Celery message headers."""
+    propagate.inject(carrier)
+
+
+def extract_context(request) -> Context:
+    """Trace context a Celery task was published with (custom headers become request attributes)."""
+    fields = propagate.get_global_textmap().fields
+    carrier = {name: getattr(request, name) for name in fields if getattr(request, name, None)}
+    return propagate.extract(carrier)
+
+
+def _aws_call_started(params=None, model=None, context=None, **kwargs):
+    attributes = {
+        "rpc.system": "aws-api",
+        "rpc.service": model.service_model.service_id,
+        "rpc.method": model.name,
+    }
+    if params.get("Bucket"):
+        attributes["aws.s3.bucket"] = params["Bucket"]
+    if params.get("Key"):
+        attributes["aws.s3.key"] = params["Key"]
+    if params.get("modelId"):
+        attributes["aws.bedrock.model_id"] = params["modelId"]
+    context["otel_span"] = tracer.start_span(
+        f"{model.service_model.service_id.hyphenize()}.{model.name}",
+        kind=SpanKind.CLIENT,
+        attributes=attributes,
+    )
+
+
+def _aws_call_finished(http_response=None, context=None, **kwargs):
+    span = context.pop("otel_span", None)
+    if span is None:
+        return
+    span.set_attribute("http.response.status_code", http_response.status_code)
+    if http_response.status_code >= 300:
+        span.set_status(Status(StatusCode.ERROR))
+    span.end()
+
+
+def _aws_call_failed(exception=None, context=None, **kwargs):
+    span = context.pop("otel_span", None)
+    if span is None:
+        return
+    span.record_exception(exception)
+    span.set_status(Status(StatusCode.ERROR, str(exception)))
+    span.end()
+
+
+def trace_aws_calls(client):
+    """Record a client span for every API call ``client`` makes, e.g. ``s3.GetObject``."""
+    client.meta.events.register("provide-client-params", _aws_call_started)
+    client.meta.events.register("after-call", _aws_call_finished)
+    client.meta.events.register("after-call-error", _aws_call_failed)
+    return client
+
+
+class TracedSession(Session):
+    """Sync session whose commits are recorded as ``db.commit`` spans."""
+
+    def commit(self) -> None:
+        with tracer.start_as_current_span(
+            "db.commit", kind=SpanKind.CLIENT, attributes={"db.system": "postgresql"}
+        ):
+            super().commit()
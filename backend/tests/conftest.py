@@ -1,21 +1,30 @@
 import asyncio
 import uuid
 from collections.abc import AsyncGenerator
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Computed
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 
+from fastapi_app.services.auth_service import create_token_pair, hash_password
 from shared.models import Base
+from shared.models.organization import Organization, OrganizationMember
 from shared.models.user import User
-from fastapi_app.services.auth_service import create_token_pair, hash_password
 
 # Use an in-memory SQLite for tests or a test PostgreSQL
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 
+@compiles(Computed, "sqlite")
+def _skip_computed_on_sqlite(element, compiler, **kw):
+    # Generated columns use Postgres functions (to_tsvector); they stay NULL in SQLite
+    return ""
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     loop = asyncio.new_event_loop()
@@ -60,15 +69,28 @@ async def test_user(db_session: AsyncSession) -> User:
 
 
 @pytest_asyncio.fixture
-async def auth_headers(test_user: User) -> dict[str, str]:
+async def test_org(db_session: AsyncSession, test_user: User) -> Organization:
+    org = Organization(
+        id=uuid.uuid4(), name="Test Org", slug=f"test-{uuid.uuid4().hex[:8]}", is_active=True
+    )
+    db_session.add(org)
+    db_session.add(OrganizationMember(organization_id=org.id, user_id=test_user.id, role="owner"))
+    await db_session.commit()
+    return org
+
+
+@pytest_asyncio.fixture
+async def auth_headers(test_user: User, test_org: Organization) -> dict[str, str]:
     tokens = create_token_pair(str(test_user.id))
-    return {"Authorization": f"Bearer {tokens.access_token}"}
+    return {
+        "Authorization": f"Bearer {tokens.access_token}",
+        "X-Organization-ID": str(test_org.id),
+    }
 
 
 @pytest_asyncio.fixture
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     from fastapi_app.main import app
-    from fastapi_app.api.deps import get_current_user
     from shared.database import get_db_session
 
     async def override_db():
@@ -79,7 +101,7 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     # Mock Redis
     mock_redis = MagicMock()
     mock_redis.ping = MagicMock(return_value=True)
-    mock_redis.close = MagicMock(return_value=asyncio.coroutine(lambda: None)())
+    mock_redis.close = AsyncMock()
     app.state.redis = mock_redis
 
     transport = ASGITransport(app=app)
@@ -0,0 +1,158 @@
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.main import app
+from shared.admission import MAX_RETRY_AFTER_SECONDS, LaneLoad
+from shared.config import get_settings
+from shared.constants import AnalysisStatus, JobStatus, ProcessingLane
+from shared.models.analysis import AnalysisResult, DetectedDefect
+from shared.models.organization import Organization
+from shared.models.pipeline import ProcessingJob
+from shared.models.product import Product, ProductImage
+from shared.models.user import User
+from shared.org_stats import completed_analysis_deltas
+
+settings = get_settings()
+
+
+def _redis_with_pipeline() -> tuple[MagicMock, MagicMock]:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=["1-0", True])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    redis_client = MagicMock()
+    redis_client.set = AsyncMock()
+    redis_client.pipeline.return_value = pipe
+    return redis_client, pipe
+
+
+class TestCancelBatchJob:
+    async def test_cancel_ends_the_event_stream(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        job = ProcessingJob(
+            id=uuid.uuid4(), user_id=test_user.id, job_type="batch",
+            status=JobStatus.PROCESSING.value, total_images=3, processed_images=1,
+        )
+        db_session.add(job)
+        await db_session.commit()
+        redis_client, pipe = _redis_with_pipeline()
+        app.state.redis = redis_client
+
+        response = await client.delete(f"/api/v1/batch/{job.id}", headers=auth_headers)
+
+        assert response.status_code == 204
+        key, fields = pipe.xadd.call_args.args
+        assert key == f"job_events:{job.id}"
+        event = json.loads(fields["data"])
+        assert event["type"] == "job_failed"
+        assert event["status"] == JobStatus.CANCELLED.value
+        assert event["progress"] == {"completed": 1, "total": 3}
+
+
+@pytest_asyncio.fixture
+async def product_image(
+    db_session: AsyncSession, test_user: User, test_org: Organization
+) -> ProductImage:
+    product = Product(id=uuid.uuid4(), user_id=test_user.id, organization_id=test_org.id)
+    image = ProductImage(
+        id=uuid.uuid4(), product_id=product.id, s3_key=f"{uuid.uuid4()}.jpg", s3_bucket="images"
+    )
+    db_session.add_all([product, image])
+    await db_session.commit()
+    return image
+
+
+def _lane_loads(interactive: LaneLoad, batch: LaneLoad):
+    return patch(
+        "fastapi_app.services.admission_service.lane_loads",
+        AsyncMock(return_value={
+            ProcessingLane.INTERACTIVE: interactive, ProcessingLane.BATCH: batch,
+        }),
+    )
+
+
+class TestAdmission:
+    async def test_org_over_queued_limit_gets_429(
+        self, client: AsyncClient, auth_headers: dict, product_image: ProductImage
+    ):
+        app.state.redis.llen = AsyncMock(return_value=settings.admission_org_max_queued_images)
+        with _lane_loads(LaneLoad(0, 1.0), LaneLoad(0, 10.0)):
+            response = await client.post("/api/v1/batch", headers=auth_headers, json={
+                "product_id": str(product_image.product_id),
+                "image_ids": [str(product_image.id)],
+            })
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+    async def test_overloaded_batch_lane_gets_503(
+        self, client: AsyncClient, auth_headers: dict, product_image: ProductImage
+    ):
+        app.state.redis.llen = AsyncMock(return_value=0)
+        with _lane_loads(LaneLoad(0, 1.0), LaneLoad(10_000_000, 1.0)):
+            response = await client.post("/api/v1/batch", headers=auth_headers, json={
+                "product_id": str(product_image.product_id),
+                "image_ids": [str(product_image.id)],
+            })
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(MAX_RETRY_AFTER_SECONDS)
+
+    async def test_retry_rejected_when_both_lanes_are_full(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        test_org: Organization, product_image: ProductImage,
+    ):
+        db_session.add(AnalysisResult(
+            organization_id=test_org.id, product_image_id=product_image.id,
+            model_version="v1", status=AnalysisStatus.FAILED.value,
+        ))
+        await db_session.commit()
+
+        with _lane_loads(LaneLoad(120, 1.0), LaneLoad(7230, 1.0)):
+            response = await client.post(
+                f"/api/v1/analysis/{product_image.id}/retry", headers=auth_headers
+            )
+
+        assert response.status_code == 503
+        # The batch lane frees up first: 7231 s of work against its 7200 s limit
+        assert response.headers["Retry-After"] == "31"
+
+
+class TestRetryCompletedAnalysis:
+    async def test_retry_and_rerun_leave_defect_count_unchanged(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        test_org: Organization, product_image: ProductImage,
+    ):
+        analysis = AnalysisResult(
+            id=uuid.uuid4(), organization_id=test_org.id, product_image_id=product_image.id,
+            model_version="v1", status=AnalysisStatus.COMPLETED.value, processing_time_ms=900,
+        )
+        db_session.add(analysis)
+        db_session.add_all([
+            DetectedDefect(
+                organization_id=test_org.id, analysis_result_id=analysis.id,
+                defect_type=defect_type, severity="low", confidence=0.9,
+            )
+            for defect_type in ("scratch", "stain")
+        ])
+        await db_session.commit()
+
+        with _lane_loads(LaneLoad(0, 1.0), LaneLoad(0, 1.0)), \
+                patch("fastapi_app.services.stats_service.record_org_stats") as record, \
+                patch("fastapi_app.api.v1.analysis.dispatch_image", AsyncMock(return_value="t1")):
+            response = await client.post(
+                f"/api/v1/analysis/{product_image.id}/retry", headers=auth_headers
+            )
+
+        assert response.status_code == 200
+        retried = record.call_args.kwargs
+        assert retried["total_defects"] == -2
+        # The re-run replaces the two defects and counts them again in _finalize
+        rerun = completed_analysis_deltas(analysis, defects=2)
+        assert {name: retried[name] + rerun[name] for name in rerun} == dict.fromkeys(rerun, 0)
@@ -0,0 +1,26 @@
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from fastapi_app.services.change_feed_service import (
+    decode_change_cursor,
+    encode_change_cursor,
+)
+from shared.exceptions import ValidationError
+
+
+class TestChangeFeedCursor:
+    def test_roundtrip(self):
+        updated_at = datetime(2026, 5, 1, 12, 30, 15, 123456, tzinfo=UTC)
+        entity_id = uuid.uuid4()
+
+        cursor = encode_change_cursor(updated_at, entity_id)
+
+        assert "=" not in cursor
+        assert decode_change_cursor(cursor) == (updated_at, entity_id)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "eyJ0IjogMX0"])
+    def test_invalid_cursor_rejected(self, cursor):
+        with pytest.raises(ValidationError):
+            decode_change_cursor(cursor)
@@ -0,0 +1,100 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.admission import AdmissionDecision
+from shared.constants import AdmissionAction, AnalysisStatus
+from shared.exceptions import ServiceOverloadedError
+from shared.models.analysis import AnalysisResult
+from shared.models.organization import Organization
+from shared.models.pipeline import DeadLetter, ProcessingJob
+from shared.models.product import Product, ProductImage
+from shared.models.stats import OrganizationStats
+from shared.models.user import User
+
+
+@pytest_asyncio.fixture
+async def dead_lettered(
+    db_session: AsyncSession, test_user: User, test_org: Organization
+) -> list[AnalysisResult]:
+    """A failed analysis and one that completed after it was dead-lettered."""
+    product = Product(id=uuid.uuid4(), user_id=test_user.id, organization_id=test_org.id)
+    db_session.add(product)
+    analyses = []
+    for status in (AnalysisStatus.FAILED, AnalysisStatus.COMPLETED):
+        image = ProductImage(
+            id=uuid.uuid4(), product_id=product.id, s3_key=f"{uuid.uuid4()}.jpg", s3_bucket="images"
+        )
+        analysis = AnalysisResult(
+            id=uuid.uuid4(), organization_id=test_org.id, product_image_id=image.id,
+            model_version="v1", status=status.value, processing_time_ms=250,
+        )
+        db_session.add_all([image, analysis, DeadLetter(
+            organization_id=test_org.id, product_image_id=image.id, task_name="process_image",
+            failure_kind="permanent", error_category="bug", error_type="KeyError",
+        )])
+        analyses.append(analysis)
+    await db_session.commit()
+    return analyses
+
+
+class TestRedrive:
+    async def test_redrive_resets_analyses_and_reverses_completed_counters(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        test_org: Organization, dead_lettered: list[AnalysisResult],
+    ):
+        admit = AsyncMock(return_value=AdmissionDecision(
+            AdmissionAction.ACCEPT, estimated_wait_seconds=12
+        ))
+        with patch("fastapi_app.services.dead_letter_service.admit_batch_images", admit), \
+                patch("workers.tasks.batch_processing.process_batch") as process_batch, \
+                patch(
+                    # percentile_cont is Postgres-only
+                    "fastapi_app.services.job_service.summarize_job_steps",
+                    AsyncMock(return_value={}),
+                ):
+            process_batch.delay.return_value = MagicMock(id="redrive-task")
+            response = await client.post(
+                "/api/v1/dead-letters/redrive", json={}, headers=auth_headers
+            )
+
+        assert response.status_code == 201
+        assert response.json()["total_images"] == 2
+        assert response.json()["estimated_wait_seconds"] == 12
+        assert admit.await_args.args[1:] == (test_org.id, 2)
+
+        for analysis in dead_lettered:
+            await db_session.refresh(analysis)
+            assert analysis.status == AnalysisStatus.PENDING.value
+        stats = (await db_session.execute(
+            select(OrganizationStats).where(OrganizationStats.organization_id == test_org.id)
+        )).scalar_one()
+        assert stats.completed_analyses == -1
+        assert stats.processing_time_total_ms == -250
+
+    async def test_refused_redrive_changes_nothing(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        test_org: Organization, dead_lettered: list[AnalysisResult],
+    ):
+        admit = AsyncMock(side_effect=ServiceOverloadedError(retry_after=30))
+        with patch("fastapi_app.services.dead_letter_service.admit_batch_images", admit):
+            response = await client.post(
+                "/api/v1/dead-letters/redrive", json={}, headers=auth_headers
+            )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "30"
+        jobs = (await db_session.execute(
+            select(func.count(ProcessingJob.id)).where(ProcessingJob.organization_id == test_org.id)
+        )).scalar()
+        assert jobs == 0
+        pending = (await db_session.execute(
+            select(func.count(DeadLetter.id)).where(
+                DeadLetter.organization_id == test_org.id, DeadLetter.redriven_at.is_(None)
+            )
+        )).scalar()
+        assert pending == 2
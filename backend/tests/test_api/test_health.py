@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 from httpx import AsyncClient
 
@@ -20,3 +22,30 @@ class TestHealthEndpoints:
     async def test_health_returns_json(self, client: AsyncClient):
         response = await client.get("/health")
         assert response.headers["content-type"] == "application/json"
+
+    async def test_metrics_endpoint(self, client: AsyncClient):
+        await client.get("/health")
+        response = await client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_total{endpoint="/health",method="GET",status="200"}' in response.text
+
+    async def test_metrics_label_requests_by_route_template(self, client: AsyncClient):
+        await client.get("/api/v1/products/00000000-0000-0000-0000-000000000000")
+        response = await client.get("/metrics")
+        assert 'endpoint="/api/v1/products/{product_id}"' in response.text
+        assert "00000000-0000-0000-0000-000000000000" not in response.text
+
+
+class TestMultiprocessMetricsDir:
+    def test_clear_removes_only_sample_files(self, tmp_path):
+        from shared import metrics
+
+        (tmp_path / "counter_41.db").write_bytes(b"\0" * 8)
+        (tmp_path / "gauge_livesum_41.db").write_bytes(b"\0" * 8)
+        (tmp_path / "README").write_text("kept")
+
+        with patch.object(metrics, "MULTIPROC_DIR", str(tmp_path)):
+            metrics.clear_multiproc_dir()
+
+        assert [path.name for path in tmp_path.iterdir()] == ["README"]
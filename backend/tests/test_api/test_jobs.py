@@ -0,0 +1,143 @@
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_app.services.job_service import build_job_summaries, summarize_job_steps
+from shared.constants import JobStatus, StepName, StepStatus
+from shared.models.pipeline import JobStep, ProcessingJob
+from shared.models.user import User
+
+
+def _summary_db(rows: list[dict]) -> MagicMock:
+    result = MagicMock()
+    result.mappings.return_value = rows
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+def _step_row(job_id, step_name, total, p50=None, p95=None, **counts):
+    return {
+        "job_id": job_id, "step_name": step_name, "total": total, "p50": p50, "p95": p95,
+        **{status.value: counts.get(status.value, 0) for status in StepStatus},
+    }
+
+
+class TestSummarizeJobSteps:
+    async def test_one_grouped_query_for_all_jobs(self):
+        db = _summary_db([])
+
+        await summarize_job_steps(db, [uuid.uuid4(), uuid.uuid4()])
+
+        db.execute.assert_awaited_once()
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "GROUP BY job_steps.job_id, job_steps.step_name" in sql
+        assert "count(job_steps.id) FILTER (WHERE job_steps.status = " in sql
+        assert "percentile_cont(%(percentile_cont_1)s) WITHIN GROUP (ORDER BY job_steps.duration_ms)" in sql
+
+    async def test_rows_become_ordered_summaries(self):
+        job_id, idle_job_id = uuid.uuid4(), uuid.uuid4()
+        db = _summary_db([
+            _step_row(job_id, StepName.CLASSIFY.value, 3, p50=120.25, p95=300.0, completed=3),
+            _step_row(job_id, StepName.PREPROCESS.value, 3, completed=2, failed=1, p50=40.0),
+        ])
+
+        summaries = await summarize_job_steps(db, [job_id, idle_job_id])
+
+        preprocess, classify = summaries[job_id]
+        assert preprocess.step_name == StepName.PREPROCESS.value
+        assert preprocess.counts == {"completed": 2, "failed": 1}
+        assert preprocess.p95_duration_ms is None
+        assert classify.p50_duration_ms == 120.2
+        assert summaries[idle_job_id] == []
+
+    async def test_no_jobs_no_query(self):
+        db = _summary_db([])
+
+        assert await summarize_job_steps(db, []) == {}
+        db.execute.assert_not_awaited()
+
+    async def test_build_job_summaries_attaches_steps(self):
+        job = ProcessingJob(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), job_type="batch",
+            status=JobStatus.PROCESSING.value, total_images=3, processed_images=1,
+            failed_images=0, created_at=datetime.now(UTC), updated_at=datetime.now(UTC),
+        )
+        db = _summary_db([_step_row(job.id, StepName.CLASSIFY.value, 3, completed=1, pending=2)])
+
+        (summary,) = await build_job_summaries(db, [job])
+
+        assert summary.id == job.id
+        assert [step.step_name for step in summary.step_summary] == [StepName.CLASSIFY.value]
+        assert summary.step_summary[0].counts == {"completed": 1, "pending": 2}
+
+
+@pytest_asyncio.fixture
+async def job_with_steps(db_session: AsyncSession, test_user: User) -> ProcessingJob:
+    job = ProcessingJob(
+        id=uuid.uuid4(), user_id=test_user.id, job_type="batch",
+        status=JobStatus.PROCESSING.value, total_images=2,
+    )
+    db_session.add(job)
+    for image_id, failed in ((uuid.uuid4(), False), (uuid.uuid4(), True)):
+        for step_name in StepName:
+            status = StepStatus.COMPLETED
+            if failed and step_name == StepName.CLASSIFY:
+                status = StepStatus.FAILED
+            db_session.add(JobStep(
+                job_id=job.id, product_image_id=image_id,
+                step_name=step_name.value, status=status.value,
+            ))
+    await db_session.commit()
+    return job
+
+
+class TestListJobSteps:
+    async def test_pages_through_steps(
+        self, client: AsyncClient, auth_headers: dict, job_with_steps: ProcessingJob
+    ):
+        response = await client.get(
+            f"/api/v1/jobs/{job_with_steps.id}/steps?limit=4&offset=8", headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total"] == 10
+        assert len(body["items"]) == 2
+
+    async def test_filters_by_status_and_image(
+        self, client: AsyncClient, auth_headers: dict, job_with_steps: ProcessingJob
+    ):
+        response = await client.get(
+            f"/api/v1/jobs/{job_with_steps.id}/steps?status=failed", headers=auth_headers
+        )
+
+        (failed,) = response.json()["items"]
+        assert failed["step_name"] == StepName.CLASSIFY.value
+
+        response = await client.get(
+            f"/api/v1/jobs/{job_with_steps.id}/steps",
+            params={"image_id": failed["product_image_id"]},
+            headers=auth_headers,
+        )
+        assert response.json()["total"] == len(StepName)
+
+    async def test_other_users_job_is_not_found(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession
+    ):
+        other = User(
+            id=uuid.uuid4(), email=f"other-{uuid.uuid4().hex[:8]}@example.com",
+            hashed_password="x", full_name="Other", is_active=True,
+        )
+        job = ProcessingJob(id=uuid.uuid4(), user_id=other.id, job_type="batch")
+        db_session.add_all([other, job])
+        await db_session.commit()
+
+        response = await client.get(f"/api/v1/jobs/{job.id}/steps", headers=auth_headers)
+
+        assert response.status_code == 404
@@ -1,11 +1,117 @@
 import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi_app.services import similarity_service
+from fastapi_app.services.product_service import (
+    _decode_product_cursor,
+    _encode_product_cursor,
+)
+from fastapi_app.services.similarity_service import _vector_literal
+from shared.exceptions import ValidationError
 from shared.models.product import Product
-from shared.models.user import User
+from shared.near_duplicates import hamming_distance
+from shared.product_facets import facet_conditions
+
+
+class TestProductCursor:
+    def test_roundtrip(self):
+        product = Product(
+            id=uuid.uuid4(), created_at=datetime(2026, 3, 2, 8, 15, 0, 42, tzinfo=UTC)
+        )
+
+        cursor = _encode_product_cursor(product, None)
+
+        assert _decode_product_cursor(cursor, ranked=False) == (product.created_at, product.id)
+
+    def test_ranked_roundtrip(self):
+        product = Product(id=uuid.uuid4(), created_at=datetime(2026, 3, 2, tzinfo=UTC))
+
+        cursor = _encode_product_cursor(product, 0.30000001192092896)
+
+        assert _decode_product_cursor(cursor, ranked=True) == (
+            0.30000001192092896, product.created_at, product.id
+        )
+
+    def test_unranked_cursor_rejected_for_search(self):
+        product = Product(id=uuid.uuid4(), created_at=datetime(2026, 3, 2, tzinfo=UTC))
+
+        with pytest.raises(ValidationError):
+            _decode_product_cursor(_encode_product_cursor(product, None), ranked=True)
+
+
+class TestFacetConditions:
+    def test_values_normalized_and_or_combined(self):
+        conditions = facet_conditions({"color": [" Red", "blue"], "defect": ["scratch"]})
+
+        assert len(conditions) == 2
+        params = list(conditions[0].compile().params.values())
+        assert params == [{"color": ["red"]}, {"color": ["blue"]}]
+
+    def test_blank_values_ignored(self):
+        assert facet_conditions({"color": ["", "  "], "material": []}) == []
+
+
+class TestSimilarityQueryVector:
+    def test_vector_literal_format(self):
+        literal = _vector_literal([0.5] * 1791 + [1e-7])
+
+        assert literal.startswith("[0.5,0.5,")
+        assert literal.endswith(",1e-07]")
+
+    def test_wrong_dimension_rejected(self):
+        with pytest.raises(ValidationError):
+            _vector_literal([0.1] * 512)
+
+
+class TestDuplicateGroups:
+    @pytest.fixture
+    def catalog(self):
+        """Five images in ID order: two near-duplicate pairs and one loner."""
+        ids = sorted(uuid.uuid4() for _ in range(5))
+        base, other = 0x0F0F_0F0F_F0F0_F0F0, 0x1234_5678_9ABC_DEF0
+        hashes = [base, other, ~base & (2**63 - 1), base ^ 0b1, other ^ 0b11]
+        return [
+            SimpleNamespace(id=image_id, product_id=uuid.uuid4(), perceptual_hash=phash)
+            for image_id, phash in zip(ids, hashes)
+        ]
+
+    async def _page(self, catalog, cursor=None, limit=1):
+        async def seed_chunk(db, org_id, after, size):
+            return [row for row in catalog if after is None or row.id > after][:size]
+
+        async def band_neighbours(db, org_id, seeds, max_distance):
+            return [
+                row for row in catalog
+                if any(hamming_distance(row.perceptual_hash, seed.perceptual_hash) <= max_distance
+                       for seed in seeds)
+            ]
+
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock())
+        with patch.object(similarity_service, "_seed_chunk", seed_chunk), \
+                patch.object(similarity_service, "_band_neighbours", band_neighbours), \
+                patch.object(similarity_service.settings, "near_duplicate_scan_chunk_size", 2):
+            return await similarity_service.find_duplicate_groups(
+                db, uuid.uuid4(), max_distance=4, limit=limit, cursor=cursor
+            )
+
+    async def test_pages_report_each_group_once(self, catalog):
+        first = await self._page(catalog)
+
+        assert sorted(group["image_ids"] for group in first["groups"]) == [
+            [catalog[0].id, catalog[3].id], [catalog[1].id, catalog[4].id],
+        ]
+        assert first["next_cursor"] == str(catalog[1].id)
+
+        second = await self._page(catalog, cursor=catalog[1].id)
+
+        assert second["groups"] == []
+        assert second["next_cursor"] is None
 
 
 @pytest.mark.asyncio
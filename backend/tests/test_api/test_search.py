@@ -0,0 +1,71 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from shared.exceptions import ImageDecodeError
+
+
+def _task(ready: list[bool], result=None, error: Exception | None = None) -> MagicMock:
+    task = MagicMock(id="embed-task")
+    task.ready.side_effect = ready
+    task.get.side_effect = error or (lambda timeout: result)
+    return task
+
+
+@pytest.fixture
+def search_deps():
+    with patch("fastapi_app.api.v1.search.get_s3_client") as s3, \
+            patch("workers.tasks.feature_extraction.embed_query_image") as embed, \
+            patch(
+                "fastapi_app.api.v1.search.search_by_embedding",
+                AsyncMock(return_value={"items": []}),
+            ) as search, \
+            patch("fastapi_app.api.v1.search.RESULT_POLL_SECONDS", 0):
+        yield s3.return_value, embed, search
+
+
+async def _search(client: AsyncClient, auth_headers: dict):
+    return await client.post(
+        "/api/v1/search/by-image?limit=5",
+        headers=auth_headers,
+        files={"file": ("q.jpg", b"\xff\xd8jpeg", "image/jpeg")},
+    )
+
+
+class TestSearchByImage:
+    async def test_searches_with_the_worker_embedding(
+        self, client: AsyncClient, auth_headers: dict, search_deps
+    ):
+        s3, embed, search = search_deps
+        embedding = [0.1] * 8
+        embed.delay.return_value = _task([False, False, True], result=embedding)
+
+        response = await _search(client, auth_headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"items": []}
+        assert s3.put_object.call_args.kwargs["Body"] == b"\xff\xd8jpeg"
+        assert embed.delay.call_args.args[1] == s3.put_object.call_args.kwargs["Key"]
+        assert search.await_args.args[2] == embedding
+        assert search.await_args.kwargs == {"limit": 5}
+
+    async def test_timeout_is_a_502(self, client: AsyncClient, auth_headers: dict, search_deps):
+        _, embed, search = search_deps
+        embed.delay.return_value = _task([False] * 1000)
+
+        with patch("fastapi_app.api.v1.search.settings.similarity_query_timeout_seconds", 0):
+            response = await _search(client, auth_headers)
+
+        assert response.status_code == 502
+        search.assert_not_awaited()
+
+    async def test_undecodable_image_is_rejected(
+        self, client: AsyncClient, auth_headers: dict, search_deps
+    ):
+        _, embed, _ = search_deps
+        embed.delay.return_value = _task([True], error=ImageDecodeError("not an image"))
+
+        response = await _search(client, auth_headers)
+
+        assert response.status_code == 422
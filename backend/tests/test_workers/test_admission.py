@@ -0,0 +1,59 @@
+import pytest
+
+from shared.admission import (
+    MAX_RETRY_AFTER_SECONDS,
+    LaneLoad,
+    admit_batch,
+    admit_interactive,
+    drain_rate,
+)
+from shared.constants import AdmissionAction
+
+
+class TestDrainRate:
+    def test_measured_rate_when_enough_samples(self):
+        assert drain_rate(600, 300, 20, baseline=1.0) == 2.0
+
+    def test_baseline_when_lane_is_idle(self):
+        assert drain_rate(3, 300, 20, baseline=1.5) == 1.5
+
+
+class TestInteractiveAdmission:
+    def test_accepts_with_estimate(self):
+        decision = admit_interactive(LaneLoad(19, 2.0), LaneLoad(0, 2.0), 60, 3600)
+        assert decision.action == AdmissionAction.ACCEPT
+        assert decision.estimated_wait_seconds == 10
+
+    def test_defers_to_batch_lane_when_interactive_is_slow(self):
+        decision = admit_interactive(LaneLoad(1000, 2.0), LaneLoad(99, 1.0), 60, 3600)
+        assert decision.action == AdmissionAction.DEFER
+        assert decision.estimated_wait_seconds == 100
+
+    def test_rejects_when_both_lanes_are_over(self):
+        decision = admit_interactive(LaneLoad(299, 2.0), LaneLoad(10_000, 1.0), 60, 3600)
+        assert decision.action == AdmissionAction.REJECT
+        # Interactive lane drops back under its threshold in 150 - 60 seconds
+        assert decision.retry_after == 90
+
+    def test_stalled_lanes_get_capped_retry_after(self):
+        decision = admit_interactive(LaneLoad(5, 0.0), LaneLoad(5, 0.0), 60, 3600)
+        assert decision.action == AdmissionAction.REJECT
+        assert decision.retry_after == MAX_RETRY_AFTER_SECONDS
+
+
+class TestBatchAdmission:
+    def test_accepts_and_counts_new_images_in_estimate(self):
+        decision = admit_batch(LaneLoad(100, 10.0), 400, 3600, org_queued=0, org_max_queued=1000)
+        assert decision.action == AdmissionAction.ACCEPT
+        assert decision.estimated_wait_seconds == 50
+
+    def test_rejects_when_lane_wait_exceeds_threshold(self):
+        decision = admit_batch(LaneLoad(36_000, 10.0), 1000, 3600, 0, 100_000)
+        assert decision.action == AdmissionAction.REJECT
+        assert decision.retry_after == 100
+
+    @pytest.mark.parametrize("org_queued", [900, 1000])
+    def test_throttles_organization_over_its_backlog(self, org_queued):
+        decision = admit_batch(LaneLoad(1000, 10.0), 200, 3600, org_queued, org_max_queued=1000)
+        assert decision.action == AdmissionAction.THROTTLE
+        assert decision.retry_after >= 10
@@ -0,0 +1,93 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+from celery.exceptions import Retry
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from shared.backfill import backfill_conditions, backfill_lane_count, lane_bounds
+from shared.constants import JobStatus
+from shared.models.analysis import AnalysisResult
+
+
+class TestBackfillLanes:
+    def test_lanes_cover_uuid_space_without_overlap(self):
+        bounds = lane_bounds(4)
+
+        assert len(bounds) == 4
+        assert bounds[0][0] is None and bounds[-1][1] is None
+        for (_, upper), (lower, _) in zip(bounds, bounds[1:]):
+            assert upper == lower
+        inner = [uuid.UUID(upper) for _, upper in bounds[:-1]]
+        assert inner == sorted(inner)
+
+    def test_single_lane_is_unbounded(self):
+        assert lane_bounds(1) == [(None, None)]
+
+    def test_lane_count_is_share_of_worker_slots(self):
+        with patch("shared.backfill.settings") as mock_settings:
+            mock_settings.image_processing_worker_slots = 16
+            mock_settings.backfill_worker_share = 0.25
+            assert backfill_lane_count() == 4
+
+            mock_settings.backfill_worker_share = 0.01
+            assert backfill_lane_count() == 1
+
+
+class TestBackfillConditions:
+    def test_selects_completed_analyses_on_other_versions(self):
+        stmt = select(AnalysisResult.id).where(
+            *backfill_conditions(uuid.uuid4(), "classifier", "v2")
+        )
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "analysis_results.status = " in sql
+        assert "coalesce((analysis_results.model_versions ->> " in sql
+
+
+class TestBackfillChunkRetries:
+    def _run_failing_chunk(self, retries: int):
+        from workers.tasks import backfill
+
+        job = MagicMock(
+            status=JobStatus.PROCESSING.value, processed_images=0, failed_images=0,
+            metadata_={"model_type": "classifier", "model_version": "v2"},
+        )
+        rows = [(MagicMock(id=uuid.uuid4()), MagicMock()) for _ in range(3)]
+        session = MagicMock()
+        session.execute.side_effect = [
+            MagicMock(scalar_one=MagicMock(return_value=job)),
+            rows,
+            MagicMock(scalar_one=MagicMock(return_value=job)),
+        ]
+        session.__enter__.return_value = session
+
+        backfill_chunk = backfill.backfill_chunk
+        backfill_chunk.push_request(retries=retries)
+        try:
+            with patch.object(backfill, "get_sync_session", return_value=session), \
+                    patch.object(backfill, "_load_features", side_effect=RuntimeError("s3 down")), \
+                    patch.object(backfill_chunk, "retry", side_effect=Retry()) as retry, \
+                    patch.object(backfill_chunk, "delay") as next_chunk:
+                try:
+                    backfill_chunk.run(str(uuid.uuid4()), 0, None, None)
+                except Retry:
+                    pass
+        finally:
+            backfill_chunk.pop_request()
+        return job, rows, retry, next_chunk
+
+    def test_retries_while_attempts_remain(self):
+        job, _, retry, next_chunk = self._run_failing_chunk(retries=0)
+
+        retry.assert_called_once()
+        next_chunk.assert_not_called()
+        assert job.failed_images == 0
+
+    def test_last_retry_fails_chunk_and_advances_lane(self):
+        job, rows, retry, next_chunk = self._run_failing_chunk(retries=3)
+
+        retry.assert_not_called()
+        assert job.failed_images == 3
+        assert job.processed_images == 0
+        assert next_chunk.call_args.args[2] == str(rows[-1][0].id)
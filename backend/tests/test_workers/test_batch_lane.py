@@ -0,0 +1,136 @@
+import json
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from shared.constants import ProcessingLane
+
+
+def _item(job_id: str) -> str:
+    return json.dumps({"job_id": job_id, "image_id": str(uuid.uuid4()), "force_recompute": False})
+
+
+def _popped(org_id: str, *items: str) -> list[str]:
+    return [value for item in items for value in (org_id, item)]
+
+
+class TestBatchLane:
+    def test_plan_weights(self):
+        from workers.batch_lane import plan_weight
+
+        assert plan_weight("enterprise") > plan_weight("pro") > plan_weight("free")
+        assert plan_weight(None) == plan_weight("free")
+        assert plan_weight("legacy") == 1
+
+    @patch("workers.batch_lane.get_redis")
+    def test_enqueue_chunks_large_batches(self, mock_redis):
+        from workers.batch_lane import ENQUEUE_CHUNK_SIZE, enqueue_batch_images
+
+        script = MagicMock()
+        mock_redis.return_value.register_script.return_value = script
+        image_ids = [str(uuid.uuid4()) for _ in range(ENQUEUE_CHUNK_SIZE + 5)]
+
+        enqueue_batch_images(str(uuid.uuid4()), "pro", str(uuid.uuid4()), image_ids, False)
+
+        assert script.call_count == 2
+        first_args = script.call_args_list[0].kwargs["args"]
+        assert first_args[1] == 4
+        assert first_args[3] == 8
+        assert first_args[4] == "RPUSH"
+        assert len(first_args) == 5 + ENQUEUE_CHUNK_SIZE
+
+    @patch("workers.batch_lane.celery_app")
+    @patch("workers.batch_lane.ready_depth", return_value=14)
+    @patch("workers.batch_lane.get_redis")
+    def test_refill_tops_up_to_depth(self, mock_redis, _mock_depth, mock_celery):
+        from workers.batch_lane import refill_batch_lane
+
+        r = mock_redis.return_value
+        r.zcard.return_value = 2
+        r.set.return_value = True
+        job_id = str(uuid.uuid4())
+        pop = MagicMock(side_effect=[_popped("org", _item(job_id), _item(job_id)), []])
+        r.register_script.return_value = pop
+        r.pipeline.return_value.execute.return_value = [0]
+
+        with patch("workers.batch_lane.settings") as mock_settings:
+            mock_settings.batch_lane_queue_depth = 16
+            assert refill_batch_lane() == 2
+
+        assert pop.call_args_list[0].kwargs["args"][0] == 2
+        queues = {call.kwargs["queue"] for call in mock_celery.send_task.call_args_list}
+        assert queues == {ProcessingLane.BATCH.value}
+        r.delete.assert_called_once()
+
+    @patch("workers.batch_lane.celery_app")
+    @patch("workers.batch_lane.ready_depth", return_value=0)
+    @patch("workers.batch_lane.get_redis")
+    def test_refill_drops_cancelled_jobs(self, mock_redis, _mock_depth, mock_celery):
+        from workers.batch_lane import refill_batch_lane
+
+        r = mock_redis.return_value
+        r.zcard.return_value = 1
+        r.set.return_value = True
+        live, cancelled = sorted([str(uuid.uuid4()), str(uuid.uuid4())])
+        r.register_script.return_value = MagicMock(
+            side_effect=[_popped("org", _item(live), _item(cancelled)), []]
+        )
+        r.pipeline.return_value.execute.return_value = [0, 1]
+
+        assert refill_batch_lane() == 1
+        sent = mock_celery.send_task.call_args.kwargs["args"]
+        assert sent[1] == live
+
+    @patch("workers.batch_lane.get_redis")
+    def test_refill_skips_when_another_worker_holds_the_lock(self, mock_redis):
+        from workers.batch_lane import refill_batch_lane
+
+        r = mock_redis.return_value
+        r.zcard.return_value = 3
+        r.set.return_value = None
+
+        assert refill_batch_lane() == 0
+        r.register_script.assert_not_called()
+
+    @patch("workers.batch_lane.get_redis")
+    def test_requeue_goes_to_the_front(self, mock_redis):
+        from workers.batch_lane import requeue_batch_image
+
+        script = MagicMock()
+        mock_redis.return_value.register_script.return_value = script
+        requeue_batch_image(str(uuid.uuid4()), "free", str(uuid.uuid4()), str(uuid.uuid4()), False)
+
+        args = script.call_args.kwargs["args"]
+        assert args[4] == "LPUSH"
+        assert len(args) == 6
+
+    @patch("workers.batch_lane.celery_app")
+    @patch("workers.batch_lane.ready_depth", return_value=0)
+    @patch("workers.batch_lane.get_redis")
+    def test_unpublished_images_go_back_to_the_front(self, mock_redis, _mock_depth, mock_celery):
+        from workers.batch_lane import LIMITS_KEY, ORG_QUEUE_PREFIX, WEIGHTS_KEY, refill_batch_lane
+
+        r = mock_redis.return_value
+        r.zcard.return_value = 2
+        r.set.return_value = True
+        r.hget.side_effect = lambda key, _org: {WEIGHTS_KEY: "4", LIMITS_KEY: "8"}[key]
+        job_id = str(uuid.uuid4())
+        sent, failed, after = _item(job_id), _item(job_id), _item(job_id)
+        other = _item(job_id)
+        pop = MagicMock(side_effect=[
+            _popped("org-a", sent, failed) + _popped("org-b", other) + _popped("org-a", after),
+        ])
+        enqueue = MagicMock()
+        r.register_script.side_effect = [pop, enqueue, enqueue]
+        r.pipeline.return_value.execute.return_value = [0]
+        mock_celery.send_task.side_effect = [None, ConnectionError("broker down")]
+
+        with pytest.raises(ConnectionError):
+            refill_batch_lane()
+
+        returned = {call.kwargs["args"][0]: call.kwargs["args"] for call in enqueue.call_args_list}
+        assert returned["org-a"][1:5] == ["4", ORG_QUEUE_PREFIX, "8", "LPUSH"]
+        assert returned["org-a"][5:] == [after, failed]
+        assert returned["org-b"][5:] == [other]
+        r.delete.assert_called_once()
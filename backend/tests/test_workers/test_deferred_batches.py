@@ -0,0 +1,101 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from workers.deferred_batches import DeferredBatch, release_by, select_releases
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def _batch(hours: float, images: int = 100) -> DeferredBatch:
+    return DeferredBatch(str(uuid.uuid4()), NOW + timedelta(hours=hours), images)
+
+
+@patch("workers.deferred_batches.settings")
+class TestDeferredBatches:
+    def _configure(self, mock_settings):
+        mock_settings.image_processing_worker_slots = 8
+        mock_settings.admission_baseline_task_seconds = 4.0
+        mock_settings.deferred_release_margin_minutes = 30
+
+    def test_release_by_leaves_time_to_process(self, mock_settings):
+        self._configure(mock_settings)
+        batch = _batch(hours=10, images=7200)
+
+        # 7200 images at 2 per second take an hour, plus a 30 minute margin
+        assert release_by(batch) == batch.deadline - timedelta(minutes=90)
+
+    def test_busy_lanes_release_only_due_batches(self, mock_settings):
+        self._configure(mock_settings)
+        due, later = _batch(hours=0.5), _batch(hours=8)
+
+        assert select_releases([due, later], NOW, idle=False, max_images=5000) == [due.job_id]
+
+    def test_idle_lanes_release_earliest_deadlines_within_budget(self, mock_settings):
+        self._configure(mock_settings)
+        batches = [_batch(hours=4, images=300), _batch(hours=6, images=300), _batch(hours=8)]
+
+        released = select_releases(batches, NOW, idle=True, max_images=500)
+        assert released == [batches[0].job_id]
+
+    def test_idle_lanes_release_one_oversized_batch(self, mock_settings):
+        self._configure(mock_settings)
+        big = _batch(hours=20, images=10_000)
+
+        assert select_releases([big], NOW, idle=True, max_images=500) == [big.job_id]
+
+
+class TestSchedulerRouting:
+    def test_beat_schedulers_skip_the_batch_queue(self):
+        from workers.celery_app import celery_app
+
+        def queue(name):
+            return celery_app.amqp.router.route({}, f"workers.tasks.batch_processing.{name}")[
+                "queue"
+            ].name
+
+        assert queue("refill_batch_lane_task") == "maintenance"
+        assert queue("release_deferred_batches") == "maintenance"
+        assert queue("process_batch") == "image_processing_batch"
+
+
+class TestReleaseDeferredBatches:
+    def _release(self, publish_error=None):
+        from shared.constants import JobStatus
+        from shared.models.pipeline import ProcessingJob
+        from workers.tasks import batch_processing
+
+        job = ProcessingJob(
+            id=uuid.uuid4(), status=JobStatus.DEFERRED.value, deadline=NOW,
+            total_images=2, metadata_={"force_recompute": True},
+        )
+        session = MagicMock()
+        session.execute.return_value.scalars.side_effect = [
+            MagicMock(all=MagicMock(return_value=[job])),
+            iter([uuid.uuid4(), uuid.uuid4()]),
+        ]
+        with patch.object(batch_processing, "SyncSession") as mock_session, \
+                patch.object(batch_processing, "lanes_idle", return_value=True), \
+                patch.object(batch_processing.process_batch, "apply_async",
+                             side_effect=publish_error) as apply_async:
+            mock_session.return_value.__enter__.return_value = session
+            batch_processing.release_deferred_batches()
+        return job, session, apply_async
+
+    def test_released_job_is_queued_and_published(self):
+        job, session, apply_async = self._release()
+
+        assert job.status == "queued"
+        assert "released_at" in job.metadata_
+        assert apply_async.call_args.kwargs["task_id"] == job.celery_task_id
+        assert apply_async.call_args.kwargs["kwargs"] == {"force_recompute": True}
+        session.commit.assert_called_once()
+
+    def test_unpublished_job_goes_back_to_deferred(self):
+        job, session, apply_async = self._release(publish_error=ConnectionError("broker down"))
+
+        apply_async.assert_called_once()
+        assert job.status == "deferred"
+        assert job.celery_task_id is None
+        assert job.metadata_ == {"force_recompute": True}
+        assert session.commit.call_count == 2
@@ -0,0 +1,131 @@
+import gzip
+import io
+import random
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import boto3
+import pytest
+from moto import mock_aws
+from sqlalchemy.dialects import postgresql
+
+from workers.tasks.export_tasks import (
+    MIN_MULTIPART_PART_SIZE,
+    S3MultipartWriter,
+    _write_parquet,
+    build_export_query,
+)
+
+
+class TestS3MultipartWriter:
+    @mock_aws
+    def test_streams_gzip_in_parts(self):
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="exports")
+
+        upload = S3MultipartWriter(s3, "exports", "out.bin.gz", "application/gzip", part_size=1)
+        # Random bytes do not compress, so the gzip stream spans three parts
+        payload = random.Random(0).randbytes(2 * MIN_MULTIPART_PART_SIZE + 1024 * 1024)
+        with gzip.GzipFile(fileobj=upload, mode="wb") as gz:
+            gz.write(payload)
+        upload.complete()
+
+        assert upload.part_size == MIN_MULTIPART_PART_SIZE
+        assert [part["PartNumber"] for part in upload._parts] == [1, 2, 3]
+        body = s3.get_object(Bucket="exports", Key="out.bin.gz")["Body"].read()
+        assert len(body) == upload.bytes_written
+        assert gzip.decompress(body) == payload
+
+    @mock_aws
+    def test_empty_upload_completes(self):
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="exports")
+
+        upload = S3MultipartWriter(s3, "exports", "empty.gz", "application/gzip")
+        upload.complete()
+
+        assert s3.get_object(Bucket="exports", Key="empty.gz")["Body"].read() == b""
+
+
+class TestParquetExport:
+    def _row(self, **overrides):
+        values = {
+            "product_image_id": uuid.uuid4(),
+            "product_id": uuid.uuid4(),
+            "category": "shoes",
+            "classification_label": "sneaker",
+            "classification_confidence": 0.93,
+            "model_version": "v1",
+            "processing_time_ms": 120,
+            "status": "completed",
+            "created_at": datetime(2026, 3, 1, tzinfo=UTC),
+            "attributes": [{"name": "color", "value": "red", "confidence": 0.8}],
+            "defects": None,
+        }
+        values.update(overrides)
+        return SimpleNamespace(**values)
+
+    @mock_aws
+    def test_writes_typed_nested_columns(self):
+        import pyarrow.parquet as pq
+
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="exports")
+        upload = S3MultipartWriter(s3, "exports", "out.parquet", "application/vnd.apache.parquet")
+        progress = []
+
+        batches = [[self._row(), self._row(classification_confidence=None)], [self._row()]]
+        row_count = _write_parquet(batches, "analysis_parquet", upload, progress.append)
+        upload.complete()
+
+        assert row_count == 3
+        assert progress == [2, 3]
+
+        body = s3.get_object(Bucket="exports", Key="out.parquet")["Body"].read()
+        table = pq.read_table(io.BytesIO(body))
+        assert table.num_rows == 3
+        assert str(table.schema.field("classification_confidence").type) == "double"
+        assert table.column("attributes")[0].as_py() == [
+            {"name": "color", "value": "red", "confidence": 0.8}
+        ]
+        assert table.column("defects")[0].as_py() == []
+
+    def test_parquet_query_aggregates_nested_rows(self):
+        sql = str(
+            build_export_query("analysis_parquet", uuid.uuid4(), {"status": "completed"})
+            .compile(dialect=postgresql.dialect())
+        )
+
+        assert "json_agg" in sql
+        assert "analysis_results.status =" in sql
+
+
+class TestBuildExportQuery:
+    def _sql(self, query) -> str:
+        return str(query.compile(dialect=postgresql.dialect()))
+
+    def test_filters_pushed_into_sql(self):
+        query = build_export_query("analysis_csv", uuid.uuid4(), {
+            "date_from": datetime(2026, 1, 1, tzinfo=UTC).isoformat(),
+            "category": "shoes",
+            "status": "completed",
+            "product_ids": [str(uuid.uuid4())],
+        })
+        sql = self._sql(query)
+
+        assert "analysis_results.created_at >=" in sql
+        assert "products.category =" in sql
+        assert "analysis_results.status =" in sql
+        assert "products.id IN" in sql
+        assert "string_agg" in sql
+
+    def test_no_filters(self):
+        sql = self._sql(build_export_query("products_csv", uuid.uuid4(), {}))
+
+        assert "products.organization_id =" in sql
+        assert "products.category =" not in sql
+
+    def test_unknown_export_type(self):
+        with pytest.raises(ValueError):
+            build_export_query("bogus", uuid.uuid4(), {})
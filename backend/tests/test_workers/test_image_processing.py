@@ -1,9 +1,12 @@
 import uuid
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from tests.factories import (
+    AnalysisResultFactory,
+    DetectedDefectFactory,
+    ExtractedAttributeFactory,
     ProcessingJobFactory,
     ProductFactory,
     ProductImageFactory,
@@ -76,6 +79,45 @@ class TestImageProcessingPipeline:
         assert product.user_id == user_id
 
 
+class TestStepCheckpoints:
+    def test_finished_steps_include_skipped(self):
+        from workers.tasks.image_processing import _finished_steps
+
+        session = MagicMock()
+        session.execute.return_value.scalars.return_value = iter(["preprocess", "classify"])
+
+        assert _finished_steps(session, str(uuid.uuid4()), str(uuid.uuid4())) == {
+            "preprocess", "classify",
+        }
+        stmt = session.execute.call_args[0][0]
+        assert "job_steps.status IN" in str(stmt)
+
+    def test_checkpointed_defects_match_detector_output(self):
+        from types import SimpleNamespace
+
+        from workers.tasks.image_processing import _checkpointed_defects
+
+        row = SimpleNamespace(
+            defect_type="scratch",
+            severity="low",
+            confidence=0.8,
+            bounding_box={"x": 0.1, "y": 0.1, "width": 0.2, "height": 0.2},
+            description=None,
+        )
+        session = MagicMock()
+        session.execute.return_value.scalars.return_value = [row]
+
+        defects = _checkpointed_defects(session, SimpleNamespace(id=uuid.uuid4()))
+
+        assert defects == [{
+            "type": "scratch",
+            "severity": "low",
+            "confidence": 0.8,
+            "bounding_box": {"x": 0.1, "y": 0.1, "width": 0.2, "height": 0.2},
+            "description": None,
+        }]
+
+
 class TestBatchProcessing:
     @patch("workers.tasks.image_processing.process_image")
     def test_batch_task_dispatch(self, mock_task):
@@ -91,3 +133,354 @@ class TestBatchProcessing:
 
         assert len(tasks) == 5
         assert mock_task.delay.call_count == 5
+
+
+class TestImageEmbeddingStore:
+    def test_upsert_stores_float16(self):
+        import numpy as np
+
+        from shared.image_embeddings import upsert_image_embedding
+
+        features = np.linspace(-3, 3, 1792, dtype=np.float32)
+        stmt = upsert_image_embedding(
+            uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), "v1", features
+        )
+
+        stored = stmt.compile().params["embedding"]
+        assert stored.dtype == np.float16
+        assert stored.shape == (1792,)
+
+    def test_upsert_rejects_wrong_dimension(self):
+        import numpy as np
+
+        from shared.image_embeddings import upsert_image_embedding
+
+        with pytest.raises(ValueError):
+            upsert_image_embedding(
+                uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), "v1", np.zeros(512)
+            )
+
+
+class TestNearDuplicates:
+    def test_probe_keys_cover_hashes_within_distance(self):
+        from shared.near_duplicates import band_keys, probe_keys
+
+        phash = 0x0123_4567_89AB_CDEF
+        near = phash ^ 0b1011 ^ (1 << 20) ^ (1 << 40) ^ (1 << 63) ^ (1 << 62)
+
+        assert set(band_keys(near)) & set(probe_keys(phash, 8))
+
+    def test_probe_keys_reject_unindexed_distance(self):
+        from shared.near_duplicates import MAX_NEAR_DUPLICATE_DISTANCE, probe_keys
+
+        with pytest.raises(ValueError):
+            probe_keys(0, MAX_NEAR_DUPLICATE_DISTANCE + 1)
+
+    def test_signed_storage_preserves_distance(self):
+        from shared.near_duplicates import hamming_distance, to_signed64
+
+        phash = (1 << 63) | 0b111
+        assert to_signed64(phash) < 0
+        assert hamming_distance(to_signed64(phash), phash ^ 0b1) == 1
+
+    def test_group_near_duplicates(self):
+        from shared.near_duplicates import group_near_duplicates
+
+        base = 0xF0F0_F0F0_0F0F_0F0F
+        groups = group_near_duplicates(
+            [("a", base), ("b", base ^ 0b11), ("c", base), ("d", ~base)],
+            max_distance=4,
+        )
+
+        assert [sorted(group) for group in groups] == [["a", "b", "c"]]
+
+    def test_near_duplicate_is_not_an_exact_reuse_source(self):
+        from shared.analysis_reuse import near_duplicate_versions
+
+        versions = {"classifier": "v1", "feature_extractor": "v1"}
+        source = MagicMock(id=uuid.uuid4())
+
+        marked = near_duplicate_versions(versions, source)
+
+        assert marked != versions
+        assert marked["near_duplicate_of"] == str(source.id)
+        assert {key: marked[key] for key in versions} == versions
+
+    def test_perceptual_hash_survives_resize_and_recompression(self):
+        import io
+
+        import numpy as np
+        from PIL import Image
+
+        from ml.services.perceptual_hash import perceptual_hash, perceptual_hash_from_bytes
+        from shared.near_duplicates import hamming_distance
+
+        rng = np.random.default_rng(7)
+        pixels = rng.integers(0, 255, (8, 8, 3), dtype=np.uint8)
+        original = Image.fromarray(pixels).resize((256, 256), Image.Resampling.BILINEAR)
+
+        buffer = io.BytesIO()
+        original.resize((180, 180)).save(buffer, format="JPEG", quality=60)
+
+        copy_hash = perceptual_hash_from_bytes(buffer.getvalue())
+        other_hash = perceptual_hash(Image.fromarray(255 - np.asarray(original)))
+
+        assert hamming_distance(perceptual_hash(original), copy_hash) <= 8
+        assert hamming_distance(perceptual_hash(original), other_hash) > 20
+
+
+class TestFailureClassification:
+    def test_decode_errors_are_permanent(self):
+        from shared.exceptions import ImageDecodeError
+        from shared.failures import classify_failure
+
+        failure = classify_failure(ImageDecodeError("cannot identify image file"))
+        assert failure.is_permanent
+        assert failure.category == "decode"
+
+    def test_missing_object_is_permanent(self):
+        from botocore.exceptions import ClientError
+
+        from shared.failures import classify_failure
+
+        exc = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        assert classify_failure(exc).category == "not_found"
+        assert classify_failure(exc).is_permanent
+
+    def test_uncommitted_rows_are_transient(self):
+        from sqlalchemy.exc import NoResultFound
+
+        from shared.failures import classify_failure
+
+        # The task can be published before the API request commits the job
+        failure = classify_failure(NoResultFound("No row was found when one was required"))
+        assert not failure.is_permanent
+        assert failure.category == "uncommitted"
+
+    def test_throttling_is_transient(self):
+        from botocore.exceptions import ClientError
+
+        from shared.exceptions import ExternalServiceError
+        from shared.failures import classify_failure
+
+        throttled = ClientError({"Error": {"Code": "ThrottlingException"}}, "InvokeModel")
+        assert not classify_failure(throttled).is_permanent
+        bedrock = ExternalServiceError("Bedrock", "slow down", error_code="ThrottlingException")
+        assert not classify_failure(bedrock).is_permanent
+        rejected = ExternalServiceError("Bedrock", "bad input", error_code="ValidationException")
+        assert classify_failure(rejected).is_permanent
+
+    def test_network_errors_are_transient(self):
+        from shared.failures import classify_failure
+
+        assert classify_failure(ConnectionResetError()).category == "network"
+        assert classify_failure(TimeoutError()).category == "timeout"
+        assert not classify_failure(RuntimeError("flaky")).is_permanent
+
+    def test_programming_errors_are_permanent(self):
+        from shared.failures import classify_failure
+
+        assert classify_failure(KeyError("label")).category == "bug"
+        assert classify_failure(TypeError("bad operand")).is_permanent
+
+    def test_traceback_is_truncated(self):
+        from shared.failures import MAX_TRACEBACK_CHARS, format_traceback
+
+        try:
+            raise ValueError("x" * (MAX_TRACEBACK_CHARS * 2))
+        except ValueError as exc:
+            text = format_traceback(exc)
+        assert len(text) == MAX_TRACEBACK_CHARS
+        assert text.rstrip().endswith("x")
+
+
+class TestJobCancellation:
+    def test_image_task_ids_are_derived_from_job_and_image(self):
+        from shared.job_cancellation import image_task_id
+
+        job_id, image_id = str(uuid.uuid4()), str(uuid.uuid4())
+        assert image_task_id(job_id, image_id) == image_task_id(job_id, image_id)
+        assert image_task_id(job_id, image_id) != image_task_id(str(uuid.uuid4()), image_id)
+
+    def test_revokes_are_chunked(self):
+        from shared.job_cancellation import chunked
+
+        chunks = chunked([str(i) for i in range(2500)], 1000)
+        assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+
+    @patch("workers.cancellation.get_redis")
+    def test_raise_if_cancelled(self, mock_redis):
+        from shared.exceptions import JobCancelledError
+        from workers.cancellation import raise_if_cancelled
+
+        job_id = str(uuid.uuid4())
+        mock_redis.return_value.exists.return_value = 0
+        raise_if_cancelled(job_id)
+
+        mock_redis.return_value.exists.return_value = 1
+        with pytest.raises(JobCancelledError):
+            raise_if_cancelled(job_id)
+        mock_redis.return_value.exists.assert_called_with(f"job_cancelled:{job_id}")
+
+    @patch("workers.tasks.image_processing.get_sync_session")
+    @patch("workers.tasks.image_processing.is_job_cancelled", return_value=True)
+    def test_cancelled_job_skips_queued_image(self, _mock_cancelled, mock_session):
+        from workers.tasks.image_processing import process_image
+
+        process_image.run(str(uuid.uuid4()), str(uuid.uuid4()))
+        mock_session.assert_not_called()
+
+
+class TestOrgConcurrency:
+    def test_limits_follow_plan(self):
+        from shared.org_concurrency import concurrency_limit
+
+        assert concurrency_limit("enterprise") > concurrency_limit("pro") > concurrency_limit("free")
+        assert concurrency_limit(None) == concurrency_limit("free")
+
+    @patch("workers.org_concurrency.get_redis")
+    def test_acquire_passes_plan_limit_and_lease(self, mock_redis):
+        from workers.org_concurrency import acquire_org_slot
+
+        script = MagicMock(return_value=0)
+        mock_redis.return_value.register_script.return_value = script
+        org_id = str(uuid.uuid4())
+
+        assert acquire_org_slot(org_id, "pro", "task-1") is False
+        call = script.call_args.kwargs
+        assert call["keys"] == [f"org_slots:{org_id}", f"org_deferred:{org_id}"]
+        assert call["args"][1:3] == [8, "task-1"]
+
+    @patch("workers.tasks.image_processing.requeue_batch_image")
+    @patch("workers.tasks.image_processing.mark_deferred")
+    def test_batch_lane_task_is_requeued_not_republished(self, mock_deferred, mock_requeue):
+        from shared.constants import ProcessingLane
+        from workers.tasks.image_processing import _defer_over_quota
+
+        task = MagicMock()
+        task.request.delivery_info = {"routing_key": ProcessingLane.BATCH.value}
+        _defer_over_quota(task, "org", "free", "image", "job", None, False)
+
+        mock_requeue.assert_called_once_with("org", "free", "job", "image", False)
+        mock_deferred.assert_not_called()
+        task.apply_async.assert_not_called()
+
+    @patch("workers.tasks.image_processing.requeue_batch_image")
+    @patch("workers.tasks.image_processing.mark_deferred")
+    def test_interactive_task_is_republished_with_same_id(self, mock_deferred, mock_requeue):
+        from shared.constants import ProcessingLane
+        from workers.tasks.image_processing import _defer_over_quota
+
+        task = MagicMock()
+        task.request.delivery_info = {"routing_key": ProcessingLane.INTERACTIVE.value}
+        task.request.id = "task-1"
+        task.request.retries = 2
+        _defer_over_quota(task, "org", "free", "image", "job", "user", True)
+
+        mock_requeue.assert_not_called()
+        mock_deferred.assert_called_once_with("org", "task-1")
+        options = task.apply_async.call_args.kwargs
+        assert options["task_id"] == "task-1"
+        assert options["retries"] == 2
+        assert options["queue"] == ProcessingLane.INTERACTIVE.value
+        assert options["countdown"] > 0
+
+
+class TestAnalysisReuse:
+    def test_reuse_requires_same_content_org_and_model_versions(self):
+        from sqlalchemy.dialects import postgresql
+
+        from shared.analysis_reuse import find_reusable_analysis
+
+        analysis = AnalysisResultFactory(organization_id=uuid.uuid4())
+        versions = {"classifier": "v1", "feature_extractor": "v1", "defect_detector": "v2"}
+        session = MagicMock()
+
+        find_reusable_analysis(session, analysis, "ab" * 32, versions)
+
+        compiled = session.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert "product_images.content_sha256 = %(content_sha256_1)s" in sql
+        assert "analysis_results.model_versions = %(model_versions_1)s" in sql
+        assert "analysis_results.id != %(id_1)s" in sql
+        assert compiled.params["content_sha256_1"] == "ab" * 32
+        assert compiled.params["organization_id_1"] == analysis.organization_id
+        assert compiled.params["status_1"] == "completed"
+        assert compiled.params["model_versions_1"] == versions
+        assert compiled.params["id_1"] == analysis.id
+
+    def test_copy_analysis_copies_output_and_children(self):
+        from shared.analysis_reuse import copy_analysis
+        from shared.models.analysis import DetectedDefect, ExtractedAttribute
+
+        source = AnalysisResultFactory(
+            model_versions={"classifier": "v1"},
+            classification_scores={"footwear": 0.9},
+            description_text="Brown leather boots",
+            description_model="claude",
+        )
+        source.extracted_attributes = [ExtractedAttributeFactory(analysis_result_id=source.id)]
+        source.detected_defects = [DetectedDefectFactory(analysis_result_id=source.id)]
+        target = AnalysisResultFactory(organization_id=uuid.uuid4(), status="processing")
+        image = ProductImageFactory()
+        session = MagicMock()
+
+        copy_analysis(session, source, target, image)
+
+        for field in (
+            "model_version", "model_versions", "classification_label",
+            "classification_confidence", "classification_scores",
+            "description_text", "description_model",
+        ):
+            assert getattr(target, field) == getattr(source, field)
+        assert target.reused_from_id == source.id
+        assert target.status == "processing"
+
+        added = [call.args[0] for call in session.add.call_args_list]
+        (attribute,) = [row for row in added if isinstance(row, ExtractedAttribute)]
+        (defect,) = [row for row in added if isinstance(row, DetectedDefect)]
+        assert attribute.analysis_result_id == target.id
+        assert attribute.attribute_value == source.extracted_attributes[0].attribute_value
+        assert defect.analysis_result_id == target.id
+        assert defect.organization_id == target.organization_id
+        assert defect.defect_type == source.detected_defects[0].defect_type
+
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert any(sql.startswith("DELETE FROM extracted_attributes") for sql in statements)
+        assert any(sql.startswith("DELETE FROM detected_defects") for sql in statements)
+        assert any(sql.startswith("INSERT INTO image_embeddings") for sql in statements)
+
+
+class TestDeadLetteredImage:
+    @patch("workers.tasks.image_processing.record_lane_completion")
+    @patch("workers.tasks.image_processing.publish_job_failed")
+    @patch("workers.tasks.image_processing.get_sync_session")
+    @patch("workers.tasks.image_processing._job_org", return_value=(None, None))
+    @patch("workers.tasks.image_processing.is_job_cancelled", return_value=False)
+    def test_last_failed_image_fails_the_locked_job(
+        self, _cancelled, _org, mock_session, mock_failed, _lane
+    ):
+        from sqlalchemy.dialects import postgresql
+
+        from shared.models.pipeline import ProcessingJob
+        from workers.tasks.image_processing import process_image
+
+        job = ProcessingJob(
+            id=uuid.uuid4(), status="processing",
+            processed_images=1, failed_images=0, total_images=2,
+        )
+        broken, steps, analysis, locked = MagicMock(), MagicMock(), MagicMock(), MagicMock()
+        broken.scalar_one.side_effect = TypeError("bad operand")
+        steps.scalars.return_value = []
+        analysis.scalar_one_or_none.return_value = None
+        locked.scalar_one_or_none.return_value = job
+        session = mock_session.return_value.__enter__.return_value
+        session.execute.side_effect = [broken, steps, analysis, locked]
+
+        process_image.run(str(uuid.uuid4()), str(job.id))
+
+        job_lookup = session.execute.call_args_list[3].args[0]
+        assert str(job_lookup.compile(dialect=postgresql.dialect())).endswith("FOR UPDATE")
+        assert job.failed_images == 1
+        assert job.status == "failed"
+        mock_failed.assert_called_once()
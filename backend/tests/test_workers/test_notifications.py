@@ -1,7 +1,5 @@
 import uuid
-from unittest.mock import MagicMock, patch
-
-import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
 class TestNotificationTasks:
@@ -52,3 +50,136 @@ class TestWebSocketNotifications:
         manager.broadcast({"type": "system", "message": "Maintenance window"})
 
         mock_instance.broadcast.assert_called_once()
+
+
+class TestJobEventStream:
+    @patch("workers.tasks.notifications.get_sync_redis")
+    def test_step_update_appended_to_capped_stream(self, mock_get_redis):
+        from workers.tasks.notifications import publish_step_update
+
+        mock_redis = MagicMock()
+        mock_pipe = mock_redis.pipeline.return_value
+        mock_pipe.execute.return_value = ["1700000000000-0", True]
+        mock_get_redis.return_value = mock_redis
+
+        job_id = str(uuid.uuid4())
+        publish_step_update(job_id, None, "classify", "running")
+
+        args, kwargs = mock_pipe.xadd.call_args
+        assert args[0] == f"job_events:{job_id}"
+        assert '"step": "classify"' in args[1]["data"]
+        assert kwargs["approximate"] is True
+        assert kwargs["maxlen"] > 0
+        mock_pipe.expire.assert_called_once()
+        mock_redis.publish.assert_not_called()
+
+    def test_normalize_last_event_id(self):
+        from shared.job_events import STREAM_START_ID, normalize_last_event_id
+
+        assert normalize_last_event_id(None) == STREAM_START_ID
+        assert normalize_last_event_id("") == STREAM_START_ID
+        assert normalize_last_event_id("not-an-id") == STREAM_START_ID
+        assert normalize_last_event_id("1700000000000-3") == "1700000000000-3"
+        assert normalize_last_event_id("1700000000000") == "1700000000000"
+
+    async def test_image_events_do_not_end_the_stream(self):
+        import json
+
+        from fastapi_app.services.job_event_service import stream_job_events
+
+        events = [
+            {"type": "image_complete", "image_id": "a", "progress": {"completed": 1, "total": 2}},
+            {"type": "image_failed", "image_id": "b", "data": {"error": "boom"}},
+            {"type": "job_complete", "progress": {"completed": 1, "total": 2}},
+        ]
+        redis_client = MagicMock()
+        redis_client.exists = AsyncMock(return_value=True)
+        redis_client.xread = AsyncMock(return_value=[(
+            "job_events:1",
+            [(f"1-{i}", {"data": json.dumps(event)}) for i, event in enumerate(events)],
+        )])
+        job = MagicMock(id=uuid.uuid4())
+
+        received = [event async for _, event in stream_job_events(redis_client, job)]
+
+        assert [event["type"] for event in received] == [
+            "image_complete", "image_failed", "job_complete"
+        ]
+        redis_client.xread.assert_awaited_once()
+
+
+class TestFinalizeEvents:
+    def _finalize(self, processed: int, total: int):
+        from workers.tasks import image_processing
+
+        job = MagicMock(
+            id=uuid.uuid4(), status="processing",
+            processed_images=processed, failed_images=0, total_images=total,
+        )
+        image = MagicMock(id=uuid.uuid4())
+        session = MagicMock()
+        with patch.object(image_processing, "increment_org_stats"), \
+                patch.object(image_processing, "completed_analysis_deltas", return_value={}), \
+                patch.object(image_processing, "refresh_product_facets"), \
+                patch.object(image_processing, "publish_job_complete") as job_complete, \
+                patch.object(image_processing, "publish_image_complete") as image_complete:
+            image_processing._finalize(
+                session, job, image, MagicMock(), pipeline_start=0.0, defects_count=0
+            )
+        # Parallel images of the job must not lose each other's increments
+        session.refresh.assert_called_once_with(job, with_for_update=True)
+        return job, job_complete, image_complete
+
+    def test_earlier_images_do_not_complete_the_job(self):
+        job, job_complete, image_complete = self._finalize(processed=0, total=2)
+
+        assert job.status == "processing"
+        job_complete.assert_not_called()
+        image_complete.assert_called_once()
+
+    def test_last_image_completes_the_job(self):
+        job, job_complete, image_complete = self._finalize(processed=1, total=2)
+
+        assert job.status == "completed"
+        job_complete.assert_called_once_with(
+            str(job.id), progress={"completed": 2, "total": 2}
+        )
+        image_complete.assert_not_called()
+
+
+class TestJobWebhooks:
+    def _dispatch(self, org_id, webhooks):
+        from workers.tasks.notifications import _dispatch_job_webhooks
+
+        session = MagicMock()
+        session.execute.return_value.scalar_one_or_none.return_value = org_id
+        session.execute.return_value.scalars.return_value.all.return_value = webhooks
+        with patch("workers.celery_app.get_sync_session") as mock_session, \
+                patch("workers.tasks.webhook_delivery.deliver_webhook") as deliver:
+            mock_session.return_value.__enter__.return_value = session
+            _dispatch_job_webhooks("job-1", "job.completed", {"completed": 2})
+        return session, deliver
+
+    def test_webhooks_are_found_through_the_jobs_organization(self):
+        org_id = uuid.uuid4()
+        subscribed = MagicMock(id=uuid.uuid4(), events=["job.completed"])
+        wildcard = MagicMock(id=uuid.uuid4(), events=["*"])
+        other = MagicMock(id=uuid.uuid4(), events=["job.failed"])
+
+        session, deliver = self._dispatch(org_id, [subscribed, wildcard, other])
+
+        job_lookup, webhook_lookup = (call.args[0] for call in session.execute.call_args_list)
+        assert "SELECT processing_jobs.organization_id" in str(job_lookup)
+        assert webhook_lookup.compile().params["organization_id_1"] == org_id
+        assert [call.args[0] for call in deliver.delay.call_args_list] == [
+            str(subscribed.id), str(wildcard.id),
+        ]
+        payload = deliver.delay.call_args.args[2]
+        assert payload["job_id"] == "job-1"
+        assert payload["completed"] == 2
+
+    def test_unattributed_job_sends_nothing(self):
+        session, deliver = self._dispatch(None, [])
+
+        session.execute.assert_called_once()
+        deliver.delay.assert_not_called()
@@ -0,0 +1,153 @@
+import math
+from unittest.mock import MagicMock, patch
+
+from workers.queue_stats import (
+    ServiceStats,
+    desired_workers,
+    drain_seconds,
+    service_stats,
+    task_queue,
+)
+
+
+def _task(routing_key: str | None) -> MagicMock:
+    task = MagicMock()
+    task.request.delivery_info = {"routing_key": routing_key} if routing_key else None
+    return task
+
+
+class TestQueueStats:
+    def test_task_queue_maps_default_routing_key(self):
+        assert task_queue(_task("image.process")) == "image_processing"
+        assert task_queue(_task("image_processing_batch")) == "image_processing_batch"
+        assert task_queue(_task(None)) == "image_processing"
+
+    def test_mean_service_falls_back_without_samples(self):
+        assert ServiceStats(10, 25.0).mean_service_seconds(default=4.0) == 2.5
+        assert ServiceStats(0, 0.0).mean_service_seconds(default=4.0) == 4.0
+
+    def test_drain_seconds(self):
+        assert drain_seconds(0, 3.0, 0) == 0.0
+        assert drain_seconds(100, 3.0, 0) == math.inf
+        assert drain_seconds(100, 3.0, 12) == 25.0
+
+    def test_desired_workers_covers_load_and_backlog(self):
+        # 6 busy slots plus 600 tasks * 2s over 300s = 4 more slots, at 4 slots per worker
+        assert desired_workers(600, 2.0, 6.0, 300, 4) == 3
+        assert desired_workers(0, 2.0, 0.0, 300, 4) == 0
+
+    @patch("workers.queue_stats.get_redis")
+    def test_service_stats_sums_the_window(self, mock_redis):
+        pipe = mock_redis.return_value.pipeline.return_value
+        with patch("workers.queue_stats.settings") as mock_settings:
+            mock_settings.queue_service_window_minutes = 2
+            pipe.execute.return_value = [["3", "6.0"], [None, None], ["1", "0.5"], ["2", "1.5"]]
+            stats = service_stats(["a", "b"])
+
+        assert stats["a"] == ServiceStats(3, 6.0)
+        assert stats["b"] == ServiceStats(3, 2.0)
+
+
+def _worker(*queues: str) -> list[dict]:
+    return [{"name": queue} for queue in queues]
+
+
+class TestQueueExporter:
+    def test_routed_queues_include_the_default_queue(self):
+        from workers.celery_app import celery_app
+        from workers.queue_exporter import routed_queues
+
+        queues = routed_queues()
+
+        assert celery_app.conf.task_default_queue in queues
+        assert {"image_processing_batch", "maintenance", "search"} <= set(queues)
+        assert queues == sorted(set(queues))
+
+    @patch("workers.queue_exporter.celery_app")
+    def test_worker_capacity_sums_pool_slots_per_queue(self, mock_celery):
+        from workers.queue_exporter import _worker_capacity
+
+        inspect = mock_celery.control.inspect.return_value
+        inspect.active_queues.return_value = {
+            "w1": _worker("image_processing", "exports"),
+            "w2": _worker("image_processing", "unrouted"),
+            "w3": _worker("exports"),
+        }
+        inspect.stats.return_value = {
+            "w1": {"pool": {"max-concurrency": 4}},
+            "w2": {"pool": {"max-concurrency": 2}},
+        }
+
+        consumers, slots = _worker_capacity(["image_processing", "exports", "search"])
+
+        assert consumers == {"image_processing": 2, "exports": 2, "search": 0}
+        assert slots == {"image_processing": 6, "exports": 4, "search": 0}
+
+    @patch("workers.queue_exporter.celery_app")
+    def test_worker_capacity_without_replies(self, mock_celery):
+        from workers.queue_exporter import _worker_capacity
+
+        inspect = mock_celery.control.inspect.return_value
+        inspect.active_queues.return_value = None
+        inspect.stats.return_value = None
+
+        assert _worker_capacity(["exports"]) == ({"exports": 0}, {"exports": 0})
+
+    def _collect(self, **overrides):
+        from workers import queue_exporter
+
+        now = 1_000_000.0
+        patches = {
+            "routed_queues": MagicMock(return_value=["exports", "image_processing_batch"]),
+            "_broker_depths": MagicMock(
+                return_value={"exports": 0, "image_processing_batch": 40}
+            ),
+            "_worker_capacity": MagicMock(return_value=(
+                {"exports": 1, "image_processing_batch": 2},
+                {"exports": 4, "image_processing_batch": 8},
+            )),
+            "service_stats": MagicMock(return_value={
+                "exports": ServiceStats(0, 0.0),
+                "image_processing_batch": ServiceStats(300, 600.0),
+            }),
+            "last_published": MagicMock(
+                return_value={"exports": now - 5, "image_processing_batch": now - 30}
+            ),
+            "held_batch_images": MagicMock(return_value=60),
+            **overrides,
+        }
+        with patch.multiple(queue_exporter, **patches), \
+                patch.object(queue_exporter.time, "time", return_value=now), \
+                patch.object(queue_exporter, "settings") as mock_settings:
+            mock_settings.queue_service_window_minutes = 5
+            mock_settings.queue_default_service_seconds = 4.0
+            mock_settings.queue_target_drain_seconds = 100
+            mock_settings.celery_worker_concurrency = 4
+            return {
+                family.name: {tuple(s.labels.values()): s.value for s in family.samples}
+                for family in queue_exporter.QueueCollector().collect()
+            }
+
+    def test_collect_reports_every_queue(self):
+        metrics = self._collect()
+
+        assert metrics["celery_queue_exporter_up"] == {(): 1}
+        assert metrics["celery_queue_length"] == {("exports",): 0, ("image_processing_batch",): 40}
+        # Held batch images count towards the batch lane only
+        assert metrics["celery_queue_backlog"][("image_processing_batch",)] == 100
+        assert metrics["celery_queue_backlog"][("exports",)] == 0
+        # An empty queue has no head message, however recent the last publish
+        assert metrics["celery_queue_oldest_message_age_seconds"] == {
+            ("exports",): 0.0, ("image_processing_batch",): 30.0,
+        }
+        assert metrics["celery_queue_mean_service_seconds"][("exports",)] == 4.0
+        assert metrics["celery_queue_worker_slots"][("image_processing_batch",)] == 8
+        # 100 tasks at 2s over 8 slots
+        assert metrics["celery_queue_drain_seconds"][("image_processing_batch",)] == 25.0
+        # 2 busy slots plus 100 * 2s / 100s = 4 slots, at 4 per worker
+        assert metrics["celery_queue_desired_workers"][("image_processing_batch",)] == 1
+
+    def test_collect_reports_down_when_the_broker_is_unreachable(self):
+        metrics = self._collect(_broker_depths=MagicMock(side_effect=ConnectionError("refused")))
+
+        assert metrics == {"celery_queue_exporter_up": {(): 0}}
@@ -0,0 +1,183 @@
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from shared.analytics import (
+    HISTOGRAM_SIZE,
+    LATENCY_BUCKET_BOUNDS_MS,
+    empty_histogram,
+    histogram_percentile,
+    merge_histograms,
+)
+from shared.org_stats import (
+    completed_analysis_deltas,
+    increment_org_stats,
+    merge_stats_rows,
+    set_org_stats,
+    stats_queries,
+)
+from workers.tasks.stats_tasks import _aggregate_daily, _aggregate_hourly
+
+
+def _row(**values):
+    return SimpleNamespace(_mapping=values)
+
+
+class TestOrgStatsStatements:
+    def test_increment_adds_to_existing_counters(self):
+        stmt = increment_org_stats(uuid.uuid4(), total_products=1, total_images=0)
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "ON CONFLICT (organization_id) DO UPDATE" in sql
+        assert "total_products = (organization_stats.total_products + excluded.total_products)" in sql
+        assert "total_images =" not in sql
+
+    def test_increment_rejects_unknown_column(self):
+        with pytest.raises(ValueError):
+            increment_org_stats(uuid.uuid4(), bogus=1)
+
+    def test_set_overwrites_counters(self):
+        stmt = set_org_stats(uuid.uuid4(), {"total_products": 4})
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "total_products = excluded.total_products" in sql
+        assert "reconciled_at = excluded.reconciled_at" in sql
+
+
+class TestStatsQueries:
+    def _sql(self, **scope):
+        return [
+            str(query.compile(dialect=postgresql.dialect())) for query in stats_queries(**scope)
+        ]
+
+    def test_analyses_and_defects_group_on_their_own_organization(self):
+        _, _, analyses, defects = self._sql(org_id=uuid.uuid4())
+
+        assert "GROUP BY analysis_results.organization_id" in analyses
+        assert "analysis_results.organization_id = %(organization_id_1)s" in analyses
+        assert "JOIN" not in analyses
+        assert "GROUP BY detected_defects.organization_id" in defects
+        assert "JOIN" not in defects
+
+    def test_product_scope_joins_up_to_the_image(self):
+        _, _, analyses, defects = self._sql(product_id=uuid.uuid4())
+
+        assert "JOIN product_images" in analyses
+        assert "product_images.product_id = %(product_id_1)s" in analyses
+        assert "JOIN analysis_results" in defects
+        assert "product_images.product_id = %(product_id_1)s" in defects
+
+    def test_unscoped_covers_every_organization(self):
+        assert all("WHERE" not in sql for sql in self._sql()[::3])
+
+
+class TestMergeStatsRows:
+    def test_merges_rows_and_zero_fills(self):
+        org_a, org_b = uuid.uuid4(), uuid.uuid4()
+        rows = [
+            _row(organization_id=org_a, total_products=3),
+            _row(organization_id=org_a, completed_analyses=2,
+                 processing_time_total_ms=300, processing_time_count=2),
+        ]
+
+        merged = merge_stats_rows(rows, [org_a, org_b])
+
+        assert merged[org_a]["total_products"] == 3
+        assert merged[org_a]["processing_time_total_ms"] == 300
+        assert merged[org_a]["total_defects"] == 0
+        assert all(value == 0 for value in merged[org_b].values())
+
+    def test_completed_analysis_deltas(self):
+        analysis = SimpleNamespace(processing_time_ms=150, reused_from_id=None)
+
+        assert completed_analysis_deltas(analysis) == {
+            "completed_analyses": 1,
+            "processing_time_total_ms": 150,
+            "processing_time_count": 1,
+        }
+        assert completed_analysis_deltas(
+            SimpleNamespace(processing_time_ms=None, reused_from_id=None), sign=-1
+        ) == {"completed_analyses": -1}
+
+    def test_reused_analysis_counted(self):
+        analysis = SimpleNamespace(processing_time_ms=12, reused_from_id=uuid.uuid4())
+
+        assert completed_analysis_deltas(analysis, sign=-1)["reused_analyses"] == -1
+
+
+class TestLatencyHistogram:
+    def _histogram_for(self, values_ms):
+        import bisect
+
+        histogram = empty_histogram()
+        for value in values_ms:
+            histogram[bisect.bisect_right(LATENCY_BUCKET_BOUNDS_MS, value)] += 1
+        return histogram
+
+    def test_percentiles_within_bucket_resolution(self):
+        values = list(range(100, 2100, 2))
+        histogram = self._histogram_for(values)
+
+        p50 = histogram_percentile(histogram, 0.50)
+        p99 = histogram_percentile(histogram, 0.99)
+
+        assert abs(p50 - 1100) / 1100 < 0.25
+        assert abs(p99 - 2080) / 2080 < 0.25
+        assert p50 < histogram_percentile(histogram, 0.95) <= p99
+
+    def test_empty_histogram_has_no_percentile(self):
+        assert histogram_percentile(empty_histogram(), 0.5) is None
+
+    def test_merge_is_elementwise(self):
+        a, b = empty_histogram(), empty_histogram()
+        a[3], b[3], b[10] = 2, 5, 1
+
+        merged = merge_histograms([a, None, b])
+
+        assert len(merged) == HISTOGRAM_SIZE
+        assert merged[3] == 7 and merged[10] == 1
+
+
+class TestDailyRollup:
+    def test_hours_fold_into_utc_day(self):
+        org_id = uuid.uuid4()
+        hist = empty_histogram()
+        hist[5] = 1
+
+        def hour(h, processed):
+            return SimpleNamespace(
+                organization_id=org_id,
+                bucket_start=datetime(2026, 6, 1, h, tzinfo=UTC),
+                category="shoes",
+                images_processed=processed,
+                images_failed=0,
+                images_with_defects=1,
+                defect_count=2,
+                fallback_descriptions=0,
+                processing_time_total_ms=100 * processed,
+                latency_histogram=hist,
+            )
+
+        daily = _aggregate_daily([hour(1, 3), hour(23, 2)])
+
+        values = daily[(org_id, datetime(2026, 6, 1, tzinfo=UTC), "shoes")]
+        assert values["images_processed"] == 5
+        assert values["defect_count"] == 4
+        assert values["latency_histogram"][5] == 2
+
+
+class TestHourlyRollup:
+    def test_buckets_by_completion_time(self):
+        session = MagicMock()
+        session.execute.return_value.all.return_value = []
+
+        _aggregate_hourly(session, datetime(2026, 6, 1, tzinfo=UTC), datetime(2026, 6, 2, tzinfo=UTC))
+
+        sql = str(session.execute.call_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert "analysis_results.completed_at) AS bucket_start" in sql
+        assert "analysis_results.completed_at >= %(completed_at_1)s" in sql
+        assert "updated_at" not in sql
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+from sqlalchemy import create_engine
+
+from shared.tracing import TracedSession, trace_aws_calls, tracer
+from workers.celery_app import _end_task_span, _stamp_published_at, _start_task_span
+
+_exporter = InMemorySpanExporter()
+_provider = TracerProvider()
+_provider.add_span_processor(SimpleSpanProcessor(_exporter))
+trace.set_tracer_provider(_provider)
+
+
+@pytest.fixture
+def spans():
+    _exporter.clear()
+    yield lambda: {span.name: span for span in _exporter.get_finished_spans()}
+    _exporter.clear()
+
+
+class TestTracing:
+    def test_task_continues_the_publishers_trace(self, spans):
+        headers = {}
+        with tracer.start_as_current_span("upload.confirm"):
+            _stamp_published_at(headers=headers)
+
+        request = SimpleNamespace(
+            traceparent=headers["traceparent"], published_at=headers["published_at"], retries=0
+        )
+        task = SimpleNamespace(name="process_image", request=request)
+        _start_task_span(task_id="t1", task=task)
+        with tracer.start_as_current_span("stage.classify"):
+            pass
+        _end_task_span(task_id="t1", state="SUCCESS")
+
+        finished = spans()
+        upload, task_span = finished["upload.confirm"], finished["process_image"]
+        assert task_span.context.trace_id == upload.context.trace_id
+        assert task_span.parent.span_id == upload.context.span_id
+        assert finished["stage.classify"].parent.span_id == task_span.context.span_id
+        assert task_span.attributes["celery.queue_wait_seconds"] >= 0
+
+    def test_aws_calls_are_client_spans(self, spans):
+        s3 = trace_aws_calls(boto3.client(
+            "s3", region_name="us-east-1",
+            aws_access_key_id="test", aws_secret_access_key="test",
+        ))
+        with Stubber(s3) as stub:
+            stub.add_response("head_object", {}, {"Bucket": "images", "Key": "a.jpg"})
+            stub.add_client_error("head_object", http_status_code=404)
+            s3.head_object(Bucket="images", Key="a.jpg")
+            with pytest.raises(s3.exceptions.ClientError):
+                s3.head_object(Bucket="images", Key="b.jpg")
+
+        calls = [span for span in _exporter.get_finished_spans() if span.name == "s3.HeadObject"]
+        assert [span.attributes["aws.s3.key"] for span in calls] == ["a.jpg", "b.jpg"]
+        assert calls[0].status.status_code == StatusCode.UNSET
+        assert calls[1].status.status_code == StatusCode.ERROR
+
+    def test_session_commits_are_spans(self, spans):
+        with TracedSession(bind=create_engine("sqlite://")) as session:
+            session.commit()
+
+        assert spans()["db.commit"].attributes["db.system"] == "postgresql"
@@ -0,0 +1,16 @@
+import time
+
+from shared.admission import lane_completions_key
+from shared.config import get_settings
+from workers.celery_app import get_redis
+
+settings = get_settings()
+
+
+def record_lane_completion(lane: str) -> None:
+    """Count a finished image task towards its lane's drain rate, read by API admission control."""
+    key = lane_completions_key(lane, int(time.time() // 60))
+    pipe = get_redis().pipeline()
+    pipe.incr(key)
+    pipe.expire(key, (settings.admission_rate_window_minutes + 2) * 60)
+    pipe.execute()
@@ -0,0 +1,225 @@
+"""
+Weighted fair queueing of batch image tasks across organizations.
+
+Batch images are not published to the broker when a batch is submitted.
+They wait in one Redis list per organization. The refill step moves them onto
+the batch-lane queue a few at a time, keeping at most
+``batch_lane_queue_depth`` messages ready there. Interactive uploads therefore
+never queue behind a large batch, and a newly submitted batch competes for
+slots from its first image.
+
+The next organization is picked by virtual finish time. Every task an
+organization dispatches advances its tag by ``1 / weight``, with the weight
+taken from its plan. Organizations with queued work share the lane in
+proportion to their weights. An organization that was idle starts at the
+current virtual time, so it gets no credit for the time it had nothing queued.
+Organizations already running as many tasks as their plan allows are passed
+over until a slot frees up (see ``shared.org_concurrency``).
+
+Popping an image and publishing its task are separate steps. Images whose
+task cannot be published are pushed back to the front of their
+organization's list, so a broker outage delays them instead of losing them.
+"""
+import json
+import logging
+import time
+
+from shared.config import get_settings
+from shared.constants import PLAN_SCHEDULING_WEIGHTS, ProcessingLane
+from shared.job_cancellation import image_task_id, job_cancel_key
+from shared.org_concurrency import batch_lane_queue_key, concurrency_limit, org_slots_key
+from workers.celery_app import celery_app, get_redis, ready_depth
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ORGS_KEY = "batch_lane:orgs"
+VTIME_KEY = "batch_lane:vtime"
+WEIGHTS_KEY = "batch_lane:weights"
+LIMITS_KEY = "batch_lane:limits"
+REFILL_LOCK_KEY = "batch_lane:refill_lock"
+ORG_QUEUE_PREFIX = batch_lane_queue_key("")
+ORG_SLOTS_PREFIX = org_slots_key("")
+
+PROCESS_IMAGE_TASK = "workers.tasks.image_processing.process_image"
+
+# Items pushed per script call when enqueueing a large batch
+ENQUEUE_CHUNK_SIZE = 1000
+
+ENQUEUE_LUA_SCRIPT = """
+local org, weight, key = ARGV[1], tonumber(ARGV[2]), ARGV[3] .. ARGV[1]
+redis.call('HSET', KEYS[3], org, weight)
+redis.call('HSET', KEYS[4], org, ARGV[4])
+for i = 6, #ARGV do
+    redis.call(ARGV[5], key, ARGV[i])
+end
+if not redis.call('ZSCORE', KEYS[1], org) then
+    local vtime = tonumber(redis.call('GET', KEYS[2]) or '0')
+    redis.call('ZADD', KEYS[1], vtime + 1 / weight, org)
+end
+return redis.call('LLEN', key)
+"""
+
+POP_LUA_SCRIPT = """
+local items, taken = {}, {}
+local now = tonumber(ARGV[3])
+for i = 1, tonumber(ARGV[1]) do
+    -- First organization in virtual-time order that still has a free slot
+    local org, tag
+    local queued = redis.call('ZRANGE', KEYS[1], 0, -1, 'WITHSCORES')
+    for j = 1, #queued, 2 do
+        local limit = tonumber(redis.call('HGET', KEYS[4], queued[j]) or '1')
+        local in_use = redis.call('ZCOUNT', ARGV[4] .. queued[j], now, '+inf')
+        if in_use + (taken[queued[j]] or 0) < limit then
+            org, tag = queued[j], tonumber(queued[j + 1])
+            break
+        end
+    end
+    if not org then
+        break
+    end
+    taken[org] = (taken[org] or 0) + 1
+    local key = ARGV[2] .. org
+    local item = redis.call('LPOP', key)
+    if tag > tonumber(redis.call('GET', KEYS[2]) or '0') then
+        redis.call('SET', KEYS[2], tag)
+    end
+    if item then
+        table.insert(items, org)
+        table.insert(items, item)
+    end
+    if redis.call('LLEN', key) > 0 then
+        local weight = tonumber(redis.call('HGET', KEYS[3], org) or '1')
+        redis.call('ZADD', KEYS[1], tag + 1 / weight, org)
+    else
+        redis.call('ZREM', KEYS[1], org)
+    end
+end
+return items
+"""
+
+
+def plan_weight(plan: str | None) -> int:
+    return PLAN_SCHEDULING_WEIGHTS.get(plan or "", 1)
+
+
+def _enqueue(r, org_id: str, weight, limit, items: list[str], command: str) -> None:
+    enqueue = r.register_script(ENQUEUE_LUA_SCRIPT)
+    enqueue(
+        keys=[ORGS_KEY, VTIME_KEY, WEIGHTS_KEY, LIMITS_KEY],
+        args=[org_id, weight, ORG_QUEUE_PREFIX, limit, command, *items],
+    )
+
+
+def _push(org_id: str, plan: str | None, items: list[str], command: str) -> None:
+    _enqueue(get_redis(), org_id, plan_weight(plan), concurrency_limit(plan), items, command)
+
+
+def _return_unsent(r, popped: list[tuple[str, str]]) -> None:
+    """Push popped ``(org_id, item)`` pairs back to the front of their lists, in order."""
+    by_org: dict[str, list[str]] = {}
+    for org_id, item in popped:
+        by_org.setdefault(org_id, []).append(item)
+    for org_id, items in by_org.items():
+        weight = r.hget(WEIGHTS_KEY, org_id) or 1
+        limit = r.hget(LIMITS_KEY, org_id) or 1
+        _enqueue(r, org_id, weight, limit, items[::-1], "LPUSH")
+
+
+def enqueue_batch_images(
+    org_id: str, plan: str | None, job_id: str, image_ids: list[str], force_recompute: bool
+) -> None:
+    """Queue a batch's images behind the organization's earlier batch work."""
+    for start in range(0, len(image_ids), ENQUEUE_CHUNK_SIZE):
+        items = [
+            json.dumps(
+                {"job_id": job_id, "image_id": image_id, "force_recompute": force_recompute}
+            )
+            for image_id in image_ids[start:start + ENQUEUE_CHUNK_SIZE]
+        ]
+        _push(org_id, plan, items, "RPUSH")
+
+
+def requeue_batch_image(
+    org_id: str, plan: str | None, job_id: str, image_id: str, force_recompute: bool
+) -> None:
+    """Put a batch image that could not get a slot back at the front of its organization's list."""
+    item = json.dumps({"job_id": job_id, "image_id": image_id, "force_recompute": force_recompute})
+    _push(org_id, plan, [item], "LPUSH")
+
+
+def queued_batch_images(org_id: str) -> int:
+    return get_redis().llen(batch_lane_queue_key(org_id))
+
+
+def held_batch_images() -> int:
+    """Batch images waiting in the per-organization lists, not yet published to the broker."""
+    r = get_redis()
+    orgs = r.zrange(ORGS_KEY, 0, -1)
+    if not orgs:
+        return 0
+    pipe = r.pipeline()
+    for org_id in orgs:
+        pipe.llen(batch_lane_queue_key(org_id))
+    return sum(pipe.execute())
+
+
+def refill_batch_lane() -> int:
+    """
+    Top the batch-lane queue back up to ``batch_lane_queue_depth``, fairly across organizations.
+
+    Runs after every image task and on a short beat schedule. Only one caller
+    refills at a time; the others return immediately. Returns the number of
+    tasks dispatched.
+    """
+    r = get_redis()
+    if not r.zcard(ORGS_KEY):
+        return 0
+    if not r.set(REFILL_LOCK_KEY, "1", nx=True, px=settings.batch_lane_refill_lock_ms):
+        return 0
+
+    dispatched = 0
+    try:
+        pop = r.register_script(POP_LUA_SCRIPT)
+        wanted = settings.batch_lane_queue_depth - ready_depth(ProcessingLane.BATCH.value)
+        while wanted > 0:
+            # Flat [org, item, org, item, ...] reply
+            reply = pop(
+                keys=[ORGS_KEY, VTIME_KEY, WEIGHTS_KEY, LIMITS_KEY],
+                args=[wanted, ORG_QUEUE_PREFIX, time.time(), ORG_SLOTS_PREFIX],
+            )
+            if not reply:
+                break
+            popped = list(zip(reply[::2], reply[1::2]))
+            items = [json.loads(item) for _, item in popped]
+
+            index = 0
+            try:
+                # Images of cancelled jobs are dropped here instead of being dispatched
+                job_ids = sorted({item["job_id"] for item in items})
+                pipe = r.pipeline()
+                for job_id in job_ids:
+                    pipe.exists(job_cancel_key(job_id))
+                cancelled = {job_id for job_id, hit in zip(job_ids, pipe.execute()) if hit}
+
+                for index, item in enumerate(items):
+                    if item["job_id"] in cancelled:
+                        continue
+                    celery_app.send_task(
+                        PROCESS_IMAGE_TASK,
+                        args=[item["image_id"], item["job_id"]],
+                        kwargs={"force_recompute": item["force_recompute"]},
+                        task_id=image_task_id(item["job_id"], item["image_id"]),
+                        queue=ProcessingLane.BATCH.value,
+                    )
+                    dispatched += 1
+                    wanted -= 1
+            except Exception:
+                _return_unsent(r, popped[index:])
+                raise
+    finally:
+        r.delete(REFILL_LOCK_KEY)
+
+    if dispatched:
+        logger.debug(f"Dispatched {dispatched} batch-lane tasks")
+    return dispatched
@@ -0,0 +1,12 @@
+from shared.exceptions import JobCancelledError
+from shared.job_cancellation import job_cancel_key
+from workers.celery_app import get_redis
+
+
+def is_job_cancelled(job_id: str) -> bool:
+    return bool(get_redis().exists(job_cancel_key(job_id)))
+
+
+def raise_if_cancelled(job_id: str) -> None:
+    if is_job_cancelled(job_id):
+        raise JobCancelledError(job_id)
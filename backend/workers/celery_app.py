@@ -1,11 +1,34 @@
+import os
+import time
 from contextlib import contextmanager
 
+import redis
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import sessionmaker
 
 from shared.config import get_settings
+from shared.metrics import clear_multiproc_dir, mark_process_dead, serve_metrics
+from shared.tracing import (
+    TracedSession,
+    configure_tracing,
+    extract_context,
+    inject_context,
+    shutdown_tracing,
+    tracer,
+)
 
 settings = get_settings()
 
@@ -30,13 +53,19 @@ celery_app.conf.update(
     task_routes={
         "workers.tasks.image_processing.*": {"queue": "image_processing"},
         "workers.tasks.classification.*": {"queue": "image_processing"},
+        "workers.tasks.feature_extraction.embed_query_image": {"queue": "search"},
         "workers.tasks.feature_extraction.*": {"queue": "image_processing"},
         "workers.tasks.defect_detection.*": {"queue": "image_processing"},
         "workers.tasks.description_gen.*": {"queue": "description_generation"},
-        "workers.tasks.batch_processing.*": {"queue": "image_processing"},
+        # Beat-driven schedulers run with the other periodic tasks, not behind batch work
+        "workers.tasks.batch_processing.refill_batch_lane_task": {"queue": "maintenance"},
+        "workers.tasks.batch_processing.release_deferred_batches": {"queue": "maintenance"},
+        "workers.tasks.batch_processing.*": {"queue": "image_processing_batch"},
+        "workers.tasks.backfill.*": {"queue": "image_processing_backfill"},
         "workers.tasks.notifications.*": {"queue": "notifications"},
         "workers.tasks.webhook_delivery.*": {"queue": "webhooks"},
         "workers.tasks.export_tasks.*": {"queue": "exports"},
+        "workers.tasks.stats_tasks.*": {"queue": "maintenance"},
     },
     # Task defaults
     task_default_queue="image_processing",
@@ -52,9 +81,12 @@ celery_app.conf.update(
         "workers.tasks.defect_detection",
         "workers.tasks.description_gen",
         "workers.tasks.batch_processing",
+        "workers.tasks.backfill",
         "workers.tasks.notifications",
         "workers.tasks.webhook_delivery",
         "workers.tasks.export_tasks",
+        "workers.tasks.stats_tasks",
+        "workers.queue_stats",
     ],
     # Beat schedule
     beat_schedule={
@@ -62,6 +94,22 @@ celery_app.conf.update(
             "task": "workers.tasks.export_tasks.cleanup_expired_exports",
             "schedule": crontab(hour=3, minute=0),
         },
+        "reconcile-org-stats": {
+            "task": "workers.tasks.stats_tasks.reconcile_org_stats",
+            "schedule": crontab(minute="*/15"),
+        },
+        "rollup-analytics": {
+            "task": "workers.tasks.stats_tasks.rollup_analytics",
+            "schedule": crontab(minute="*/5"),
+        },
+        "refill-batch-lane": {
+            "task": "workers.tasks.batch_processing.refill_batch_lane_task",
+            "schedule": 10.0,
+        },
+        "release-deferred-batches": {
+            "task": "workers.tasks.batch_processing.release_deferred_batches",
+            "schedule": 60.0,
+        },
     },
 )
 
@@ -82,9 +130,89 @@ def get_sync_session():
     """Context manager that yields a synchronous SQLAlchemy session for Celery tasks."""
     global _SyncSessionFactory
     if _SyncSessionFactory is None:
-        _SyncSessionFactory = sessionmaker(bind=_get_sync_engine())
+        _SyncSessionFactory = sessionmaker(bind=_get_sync_engine(), class_=TracedSession)
     session = _SyncSessionFactory()
     try:
         yield session
     finally:
         session.close()
+
+
+_redis = None
+
+
+def get_redis() -> redis.Redis:
+    """Pooled Redis client shared by the tasks of a worker process."""
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis
+
+
+def ready_depth(queue_name: str) -> int:
+    """Messages waiting on a broker queue; tasks already delivered to a worker are not counted."""
+    queue = celery_app.amqp.queues[queue_name]
+    with celery_app.connection_for_write() as conn:
+        return queue(conn.default_channel).queue_declare().message_count
+
+
+@before_task_publish.connect
+def _stamp_published_at(headers=None, **kwargs):
+    # Read back when the task starts, to report how long each queue's head has waited
+    if headers is not None:
+        headers["published_at"] = time.time()
+        # Continued by the worker, so the task's spans join the publisher's trace
+        inject_context(headers)
+
+
+@worker_init.connect
+def _serve_worker_metrics(**kwargs):
+    # Started before the pool forks; aggregates the pool processes in multiprocess mode
+    clear_multiproc_dir()
+    serve_metrics(settings.worker_metrics_port)
+
+
+@worker_process_init.connect
+def _configure_worker_tracing(**kwargs):
+    # After the fork: the span processor's export thread does not survive it
+    configure_tracing("worker")
+
+
+@worker_process_shutdown.connect
+def _drop_worker_process_metrics(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
+
+
+@worker_process_shutdown.connect
+def _flush_worker_traces(**kwargs):
+    shutdown_tracing()
+
+
+# task id -> (span, context token) of the tasks running in this process
+_task_spans: dict[str, tuple] = {}
+
+
+@task_prerun.connect
+def _start_task_span(task_id=None, task=None, **kwargs):
+    attributes = {"celery.task_id": task_id, "celery.retries": task.request.retries}
+    published_at = getattr(task.request, "published_at", None)
+    if published_at:
+        attributes["celery.queue_wait_seconds"] = max(0.0, time.time() - published_at)
+    span = tracer.start_span(
+        task.name, context=extract_context(task.request), kind=SpanKind.CONSUMER,
+        attributes=attributes,
+    )
+    _task_spans[task_id] = (span, otel_context.attach(trace.set_span_in_context(span)))
+
+
+@task_postrun.connect
+def _end_task_span(task_id=None, state=None, **kwargs):
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    span, token = entry
+    otel_context.detach(token)
+    span.set_attribute("celery.state", state or "")
+    if state == "FAILURE":
+        span.set_status(Status(StatusCode.ERROR))
+    span.end()
@@ -0,0 +1,68 @@
+"""
+Release policy for deferrable batches.
+
+A deferred batch is held in the database until the processing lanes are
+idle, or until waiting any longer would put its deadline at risk. The
+release time works backwards from the deadline. The batch needs roughly
+``images / capacity`` seconds at the fleet's baseline throughput, plus a
+safety margin.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from shared.config import get_settings
+from shared.constants import ProcessingLane
+from workers.batch_lane import held_batch_images
+from workers.celery_app import ready_depth
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class DeferredBatch:
+    job_id: str
+    deadline: datetime
+    images: int
+
+
+def release_by(batch: DeferredBatch) -> datetime:
+    """Latest time ``batch`` can be released and still be expected to finish by its deadline."""
+    rate = settings.image_processing_worker_slots / settings.admission_baseline_task_seconds
+    return batch.deadline - timedelta(
+        seconds=batch.images / rate, minutes=settings.deferred_release_margin_minutes
+    )
+
+
+def select_releases(
+    batches: list[DeferredBatch], now: datetime, idle: bool, max_images: int
+) -> list[str]:
+    """
+    IDs of the jobs to release now, from ``batches`` ordered by deadline.
+
+    Batches that are due are always released. While the lanes are idle, the
+    earliest deadlines after them are also released, up to ``max_images``
+    images. At least one batch is released even if it is larger than that.
+    """
+    released = [batch.job_id for batch in batches if release_by(batch) <= now]
+    if not idle:
+        return released
+
+    budget = max_images
+    for batch in batches:
+        if batch.job_id in released:
+            continue
+        if batch.images > budget and released:
+            break
+        released.append(batch.job_id)
+        budget -= batch.images
+    return released
+
+
+def lanes_idle() -> bool:
+    """Whether the interactive and batch lanes have next to nothing waiting."""
+    backlog = (
+        ready_depth(ProcessingLane.INTERACTIVE.value)
+        + ready_depth(ProcessingLane.BATCH.value)
+        + held_batch_images()
+    )
+    return backlog <= settings.deferred_release_idle_backlog
@@ -0,0 +1,36 @@
+import time
+
+from shared.config import get_settings
+from shared.org_concurrency import (
+    ACQUIRE_LUA_SCRIPT,
+    concurrency_limit,
+    org_deferred_key,
+    org_slots_key,
+)
+from workers.celery_app import get_redis
+
+settings = get_settings()
+
+
+def acquire_org_slot(org_id: str, plan: str | None, lease_id: str) -> bool:
+    """Take one of the organization's slots; re-acquiring a held lease renews it."""
+    r = get_redis()
+    acquire = r.register_script(ACQUIRE_LUA_SCRIPT)
+    return bool(acquire(
+        keys=[org_slots_key(org_id), org_deferred_key(org_id)],
+        args=[time.time(), concurrency_limit(plan), lease_id, settings.org_slot_lease_seconds],
+    ))
+
+
+def release_org_slot(org_id: str, lease_id: str) -> None:
+    get_redis().zrem(org_slots_key(org_id), lease_id)
+
+
+def mark_deferred(org_id: str, lease_id: str) -> None:
+    """Count a deferred interactive task as waiting until it runs or its entry expires."""
+    r = get_redis()
+    key = org_deferred_key(org_id)
+    pipe = r.pipeline()
+    pipe.zadd(key, {lease_id: time.time() + settings.org_slot_lease_seconds})
+    pipe.expire(key, settings.org_slot_lease_seconds)
+    pipe.execute()
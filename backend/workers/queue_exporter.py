@@ -0,0 +1,153 @@
+"""
+Prometheus exporter for the Celery queues.
+
+Run one instance per cluster with ``python -m workers.queue_exporter``. On
+each scrape, it does three things for every queue in ``task_routes``:
+
+- reads the queue's depth from the broker;
+- asks the workers which queues they consume, and with how many pool slots;
+- reads the service times the workers record (``workers.queue_stats``).
+
+``celery_queue_desired_workers`` is the autoscaling signal. It is the
+number of workers that would keep up with the current load and clear the
+backlog within ``QUEUE_TARGET_DRAIN_SECONDS``.
+"""
+import logging
+import time
+
+from prometheus_client import start_http_server
+from prometheus_client.core import REGISTRY, GaugeMetricFamily
+
+from shared.config import get_settings
+from shared.constants import ProcessingLane
+from workers.batch_lane import held_batch_images
+from workers.celery_app import celery_app
+from workers.queue_stats import (
+    desired_workers,
+    drain_seconds,
+    last_published,
+    service_stats,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def routed_queues() -> list[str]:
+    routes = celery_app.conf.task_routes or {}
+    queues = {route["queue"] for route in routes.values()}
+    return sorted(queues | {celery_app.conf.task_default_queue})
+
+
+def _broker_depths(queues: list[str]) -> dict[str, int]:
+    depths = {}
+    with celery_app.connection_for_read() as conn:
+        for name in queues:
+            try:
+                with conn.channel() as channel:
+                    depths[name] = channel.queue_declare(queue=name, passive=True).message_count
+            except conn.channel_errors:
+                # Not declared yet: no worker has consumed from it and nothing was published
+                depths[name] = 0
+    return depths
+
+
+def _worker_capacity(queues: list[str]) -> tuple[dict[str, int], dict[str, int]]:
+    """Workers consuming each queue, and the pool slots those workers have between them."""
+    inspect = celery_app.control.inspect(timeout=settings.queue_exporter_inspect_timeout)
+    active_queues = inspect.active_queues() or {}
+    stats = inspect.stats() or {}
+
+    consumers = dict.fromkeys(queues, 0)
+    slots = dict.fromkeys(queues, 0)
+    for worker, worker_queues in active_queues.items():
+        pool_size = (stats.get(worker) or {}).get("pool", {}).get("max-concurrency", 0)
+        for queue in worker_queues:
+            if queue["name"] in consumers:
+                consumers[queue["name"]] += 1
+                slots[queue["name"]] += pool_size
+    return consumers, slots
+
+
+def _gauge(name: str, documentation: str) -> GaugeMetricFamily:
+    return GaugeMetricFamily(name, documentation, labels=["queue"])
+
+
+class QueueCollector:
+    def collect(self):
+        up = GaugeMetricFamily(
+            "celery_queue_exporter_up", "Whether the last read of the broker and Redis succeeded"
+        )
+        queues = routed_queues()
+        try:
+            depths = _broker_depths(queues)
+            consumers, slots = _worker_capacity(queues)
+            stats = service_stats(queues)
+            published = last_published(queues)
+            held = held_batch_images()
+        except Exception:
+            logger.exception("Could not read queue state")
+            up.add_metric([], 0)
+            yield up
+            return
+        up.add_metric([], 1)
+        yield up
+
+        length = _gauge("celery_queue_length", "Messages ready on the broker queue")
+        backlog_gauge = _gauge(
+            "celery_queue_backlog",
+            "Tasks waiting for the queue, including batch images held back by the batch lane",
+        )
+        age = _gauge(
+            "celery_queue_oldest_message_age_seconds",
+            "Upper bound on the wait of the message at the head of the queue",
+        )
+        consumer_gauge = _gauge("celery_queue_consumers", "Workers consuming from the queue")
+        slot_gauge = _gauge("celery_queue_worker_slots", "Pool slots of the workers consuming it")
+        service = _gauge(
+            "celery_queue_mean_service_seconds", "Mean run time of the queue's recent tasks"
+        )
+        drain = _gauge(
+            "celery_queue_drain_seconds",
+            "Estimated time for the current workers to clear the backlog",
+        )
+        desired = _gauge("celery_queue_desired_workers", "Workers needed to keep up with the queue")
+
+        now = time.time()
+        window_seconds = settings.queue_service_window_minutes * 60
+        for queue in queues:
+            backlog = depths[queue] + (held if queue == ProcessingLane.BATCH.value else 0)
+            mean_service = stats[queue].mean_service_seconds(settings.queue_default_service_seconds)
+            head_age = 0.0
+            if depths[queue] and published[queue]:
+                head_age = max(0.0, now - published[queue])
+
+            length.add_metric([queue], depths[queue])
+            backlog_gauge.add_metric([queue], backlog)
+            age.add_metric([queue], head_age)
+            consumer_gauge.add_metric([queue], consumers[queue])
+            slot_gauge.add_metric([queue], slots[queue])
+            service.add_metric([queue], mean_service)
+            drain.add_metric([queue], drain_seconds(backlog, mean_service, slots[queue]))
+            desired.add_metric([queue], desired_workers(
+                backlog,
+                mean_service,
+                stats[queue].busy_slots(window_seconds),
+                settings.queue_target_drain_seconds,
+                settings.celery_worker_concurrency,
+            ))
+
+        yield from (length, backlog_gauge, age, consumer_gauge, slot_gauge, service, drain, desired)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    REGISTRY.register(QueueCollector())
+    start_http_server(settings.queue_exporter_port)
+    logger.info(f"Serving queue metrics on :{settings.queue_exporter_port}/metrics")
+    while True:
+        time.sleep(60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Per-queue service statistics recorded by the workers.
+
+Each task's run time is added to a per-minute Redis hash for the queue it
+was consumed from. When a task starts, its publish time is recorded too.
+While the queue is not empty, the message at its head cannot be older than
+that. The queue exporter (``workers.queue_exporter``) reads both.
+"""
+import math
+import time
+from dataclasses import dataclass
+
+from celery.signals import task_postrun, task_prerun
+
+from shared.config import get_settings
+from workers.celery_app import celery_app, get_redis
+
+settings = get_settings()
+
+# task id -> monotonic start time, for the tasks running in this process
+_started: dict[str, float] = {}
+
+
+def service_key(queue: str, minute: int) -> str:
+    """Count and total run time of the tasks from ``queue`` finished in the epoch minute."""
+    return f"queue_service:{queue}:{minute}"
+
+
+def last_published_key(queue: str) -> str:
+    return f"queue_last_published:{queue}"
+
+
+def task_queue(task) -> str:
+    """Name of the queue the running task was consumed from."""
+    routing_key = (task.request.delivery_info or {}).get("routing_key")
+    # The default queue is bound under the default routing key, not its own name
+    for queue in celery_app.amqp.queues.values():
+        if queue.routing_key == routing_key:
+            return queue.name
+    return routing_key or celery_app.conf.task_default_queue
+
+
+@dataclass(frozen=True)
+class ServiceStats:
+    completed: int
+    busy_seconds: float
+
+    def mean_service_seconds(self, default: float) -> float:
+        return self.busy_seconds / self.completed if self.completed else default
+
+    def busy_slots(self, window_seconds: float) -> float:
+        """Average number of worker slots kept busy by the queue over the window."""
+        return self.busy_seconds / window_seconds
+
+
+def drain_seconds(backlog: int, mean_service: float, slots: int) -> float:
+    """Time for ``slots`` worker slots to work through ``backlog`` tasks."""
+    if backlog == 0:
+        return 0.0
+    if slots == 0:
+        return math.inf
+    return backlog * mean_service / slots
+
+
+def desired_workers(
+    backlog: int, mean_service: float, busy_slots: float, target_drain: float, concurrency: int
+) -> int:
+    """
+    Workers needed to keep up with the current load and clear ``backlog`` within ``target_drain``.
+
+    This is the scaling signal: the slots already kept busy, plus the slots
+    that would drain the backlog in time, divided by the pool size of one worker.
+    """
+    slots = busy_slots + backlog * mean_service / target_drain
+    return math.ceil(slots / concurrency)
+
+
+def service_stats(queues: list[str]) -> dict[str, ServiceStats]:
+    """Tasks finished and time spent per queue over the last ``queue_service_window_minutes``."""
+    window = settings.queue_service_window_minutes
+    minute = int(time.time() // 60)
+    pipe = get_redis().pipeline()
+    for queue in queues:
+        # Only whole minutes; the current one is still filling up
+        for i in range(1, window + 1):
+            pipe.hmget(service_key(queue, minute - i), "count", "seconds")
+    rows = iter(pipe.execute())
+
+    stats = {}
+    for queue in queues:
+        buckets = [next(rows) for _ in range(window)]
+        stats[queue] = ServiceStats(
+            sum(int(count) for count, _ in buckets if count),
+            sum(float(seconds) for _, seconds in buckets if seconds),
+        )
+    return stats
+
+
+def last_published(queues: list[str]) -> dict[str, float | None]:
+    """Publish time of the task most recently started from each queue."""
+    values = get_redis().mget([last_published_key(queue) for queue in queues])
+    return {queue: float(value) if value else None for queue, value in zip(queues, values)}
+
+
+@task_prerun.connect
+def _task_started(task_id=None, task=None, **kwargs):
+    _started[task_id] = time.monotonic()
+    published_at = getattr(task.request, "published_at", None)
+    if published_at:
+        get_redis().set(last_published_key(task_queue(task)), published_at)
+
+
+@task_postrun.connect
+def _task_finished(task_id=None, task=None, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is None:
+        return
+    key = service_key(task_queue(task), int(time.time() // 60))
+    pipe = get_redis().pipeline()
+    pipe.hincrby(key, "count", 1)
+    pipe.hincrbyfloat(key, "seconds", time.monotonic() - started)
+    pipe.expire(key, (settings.queue_service_window_minutes + 2) * 60)
+    pipe.execute()
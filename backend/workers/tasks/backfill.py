@@ -0,0 +1,281 @@
+import logging
+from datetime import UTC, datetime
+
+from celery import shared_task
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from shared.backfill import backfill_conditions, backfill_lane_count, lane_bounds
+from shared.config import get_settings
+from shared.constants import BackfillModelType, JobStatus
+from shared.models.analysis import AnalysisResult, ExtractedAttribute
+from shared.models.pipeline import ProcessingJob
+from shared.models.product import Product, ProductImage
+from shared.product_facets import refresh_product_facets
+from workers.celery_app import get_sync_session
+from workers.tasks.notifications import publish_job_complete
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@shared_task(bind=True, max_retries=1, acks_late=True)
+def start_backfill(self, job_id: str):
+    """Split a backfill job into lanes and start the first chunk of each."""
+    lanes = lane_bounds(backfill_lane_count())
+
+    with get_sync_session() as session:
+        job = session.execute(
+            select(ProcessingJob).where(ProcessingJob.id == job_id)
+        ).scalar_one()
+        job.status = JobStatus.PROCESSING.value
+        job.started_at = datetime.now(UTC)
+        job.metadata_ = {**(job.metadata_ or {}), "lanes": len(lanes), "lanes_done": []}
+        session.commit()
+
+    for lane, (lower, upper) in enumerate(lanes):
+        backfill_chunk.delay(job_id, lane, lower, upper)
+
+    logger.info(f"Started backfill job={job_id} with {len(lanes)} lanes")
+
+
+def _load_features(
+    session: Session,
+    rows: list[tuple[AnalysisResult, ProductImage]],
+    feature_versions: dict,
+) -> tuple[dict, dict, set]:
+    """
+    Backbone features for each analysis, plus pixel attributes where images had to be read.
+
+    Stored embeddings are used as-is. Images without one are downloaded and
+    run through the backbone in batches of ``backfill_inference_batch_size``,
+    and the new embeddings are stored for next time.
+    """
+    import torch
+
+    from ml.models.feature_extractor import extract_color
+    from ml.services.inference import run_feature_extraction
+    from ml.services.preprocessing import download_and_preprocess
+    from shared.image_embeddings import load_image_embeddings, upsert_image_embedding
+
+    features, colors, failed = {}, {}, set()
+    missing = []
+    for version in set(feature_versions.values()):
+        stored = load_image_embeddings(
+            session,
+            [image.id for analysis, image in rows if feature_versions[analysis.id] == version],
+            version,
+        )
+        for analysis, image in rows:
+            if feature_versions[analysis.id] != version:
+                continue
+            if image.id in stored:
+                features[analysis.id] = stored[image.id]
+            else:
+                missing.append((analysis, image))
+
+    batch_size = settings.backfill_inference_batch_size
+    for start in range(0, len(missing), batch_size):
+        tensors, loaded = [], []
+        for analysis, image in missing[start:start + batch_size]:
+            try:
+                tensors.append(download_and_preprocess(image.s3_bucket, image.s3_key))
+                loaded.append((analysis, image))
+            except Exception as exc:
+                logger.warning(f"Backfill skipping image={image.id}: {exc}")
+                failed.add(analysis.id)
+        if not tensors:
+            continue
+
+        for version in {feature_versions[analysis.id] for analysis, _ in loaded}:
+            indices = [i for i, (a, _) in enumerate(loaded) if feature_versions[a.id] == version]
+            batch = torch.cat([tensors[i] for i in indices])
+            vectors = run_feature_extraction(batch, version=version).reshape(len(indices), -1)
+            for i, vector in zip(indices, vectors):
+                analysis, image = loaded[i]
+                features[analysis.id] = vector
+                colors[analysis.id] = extract_color(tensors[i])
+                session.execute(upsert_image_embedding(
+                    image.id, image.product_id, analysis.organization_id, version, vector
+                ))
+
+    return features, colors, failed
+
+
+def _rescore_classifier(
+    session: Session,
+    rows: list[tuple[AnalysisResult, ProductImage]],
+    features: dict,
+    model_version: str,
+) -> None:
+    import numpy as np
+
+    from ml.services.inference import run_classification_head
+
+    scored = [(analysis, image) for analysis, image in rows if analysis.id in features]
+    if not scored:
+        return
+    results = run_classification_head(
+        np.stack([features[analysis.id] for analysis, _ in scored]), version=model_version
+    )
+
+    labels_by_product = {}
+    for (analysis, image), result in zip(scored, results):
+        analysis.classification_label = result["label"]
+        analysis.classification_confidence = result["confidence"]
+        analysis.classification_scores = result["scores"]
+        analysis.model_version = result["model_version"]
+        analysis.model_versions = {
+            **(analysis.model_versions or {}),
+            BackfillModelType.CLASSIFIER.value: model_version,
+        }
+        labels_by_product[image.product_id] = result["label"]
+
+    for product in session.execute(
+        select(Product).where(Product.id.in_(labels_by_product))
+    ).scalars():
+        product.category = labels_by_product[product.id]
+
+
+def _rescore_attributes(
+    session: Session,
+    rows: list[tuple[AnalysisResult, ProductImage]],
+    features: dict,
+    colors: dict,
+    model_version: str,
+) -> None:
+    from ml.services.inference import run_feature_attribute_extraction
+
+    product_ids = set()
+    for analysis, image in rows:
+        if analysis.id not in features:
+            continue
+        # Colour comes from the pixels; it is only redone when the image was read anyway
+        attributes = run_feature_attribute_extraction(features[analysis.id])
+        if analysis.id in colors:
+            attributes.append(colors[analysis.id])
+
+        session.execute(delete(ExtractedAttribute).where(
+            ExtractedAttribute.analysis_result_id == analysis.id,
+            ExtractedAttribute.attribute_name.in_([attr["name"] for attr in attributes]),
+        ))
+        for attr in attributes:
+            session.add(ExtractedAttribute(
+                analysis_result_id=analysis.id,
+                attribute_name=attr["name"],
+                attribute_value=attr["value"],
+                confidence=attr["confidence"],
+            ))
+        analysis.model_versions = {
+            **(analysis.model_versions or {}),
+            BackfillModelType.FEATURE_EXTRACTOR.value: model_version,
+        }
+        product_ids.add(image.product_id)
+
+    for product_id in product_ids:
+        session.execute(refresh_product_facets(product_id))
+
+
+def _finish_lane(session: Session, job_id: str, lane: int) -> None:
+    job = session.execute(
+        select(ProcessingJob).where(ProcessingJob.id == job_id).with_for_update()
+    ).scalar_one()
+    metadata = job.metadata_ or {}
+    lanes_done = sorted({*metadata.get("lanes_done", []), lane})
+    job.metadata_ = {**metadata, "lanes_done": lanes_done}
+
+    finished = len(lanes_done) >= metadata.get("lanes", 1)
+    if finished and job.status == JobStatus.PROCESSING.value:
+        job.status = JobStatus.COMPLETED.value
+        job.completed_at = datetime.now(UTC)
+    session.commit()
+
+    if finished:
+        logger.info(f"Backfill job={job_id} finished")
+        publish_job_complete(
+            job_id, progress={"completed": job.processed_images, "total": job.total_images}
+        )
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    time_limit=900,
+    soft_time_limit=870,
+)
+def backfill_chunk(self, job_id: str, lane: int, after_id: str | None, upper_id: str | None):
+    """
+    Re-score the next ``backfill_chunk_size`` analyses of a lane, then queue its next chunk.
+
+    Only the head that changed runs: the classifier head on stored features,
+    or the feature-derived attribute heads. Defect detection and Bedrock are
+    never called.
+    """
+    with get_sync_session() as session:
+        job = session.execute(
+            select(ProcessingJob).where(ProcessingJob.id == job_id)
+        ).scalar_one()
+        if job.status != JobStatus.PROCESSING.value:
+            logger.info(f"Backfill job={job_id} is {job.status}, stopping lane {lane}")
+            return
+
+        model_type = job.metadata_["model_type"]
+        model_version = job.metadata_["model_version"]
+
+        query = (
+            select(AnalysisResult, ProductImage)
+            .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
+            .where(*backfill_conditions(job.organization_id, model_type, model_version))
+        )
+        if after_id:
+            query = query.where(AnalysisResult.id > after_id)
+        if upper_id:
+            query = query.where(AnalysisResult.id <= upper_id)
+        rows = [
+            tuple(row) for row in session.execute(
+                query.order_by(AnalysisResult.id).limit(settings.backfill_chunk_size)
+            )
+        ]
+
+        if not rows:
+            _finish_lane(session, job_id, lane)
+            return
+        # Skipped analyses keep their old version, so the cursor must move past them
+        last_id = str(rows[-1][0].id)
+
+        try:
+            if model_type == BackfillModelType.CLASSIFIER.value:
+                feature_versions = {
+                    analysis.id: (analysis.model_versions or {}).get(
+                        BackfillModelType.FEATURE_EXTRACTOR.value, "v1"
+                    )
+                    for analysis, _ in rows
+                }
+            else:
+                feature_versions = {analysis.id: model_version for analysis, _ in rows}
+
+            features, colors, failed = _load_features(session, rows, feature_versions)
+            if model_type == BackfillModelType.CLASSIFIER.value:
+                _rescore_classifier(session, rows, features, model_version)
+            else:
+                _rescore_attributes(session, rows, features, colors, model_version)
+            session.commit()
+        except Exception as exc:
+            logger.exception(f"Backfill chunk failed for job={job_id}, lane={lane}: {exc}")
+            failed = {analysis.id for analysis, _ in rows}
+            session.rollback()
+            if self.request.retries < self.max_retries:
+                raise self.retry(exc=exc, countdown=2 ** self.request.retries * 30)
+            # Out of retries: count the chunk as failed and move on, so the lane still finishes
+            logger.error(f"Backfill job={job_id} lane={lane} gave up on {len(failed)} analyses")
+
+        job = session.execute(
+            select(ProcessingJob).where(ProcessingJob.id == job_id).with_for_update()
+        ).scalar_one()
+        job.processed_images = job.processed_images + len(rows) - len(failed)
+        job.failed_images = job.failed_images + len(failed)
+        session.commit()
+
+    backfill_chunk.delay(job_id, lane, last_id, upper_id)
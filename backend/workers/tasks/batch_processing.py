@@ -1,20 +1,27 @@
 import logging
+import uuid
 from datetime import UTC, datetime
 
-from celery import group, shared_task
+from celery import shared_task
+from celery.signals import task_postrun
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
 
 from shared.config import get_settings
-from shared.constants import JobStatus
-from shared.models.pipeline import ProcessingJob
+from shared.constants import JobStatus, StepName
+from shared.models.organization import Organization
+from shared.models.pipeline import JobStep, ProcessingJob
+from shared.tracing import TracedSession
+from workers.batch_lane import enqueue_batch_images, refill_batch_lane
+from workers.cancellation import is_job_cancelled
+from workers.deferred_batches import DeferredBatch, lanes_idle, select_releases
 from workers.tasks.image_processing import process_image
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 sync_engine = create_engine(settings.database_url_sync, pool_pre_ping=True)
-SyncSession = sessionmaker(bind=sync_engine)
+SyncSession = sessionmaker(bind=sync_engine, class_=TracedSession)
 
 
 @shared_task(
@@ -24,8 +31,18 @@ SyncSession = sessionmaker(bind=sync_engine)
     time_limit=1800,
     soft_time_limit=1750,
 )
-def process_batch(self, job_id: str, image_ids: list[str]):
-    """Orchestrate batch processing by fanning out individual image tasks."""
+def process_batch(self, job_id: str, image_ids: list[str], force_recompute: bool = False):
+    """
+    Queue a batch's images in the batch lane.
+
+    The images are dispatched by the weighted fair scheduler in
+    ``workers.batch_lane`` rather than published all at once, so one large
+    batch cannot hold the workers for every other organization.
+    """
+    if is_job_cancelled(job_id):
+        logger.info(f"Batch job={job_id} was cancelled before dispatch")
+        return
+
     logger.info(f"Starting batch processing job={job_id}, images={len(image_ids)}")
 
     with SyncSession() as session:
@@ -35,17 +52,98 @@ def process_batch(self, job_id: str, image_ids: list[str]):
         job.status = JobStatus.PROCESSING.value
         job.started_at = datetime.now(UTC)
         session.commit()
+        org_id = job.organization_id
+        plan = session.execute(
+            select(Organization.plan).where(Organization.id == org_id)
+        ).scalar_one_or_none()
+
+    enqueue_batch_images(str(org_id), plan, job_id, image_ids, force_recompute)
+    dispatched = refill_batch_lane()
+
+    logger.info(
+        f"Queued {len(image_ids)} images for batch job={job_id} in the batch lane "
+        f"({dispatched} dispatched now)"
+    )
+
+
+@shared_task(ignore_result=True)
+def refill_batch_lane_task():
+    """Periodic safety net that keeps the batch lane fed if no image task finished recently."""
+    refill_batch_lane()
+
+
+@shared_task(ignore_result=True)
+def release_deferred_batches():
+    """
+    Hand deferred batches to ``process_batch`` when the lanes are idle or a deadline draws near.
 
-    # Fan out individual tasks using a Celery group
-    batch = group(process_image.s(image_id, job_id) for image_id in image_ids)
-    result = batch.apply_async()
+    Runs on a beat schedule. Released jobs go back to ``queued`` in the same
+    transaction that selects them, so overlapping runs cannot release a job twice.
+    A job whose task cannot be published is put back to ``deferred`` for the next run.
+    """
+    idle = lanes_idle()
+    now = datetime.now(UTC)
+    dispatches = []
 
-    # Store the group result ID
     with SyncSession() as session:
-        job = session.execute(
-            select(ProcessingJob).where(ProcessingJob.id == job_id)
-        ).scalar_one()
-        job.metadata_ = {**(job.metadata_ or {}), "group_id": result.id}
+        jobs = session.execute(
+            select(ProcessingJob)
+            .where(ProcessingJob.status == JobStatus.DEFERRED.value)
+            .order_by(ProcessingJob.deadline)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not jobs:
+            return
+
+        released = set(select_releases(
+            [DeferredBatch(str(job.id), job.deadline, job.total_images) for job in jobs],
+            now,
+            idle,
+            settings.deferred_release_max_images,
+        ))
+        for job in jobs:
+            if str(job.id) not in released:
+                continue
+            image_ids = [str(image_id) for image_id in session.execute(
+                select(JobStep.product_image_id).where(
+                    JobStep.job_id == job.id,
+                    JobStep.step_name == StepName.PREPROCESS.value,
+                )
+            ).scalars()]
+            metadata = job.metadata_ or {}
+            job.status = JobStatus.QUEUED.value
+            job.celery_task_id = str(uuid.uuid4())
+            job.metadata_ = {**metadata, "released_at": now.isoformat()}
+            dispatches.append((job, image_ids, metadata))
         session.commit()
 
-    logger.info(f"Dispatched {len(image_ids)} tasks for batch job={job_id}")
+        unpublished = 0
+        for job, image_ids, metadata in dispatches:
+            try:
+                process_batch.apply_async(
+                    args=[str(job.id), image_ids],
+                    kwargs={"force_recompute": metadata.get("force_recompute", False)},
+                    task_id=job.celery_task_id,
+                )
+            except Exception:
+                logger.exception(f"Failed to publish deferred batch job {job.id}")
+                job.status = JobStatus.DEFERRED.value
+                job.celery_task_id = None
+                job.metadata_ = metadata
+                unpublished += 1
+        if unpublished:
+            session.commit()
+
+    if len(dispatches) > unpublished:
+        logger.info(
+            f"Released {len(dispatches) - unpublished} deferred batch jobs (lanes idle: {idle})"
+        )
+
+
+@task_postrun.connect(sender=process_image)
+def _refill_after_image(**kwargs):
+    # A finished image frees a slot; hand it to the next organization in line
+    try:
+        refill_batch_lane()
+    except Exception:
+        logger.exception("Batch lane refill failed")
@@ -1,24 +1,397 @@
 import csv
+import gzip
 import io
 import uuid
-from datetime import datetime, UTC
+from datetime import UTC, datetime
 
 from celery import shared_task
 
 from shared.config import get_settings
+from shared.tracing import trace_aws_calls
 from workers.celery_app import get_sync_session
 
 settings = get_settings()
 
+# S3 requires every part except the last to be at least 5 MiB
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
 
-@shared_task(bind=True, time_limit=600, soft_time_limit=570)
-def generate_export(self, export_job_id: str):
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
 
-    from shared.models.analysis import AnalysisResult
+def _get_s3_client():
+    import boto3
+    from botocore.config import Config as BotoConfig
+
+    s3_kwargs = {
+        "service_name": "s3",
+        "region_name": settings.aws_region,
+        "aws_access_key_id": settings.aws_access_key_id,
+        "aws_secret_access_key": settings.aws_secret_access_key,
+        "config": BotoConfig(signature_version="s3v4"),
+    }
+    if settings.s3_endpoint_url:
+        s3_kwargs["endpoint_url"] = settings.s3_endpoint_url
+    return trace_aws_calls(boto3.client(**s3_kwargs))
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Write-only file object that streams bytes into an S3 multipart upload.
+
+    Data is buffered until a full part is available, so memory use is bounded
+    by ``part_size`` no matter how large the object grows.
+    """
+
+    def __init__(self, s3, bucket: str, key: str, content_type: str, part_size: int | None = None):
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(
+            part_size or settings.export_part_size_bytes, MIN_MULTIPART_PART_SIZE
+        )
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._parts: list[dict] = []
+        self._upload_id = s3.create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType=content_type
+        )["UploadId"]
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    def _upload_part(self, body: bytes) -> None:
+        part_number = len(self._parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self._parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
+    def complete(self) -> None:
+        if self._buffer or not self._parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts},
+        )
+
+    def abort(self) -> None:
+        try:
+            self.s3.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+        except Exception:
+            pass
+
+
+def _report_progress(export_job_id: uuid.UUID, row_count: int) -> None:
+    """
+    Record rows written so far.
+
+    Uses its own session: committing the export session would close the
+    server-side cursor the rows are being streamed from.
+    """
+    from sqlalchemy import update
+
     from shared.models.export import ExportJob
+
+    with get_sync_session() as session:
+        session.execute(
+            update(ExportJob).where(ExportJob.id == export_job_id).values(row_count=row_count)
+        )
+        session.commit()
+
+
+def build_export_query(export_type: str, org_id: uuid.UUID, filters: dict):
+    """
+    Build a column-only SELECT for an export with ``ExportJob.filters`` applied.
+
+    Attributes, defects and image counts are aggregated by correlated
+    subqueries so each output row comes from exactly one result row and no
+    ORM objects or collections are loaded.
+    """
+    from sqlalchemy import func, select
+
+    from shared.models.analysis import AnalysisResult, DetectedDefect, ExtractedAttribute
     from shared.models.product import Product, ProductImage
+    from shared.schemas.export import ExportFilter
+
+    f = ExportFilter.model_validate(filters or {})
+
+    if export_type in ("analysis_csv", "analysis_pdf"):
+        attributes = (
+            select(
+                func.string_agg(
+                    ExtractedAttribute.attribute_name + "=" + ExtractedAttribute.attribute_value,
+                    "; ",
+                )
+            )
+            .where(ExtractedAttribute.analysis_result_id == AnalysisResult.id)
+            .scalar_subquery()
+        )
+        defect_count = (
+            select(func.count(DetectedDefect.id))
+            .where(DetectedDefect.analysis_result_id == AnalysisResult.id)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                AnalysisResult.product_image_id,
+                AnalysisResult.classification_label,
+                AnalysisResult.classification_confidence,
+                AnalysisResult.model_version,
+                attributes.label("attributes"),
+                defect_count.label("defect_count"),
+                AnalysisResult.processing_time_ms,
+                AnalysisResult.status,
+                AnalysisResult.created_at,
+            )
+            .where(AnalysisResult.organization_id == org_id)
+            .order_by(AnalysisResult.created_at.desc())
+        )
+        # Products are only joined when a filter needs them
+        if f.category or f.product_ids:
+            query = query.join(
+                ProductImage, AnalysisResult.product_image_id == ProductImage.id
+            ).join(Product, ProductImage.product_id == Product.id)
+        created_at = AnalysisResult.created_at
+        status_column = AnalysisResult.status
+    elif export_type == "analysis_parquet":
+        attributes = (
+            select(
+                func.json_agg(
+                    func.json_build_object(
+                        "name", ExtractedAttribute.attribute_name,
+                        "value", ExtractedAttribute.attribute_value,
+                        "confidence", ExtractedAttribute.confidence,
+                    )
+                )
+            )
+            .where(ExtractedAttribute.analysis_result_id == AnalysisResult.id)
+            .scalar_subquery()
+        )
+        defects = (
+            select(
+                func.json_agg(
+                    func.json_build_object(
+                        "type", DetectedDefect.defect_type,
+                        "severity", DetectedDefect.severity,
+                        "confidence", DetectedDefect.confidence,
+                    )
+                )
+            )
+            .where(DetectedDefect.analysis_result_id == AnalysisResult.id)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                AnalysisResult.product_image_id,
+                Product.id.label("product_id"),
+                Product.category,
+                AnalysisResult.classification_label,
+                AnalysisResult.classification_confidence,
+                AnalysisResult.model_version,
+                AnalysisResult.processing_time_ms,
+                AnalysisResult.status,
+                AnalysisResult.created_at,
+                attributes.label("attributes"),
+                defects.label("defects"),
+            )
+            .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
+            .join(Product, ProductImage.product_id == Product.id)
+            .where(AnalysisResult.organization_id == org_id)
+            .order_by(AnalysisResult.created_at.desc())
+        )
+        created_at = AnalysisResult.created_at
+        status_column = AnalysisResult.status
+    elif export_type == "products_csv":
+        image_count = (
+            select(func.count(ProductImage.id))
+            .where(ProductImage.product_id == Product.id)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                Product.id,
+                Product.title,
+                Product.category,
+                Product.status,
+                image_count.label("image_count"),
+                func.left(Product.ai_description, 200).label("ai_description"),
+                Product.created_at,
+            )
+            .where(Product.organization_id == org_id)
+            .order_by(Product.created_at.desc())
+        )
+        created_at = Product.created_at
+        status_column = Product.status
+    else:
+        raise ValueError(f"Unknown export type: {export_type}")
+
+    if f.date_from:
+        query = query.where(created_at >= f.date_from)
+    if f.date_to:
+        query = query.where(created_at <= f.date_to)
+    if f.category:
+        query = query.where(Product.category == f.category)
+    if f.status:
+        query = query.where(status_column == f.status)
+    if f.product_ids:
+        query = query.where(Product.id.in_(f.product_ids))
+
+    return query
+
+
+def _format_row(export_type: str, row) -> list:
+    if export_type == "products_csv":
+        return [
+            str(row.id),
+            row.title or "",
+            row.category or "",
+            row.status,
+            row.image_count,
+            row.ai_description or "",
+            row.created_at.isoformat() if row.created_at else "",
+        ]
+    return [
+        str(row.product_image_id),
+        row.classification_label or "",
+        f"{row.classification_confidence:.4f}" if row.classification_confidence else "",
+        row.model_version,
+        row.attributes or "",
+        row.defect_count,
+        row.processing_time_ms or "",
+        row.status,
+        row.created_at.isoformat() if row.created_at else "",
+    ]
+
+
+EXPORT_HEADERS = {
+    "analysis_csv": [
+        "Image ID", "Classification", "Confidence", "Model Version",
+        "Attributes", "Defect Count", "Processing Time (ms)",
+        "Status", "Created At",
+    ],
+    "products_csv": [
+        "Product ID", "Title", "Category", "Status",
+        "Image Count", "AI Description", "Created At",
+    ],
+}
+EXPORT_HEADERS["analysis_pdf"] = EXPORT_HEADERS["analysis_csv"]
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("image_id", pa.string()),
+        ("product_id", pa.string()),
+        ("category", pa.string()),
+        ("classification_label", pa.string()),
+        ("classification_confidence", pa.float64()),
+        ("model_version", pa.string()),
+        ("processing_time_ms", pa.int32()),
+        ("status", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("attributes", pa.list_(pa.struct([
+            ("name", pa.string()),
+            ("value", pa.string()),
+            ("confidence", pa.float64()),
+        ]))),
+        ("defects", pa.list_(pa.struct([
+            ("type", pa.string()),
+            ("severity", pa.string()),
+            ("confidence", pa.float64()),
+        ]))),
+    ])
+
+
+def _parquet_record(row) -> dict:
+    return {
+        "image_id": str(row.product_image_id),
+        "product_id": str(row.product_id),
+        "category": row.category,
+        "classification_label": row.classification_label,
+        "classification_confidence": row.classification_confidence,
+        "model_version": row.model_version,
+        "processing_time_ms": row.processing_time_ms,
+        "status": row.status,
+        "created_at": row.created_at,
+        "attributes": row.attributes or [],
+        "defects": row.defects or [],
+    }
+
+
+def _write_csv(batches, export_type: str, upload: S3MultipartWriter, on_progress) -> int:
+    row_count = 0
+    with gzip.GzipFile(fileobj=upload, mode="wb") as gz, io.TextIOWrapper(
+        gz, encoding="utf-8", newline=""
+    ) as text:
+        writer = csv.writer(text)
+        writer.writerow(EXPORT_HEADERS[export_type])
+        for batch in batches:
+            writer.writerows(_format_row(export_type, row) for row in batch)
+            row_count += len(batch)
+            on_progress(row_count)
+    return row_count
+
+
+def _write_parquet(batches, export_type: str, upload: S3MultipartWriter, on_progress) -> int:
+    """
+    Stream DB batches into a Parquet file as Arrow record batches.
+
+    Batches are buffered up to ``export_parquet_row_group_size`` rows before
+    being flushed as one row group, keeping row groups large enough for
+    useful min/max statistics while memory stays bounded.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema()
+    row_count = 0
+    pending: list = []
+    pending_rows = 0
+
+    with pq.ParquetWriter(upload, schema, compression="zstd") as writer:
+        for batch in batches:
+            pending.append(
+                pa.RecordBatch.from_pylist([_parquet_record(row) for row in batch], schema=schema)
+            )
+            pending_rows += len(batch)
+            row_count += len(batch)
+            if pending_rows >= settings.export_parquet_row_group_size:
+                writer.write_table(pa.Table.from_batches(pending, schema=schema))
+                pending, pending_rows = [], 0
+            on_progress(row_count)
+        if pending:
+            writer.write_table(pa.Table.from_batches(pending, schema=schema))
+    return row_count
+
+
+# export_type -> (writer, file extension, content type)
+EXPORT_FORMATS = {
+    "analysis_csv": (_write_csv, "csv.gz", "application/gzip"),
+    "analysis_pdf": (_write_csv, "csv.gz", "application/gzip"),
+    "products_csv": (_write_csv, "csv.gz", "application/gzip"),
+    "analysis_parquet": (_write_parquet, "parquet", "application/vnd.apache.parquet"),
+}
+
+
+@shared_task(bind=True, time_limit=3600, soft_time_limit=3540)
+def generate_export(self, export_job_id: str):
+    from shared.models.export import ExportJob
 
     with get_sync_session() as session:
         export_job = session.get(ExportJob, uuid.UUID(export_job_id))
@@ -26,114 +399,46 @@ def generate_export(self, export_job_id: str):
             return
 
         export_job.status = "processing"
+        export_job.row_count = 0
         session.commit()
 
+        org_id = export_job.organization_id
+        export_type = export_job.export_type
+        upload = None
+
         try:
-            org_id = export_job.organization_id
-
-            if export_job.export_type in ("analysis_csv", "analysis_pdf"):
-                results = session.execute(
-                    select(AnalysisResult)
-                    .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
-                    .join(Product, ProductImage.product_id == Product.id)
-                    .options(
-                        selectinload(AnalysisResult.extracted_attributes),
-                        selectinload(AnalysisResult.detected_defects),
-                    )
-                    .where(Product.organization_id == org_id)
-                    .order_by(AnalysisResult.created_at.desc())
-                ).scalars().all()
-
-                output = io.StringIO()
-                writer = csv.writer(output)
-                writer.writerow([
-                    "Image ID", "Classification", "Confidence", "Model Version",
-                    "Attributes", "Defect Count", "Processing Time (ms)",
-                    "Status", "Created At",
-                ])
-
-                for r in results:
-                    attrs = "; ".join(
-                        f"{a.attribute_name}={a.attribute_value}" for a in r.extracted_attributes
-                    )
-                    writer.writerow([
-                        str(r.product_image_id),
-                        r.classification_label or "",
-                        f"{r.classification_confidence:.4f}" if r.classification_confidence else "",
-                        r.model_version,
-                        attrs,
-                        len(r.detected_defects),
-                        r.processing_time_ms or "",
-                        r.status,
-                        r.created_at.isoformat() if r.created_at else "",
-                    ])
-
-                row_count = len(results)
-                content = output.getvalue().encode("utf-8")
-
-            elif export_job.export_type == "products_csv":
-                products = session.execute(
-                    select(Product)
-                    .options(selectinload(Product.images))
-                    .where(Product.organization_id == org_id)
-                    .order_by(Product.created_at.desc())
-                ).scalars().all()
-
-                output = io.StringIO()
-                writer = csv.writer(output)
-                writer.writerow([
-                    "Product ID", "Title", "Category", "Status",
-                    "Image Count", "AI Description", "Created At",
-                ])
-
-                for p in products:
-                    writer.writerow([
-                        str(p.id),
-                        p.title or "",
-                        p.category or "",
-                        p.status,
-                        len(p.images),
-                        (p.ai_description or "")[:200],
-                        p.created_at.isoformat() if p.created_at else "",
-                    ])
-
-                row_count = len(products)
-                content = output.getvalue().encode("utf-8")
-            else:
-                raise ValueError(f"Unknown export type: {export_job.export_type}")
-
-            # Upload to S3
-            import boto3
-            from botocore.config import Config as BotoConfig
-
-            s3_kwargs = {
-                "service_name": "s3",
-                "region_name": settings.aws_region,
-                "aws_access_key_id": settings.aws_access_key_id,
-                "aws_secret_access_key": settings.aws_secret_access_key,
-                "config": BotoConfig(signature_version="s3v4"),
-            }
-            if settings.s3_endpoint_url:
-                s3_kwargs["endpoint_url"] = settings.s3_endpoint_url
-
-            s3 = boto3.client(**s3_kwargs)
-            s3_key = f"exports/{org_id}/{export_job.id}.csv"
-
-            s3.put_object(
-                Bucket=settings.s3_bucket_name,
-                Key=s3_key,
-                Body=content,
-                ContentType="text/csv",
+            if export_type not in EXPORT_FORMATS:
+                raise ValueError(f"Unknown export type: {export_type}")
+            write, extension, content_type = EXPORT_FORMATS[export_type]
+            s3_key = f"exports/{org_id}/{export_job.id}.{extension}"
+            query = build_export_query(export_type, org_id, export_job.filters)
+
+            upload = S3MultipartWriter(
+                _get_s3_client(), settings.s3_bucket_name, s3_key, content_type=content_type
+            )
+            result = session.execute(
+                query.execution_options(yield_per=settings.export_batch_size)
+            )
+            row_count = write(
+                result.partitions(),
+                export_type,
+                upload,
+                lambda n: _report_progress(export_job.id, n),
             )
+            result.close()
+            upload.complete()
 
             export_job.status = "completed"
             export_job.s3_key = s3_key
             export_job.s3_bucket = settings.s3_bucket_name
-            export_job.file_size_bytes = len(content)
+            export_job.file_size_bytes = upload.bytes_written
             export_job.row_count = row_count
             session.commit()
 
         except Exception as exc:
+            if upload is not None:
+                upload.abort()
+            session.rollback()
             export_job.status = "failed"
             export_job.error_message = str(exc)[:500]
             session.commit()
@@ -158,20 +463,7 @@ def cleanup_expired_exports():
         for job in expired:
             if job.s3_key:
                 try:
-                    import boto3
-                    from botocore.config import Config as BotoConfig
-
-                    s3_kwargs = {
-                        "service_name": "s3",
-                        "region_name": settings.aws_region,
-                        "aws_access_key_id": settings.aws_access_key_id,
-                        "aws_secret_access_key": settings.aws_secret_access_key,
-                        "config": BotoConfig(signature_version="s3v4"),
-                    }
-                    if settings.s3_endpoint_url:
-                        s3_kwargs["endpoint_url"] = settings.s3_endpoint_url
-
-                    s3 = boto3.client(**s3_kwargs)
+                    s3 = _get_s3_client()
                     s3.delete_object(
                         Bucket=job.s3_bucket or settings.s3_bucket_name,
                         Key=job.s3_key,
@@ -1 +1,29 @@
 """Feature extraction subtask — dispatched from image_processing pipeline."""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(time_limit=60, soft_time_limit=50)
+def embed_query_image(s3_bucket: str, s3_key: str, version: str = "v1") -> list[float]:
+    """
+    Compute the backbone embedding of a search-by-image query.
+
+    The query image is a throwaway upload, so it is deleted as soon as it
+    has been read. Runs on the ``search`` queue so interactive lookups never
+    wait behind batch processing.
+    """
+    from ml.services.inference import run_feature_extraction
+    from ml.services.preprocessing import download_and_preprocess, get_s3_client
+
+    try:
+        image_tensor = download_and_preprocess(s3_bucket, s3_key)
+    finally:
+        try:
+            get_s3_client().delete_object(Bucket=s3_bucket, Key=s3_key)
+        except Exception:
+            logger.warning(f"Failed to delete query image s3://{s3_bucket}/{s3_key}")
+
+    return run_feature_extraction(image_tensor, version=version).astype(float).tolist()
@@ -1,18 +1,42 @@
 import logging
+import random
 import time
 from datetime import UTC, datetime
 
 from celery import shared_task
-from sqlalchemy import select
+from opentelemetry import trace
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from shared.analysis_reuse import (
+    content_sha256,
+    copy_analysis,
+    copy_classification,
+    find_near_duplicate_analysis,
+    find_reusable_analysis,
+    near_duplicate_versions,
+)
 from shared.config import get_settings
-from shared.constants import AnalysisStatus, JobStatus, StepName, StepStatus
-from shared.models.analysis import AnalysisResult
-from shared.models.pipeline import JobStep, ProcessingJob
+from shared.constants import AnalysisStatus, JobStatus, ProcessingLane, StepName, StepStatus
+from shared.exceptions import JobCancelledError
+from shared.failures import classify_failure, format_traceback
+from shared.metrics import PIPELINE_STAGE_DURATION
+from shared.models.analysis import AnalysisResult, DetectedDefect, ExtractedAttribute
+from shared.models.organization import Organization
+from shared.models.pipeline import DeadLetter, JobStep, ProcessingJob
 from shared.models.product import Product, ProductImage
+from shared.near_duplicates import band_keys, to_signed64
+from shared.org_stats import completed_analysis_deltas, defect_counts, increment_org_stats
+from shared.product_facets import refresh_product_facets
+from shared.tracing import tracer
+from workers.admission import record_lane_completion
+from workers.batch_lane import requeue_batch_image
+from workers.cancellation import is_job_cancelled, raise_if_cancelled
 from workers.celery_app import get_sync_session
+from workers.org_concurrency import acquire_org_slot, mark_deferred, release_org_slot
 from workers.tasks.notifications import (
+    publish_image_complete,
+    publish_image_failed,
     publish_job_complete,
     publish_job_failed,
     publish_step_update,
@@ -31,6 +55,7 @@ def update_step_status(
     duration_ms: int | None = None,
     result_data: dict | None = None,
     error_message: str | None = None,
+    only_if_pending: bool = False,
 ):
     """Update a job step status in the database."""
     step = session.execute(
@@ -41,6 +66,8 @@ def update_step_status(
         )
     ).scalar_one_or_none()
 
+    if step and only_if_pending and step.status != StepStatus.PENDING.value:
+        return
     if step:
         step.status = status
         if status == StepStatus.RUNNING.value:
@@ -49,6 +76,8 @@ def update_step_status(
             step.completed_at = datetime.now(UTC)
         if duration_ms is not None:
             step.duration_ms = duration_ms
+            if status == StepStatus.COMPLETED.value:
+                PIPELINE_STAGE_DURATION.labels(stage=step_name).observe(duration_ms / 1000)
         if result_data:
             step.result_data = result_data
         if error_message:
@@ -56,6 +85,212 @@ def update_step_status(
         session.commit()
 
 
+def _stage_span(stage: str):
+    """Span for one pipeline stage; its S3 calls, Bedrock calls and commits nest under it."""
+    return tracer.start_as_current_span(f"stage.{stage}", attributes={"pipeline.stage": stage})
+
+
+def _finished_steps(session: Session, job_id: str, image_id: str) -> set[str]:
+    """Steps of this job that an earlier attempt completed (or skipped) for the image."""
+    return set(session.execute(
+        select(JobStep.step_name).where(
+            JobStep.job_id == job_id,
+            JobStep.product_image_id == image_id,
+            JobStep.status.in_([StepStatus.COMPLETED.value, StepStatus.SKIPPED.value]),
+        )
+    ).scalars())
+
+
+def _load_image_tensor(image: ProductImage):
+    """Download and preprocess the image when resuming past the preprocess step."""
+    from ml.services.preprocessing import download_and_preprocess
+
+    return download_and_preprocess(image.s3_bucket, image.s3_key)
+
+
+def _checkpointed_attributes(session: Session, analysis: AnalysisResult) -> list[dict]:
+    rows = session.execute(
+        select(ExtractedAttribute).where(ExtractedAttribute.analysis_result_id == analysis.id)
+    ).scalars()
+    return [
+        {"name": row.attribute_name, "value": row.attribute_value, "confidence": row.confidence}
+        for row in rows
+    ]
+
+
+def _checkpointed_defects(session: Session, analysis: AnalysisResult) -> list[dict]:
+    rows = session.execute(
+        select(DetectedDefect).where(DetectedDefect.analysis_result_id == analysis.id)
+    ).scalars()
+    return [
+        {
+            "type": row.defect_type,
+            "severity": row.severity,
+            "confidence": row.confidence,
+            "bounding_box": row.bounding_box,
+            "description": row.description,
+        }
+        for row in rows
+    ]
+
+
+def _apply_to_product(session: Session, image: ProductImage, analysis: AnalysisResult):
+    """Copy the AI category and description onto the product."""
+    product = session.execute(
+        select(Product).where(Product.id == image.product_id)
+    ).scalar_one()
+    product.category = analysis.classification_label
+    product.ai_description = analysis.description_text
+    product.status = "active"
+
+
+def _finalize(
+    session: Session,
+    job: ProcessingJob,
+    image: ProductImage,
+    analysis: AnalysisResult,
+    pipeline_start: float,
+    defects_count: int,
+    experiment_id=None,
+    variant_id=None,
+):
+    """Mark the analysis and job completed, update counters and notify."""
+    total_ms = int((time.time() - pipeline_start) * 1000)
+    analysis.processing_time_ms = total_ms
+    analysis.status = AnalysisStatus.COMPLETED.value
+    analysis.completed_at = datetime.now(UTC)
+    if experiment_id:
+        analysis.experiment_id = experiment_id
+    if variant_id:
+        analysis.variant_id = variant_id
+
+    # Images of one job finish in parallel; the row lock keeps every increment
+    session.refresh(job, with_for_update=True)
+    job.processed_images = job.processed_images + 1
+    # The job ends with its last image; earlier images only report their own completion
+    finished = job.processed_images + job.failed_images >= job.total_images
+    if finished:
+        if job.status != JobStatus.CANCELLED.value:
+            job.status = JobStatus.COMPLETED.value
+        job.completed_at = datetime.now(UTC)
+    session.execute(increment_org_stats(
+        analysis.organization_id, **completed_analysis_deltas(analysis, defects=defects_count)
+    ))
+    session.execute(refresh_product_facets(image.product_id))
+    session.commit()
+
+    progress = {"completed": job.processed_images, "total": job.total_images}
+    if finished:
+        publish_job_complete(str(job.id), progress=progress)
+    else:
+        publish_image_complete(str(job.id), str(image.id), progress=progress)
+
+    logger.info(f"Completed processing for image={image.id} in {total_ms}ms")
+
+
+def _job_org(session: Session, job_id: str) -> tuple[str | None, str | None]:
+    row = session.execute(
+        select(ProcessingJob.organization_id, Organization.plan)
+        .outerjoin(Organization, Organization.id == ProcessingJob.organization_id)
+        .where(ProcessingJob.id == job_id)
+    ).first()
+    if not row or not row.organization_id:
+        return None, None
+    return str(row.organization_id), row.plan
+
+
+def _task_lane(task) -> str:
+    # The default queue is bound under the default routing key, not its own name
+    routing_key = (task.request.delivery_info or {}).get("routing_key")
+    if routing_key in {lane.value for lane in ProcessingLane}:
+        return routing_key
+    return ProcessingLane.INTERACTIVE.value
+
+
+def _defer_over_quota(
+    task,
+    org_id: str,
+    plan: str | None,
+    image_id: str,
+    job_id: str,
+    user_id: str | None,
+    force_recompute: bool,
+):
+    """Hand back a task whose organization is at its limit, without holding a worker slot."""
+    if _task_lane(task) == ProcessingLane.BATCH.value:
+        # The batch lane passes over full organizations, so this waits without polling
+        requeue_batch_image(org_id, plan, job_id, image_id, force_recompute)
+        return
+
+    mark_deferred(org_id, task.request.id)
+    # Same task ID, so cancellation can still revoke the deferred copy
+    task.apply_async(
+        args=(image_id, job_id),
+        kwargs={"user_id": user_id, "force_recompute": force_recompute},
+        countdown=settings.org_quota_defer_seconds * (1 + random.random()),
+        task_id=task.request.id,
+        retries=task.request.retries,
+        queue=ProcessingLane.INTERACTIVE.value,
+    )
+
+
+def _abandon_cancelled(session: Session, job_id: str, image_id: str):
+    """Leave a cancelled job's image failed, with its unstarted steps skipped."""
+    analysis = session.execute(
+        select(AnalysisResult).where(AnalysisResult.product_image_id == image_id)
+    ).scalar_one_or_none()
+    if analysis and analysis.status != AnalysisStatus.COMPLETED.value:
+        analysis.status = AnalysisStatus.FAILED.value
+        analysis.error_message = "Processing job cancelled"
+        analysis.completed_at = datetime.now(UTC)
+    for step in session.execute(
+        select(JobStep).where(
+            JobStep.job_id == job_id,
+            JobStep.product_image_id == image_id,
+            JobStep.status.in_([StepStatus.PENDING.value, StepStatus.RUNNING.value]),
+        )
+    ).scalars():
+        step.status = StepStatus.SKIPPED.value
+        step.result_data = {"cancelled": True}
+    session.commit()
+
+
+def _complete_from_reuse(
+    session: Session,
+    job: ProcessingJob,
+    image: ProductImage,
+    analysis: AnalysisResult,
+    source: AnalysisResult,
+    pipeline_start: float,
+    experiment_id=None,
+    variant_id=None,
+):
+    """Finish the pipeline by copying ``source``, skipping every model step still pending."""
+    logger.info(f"Reusing analysis={source.id} for identical image={image.id}")
+    copy_analysis(session, source, analysis, image)
+    _apply_to_product(session, image, analysis)
+    session.commit()
+
+    for step_name in StepName:
+        update_step_status(
+            session, str(job.id), str(image.id), step_name.value, StepStatus.SKIPPED.value,
+            result_data={"reused_from": str(source.id)},
+            only_if_pending=True,
+        )
+    publish_step_update(
+        str(job.id), str(image.id), "generate_description", "skipped",
+        progress={"completed": 5, "total": 5},
+        data={"reused_from": str(source.id)},
+    )
+
+    _finalize(
+        session, job, image, analysis, pipeline_start,
+        defects_count=len(source.detected_defects),
+        experiment_id=experiment_id,
+        variant_id=variant_id,
+    )
+
+
 @shared_task(
     bind=True,
     max_retries=3,
@@ -64,18 +299,50 @@ def update_step_status(
     time_limit=300,
     soft_time_limit=270,
 )
-def process_image(self, image_id: str, job_id: str, user_id: str | None = None):
-    """Main image processing pipeline task."""
-    logger.info(f"Starting processing for image={image_id}, job={job_id}")
-    pipeline_start = time.time()
+def process_image(
+    self,
+    image_id: str,
+    job_id: str,
+    user_id: str | None = None,
+    force_recompute: bool = False,
+):
+    """
+    Main image processing pipeline task.
+
+    Each step checkpoints its output (analysis row, attribute and defect rows,
+    stored embedding) before its ``JobStep`` is marked completed, so a retry
+    of the same job skips finished steps and resumes at the one that failed.
+
+    Unless ``force_recompute`` is set, an image whose bytes match an image
+    already analysed in the organization by the same model versions gets a
+    copy of that analysis instead of running the models.
+    """
+    # Queued tasks of a cancelled job that escaped the bulk revoke stop here
+    if is_job_cancelled(job_id):
+        logger.info(f"Job={job_id} was cancelled, skipping image={image_id}")
+        return
+
+    trace.get_current_span().set_attributes({"job.id": job_id, "image.id": image_id})
 
     with get_sync_session() as session:
+        org_id, plan = _job_org(session, job_id)
+        lease_id = self.request.id or f"{job_id}:{image_id}"
+        if org_id and not acquire_org_slot(org_id, plan, lease_id):
+            logger.info(f"Organization={org_id} is at its limit, deferring image={image_id}")
+            _defer_over_quota(self, org_id, plan, image_id, job_id, user_id, force_recompute)
+            return
+
+        logger.info(f"Starting processing for image={image_id}, job={job_id}")
+        pipeline_start = time.time()
+        retrying = False
+
         try:
             # Update job status
             job = session.execute(
                 select(ProcessingJob).where(ProcessingJob.id == job_id)
             ).scalar_one()
-            job.status = JobStatus.PROCESSING.value
+            if job.status != JobStatus.CANCELLED.value:
+                job.status = JobStatus.PROCESSING.value
             session.commit()
 
             # Get the image
@@ -89,30 +356,18 @@ def process_image(self, image_id: str, job_id: str, user_id: str | None = None):
                 )
             ).scalar_one()
 
+            if analysis.status == AnalysisStatus.COMPLETED.value:
+                # Re-processing: the previous result stops counting as completed
+                defects = dict(session.execute(defect_counts([analysis.id])).all())
+                session.execute(increment_org_stats(
+                    analysis.organization_id,
+                    **completed_analysis_deltas(
+                        analysis, sign=-1, defects=defects.get(analysis.id, 0)
+                    ),
+                ))
             analysis.status = AnalysisStatus.PROCESSING.value
             session.commit()
 
-            # ---- Step 1: Preprocess ----
-            step_start = time.time()
-            update_step_status(
-                session, job_id, image_id, StepName.PREPROCESS.value, StepStatus.RUNNING.value
-            )
-            publish_step_update(job_id, image_id, "preprocess", "running")
-
-            from ml.services.preprocessing import download_and_preprocess
-
-            image_tensor = download_and_preprocess(image.s3_bucket, image.s3_key)
-
-            step_ms = int((time.time() - step_start) * 1000)
-            update_step_status(
-                session, job_id, image_id, StepName.PREPROCESS.value,
-                StepStatus.COMPLETED.value, duration_ms=step_ms,
-            )
-            publish_step_update(
-                job_id, image_id, "preprocess", "completed",
-                progress={"completed": 1, "total": 5},
-            )
-
             # ---- Resolve A/B test model versions ----
             experiment_id = None
             variant_id = None
@@ -130,199 +385,402 @@ def process_image(self, image_id: str, job_id: str, user_id: str | None = None):
                 )
             else:
                 clf_version = fe_version = dd_version = "v1"
+            model_versions = {
+                "classifier": clf_version,
+                "feature_extractor": fe_version,
+                "defect_detector": dd_version,
+                "description": settings.bedrock_model_id,
+            }
+
+            # Checkpoints from an earlier attempt of this job: finished steps are not re-run
+            done = _finished_steps(session, job_id, image_id)
+            resuming = bool(done - {StepName.PREPROCESS.value})
+            if done:
+                logger.info(f"Resuming image={image_id} after steps {sorted(done)}")
+
+            # Hash known from a direct upload: reuse before even downloading
+            if not force_recompute and not resuming and image.content_sha256:
+                source = find_reusable_analysis(
+                    session, analysis, image.content_sha256, model_versions
+                )
+                if source:
+                    _complete_from_reuse(
+                        session, job, image, analysis, source, pipeline_start,
+                        experiment_id, variant_id,
+                    )
+                    return
 
-            # ---- Step 2: Classification ----
-            step_start = time.time()
-            update_step_status(
-                session, job_id, image_id, StepName.CLASSIFY.value, StepStatus.RUNNING.value
-            )
-            publish_step_update(job_id, image_id, "classify", "running")
+            # ---- Step 1: Preprocess ----
+            raise_if_cancelled(job_id)
+            image_tensor = None
+            hash_was_known = image.content_sha256 is not None
+            if StepName.PREPROCESS.value not in done:
+                with _stage_span(StepName.PREPROCESS.value):
+                    step_start = time.time()
+                    update_step_status(
+                        session, job_id, image_id, StepName.PREPROCESS.value,
+                        StepStatus.RUNNING.value,
+                    )
+                    publish_step_update(job_id, image_id, "preprocess", "running")
+
+                    from ml.services.perceptual_hash import perceptual_hash_from_bytes
+                    from ml.services.preprocessing import download_image, preprocess_from_bytes
+
+                    image_bytes = download_image(image.s3_bucket, image.s3_key)
+                    image_tensor = preprocess_from_bytes(image_bytes)
+
+                    if not hash_was_known:
+                        image.content_sha256 = content_sha256(image_bytes)
+                    if image.perceptual_hash is None:
+                        phash = perceptual_hash_from_bytes(image_bytes)
+                        image.perceptual_hash = to_signed64(phash)
+                        image.phash_bands = band_keys(phash)
+                    session.commit()
+
+                    step_ms = int((time.time() - step_start) * 1000)
+                    update_step_status(
+                        session, job_id, image_id, StepName.PREPROCESS.value,
+                        StepStatus.COMPLETED.value, duration_ms=step_ms,
+                    )
+                    publish_step_update(
+                        job_id, image_id, "preprocess", "completed",
+                        progress={"completed": 1, "total": 5},
+                    )
+
+            if not force_recompute and not resuming and not hash_was_known:
+                source = find_reusable_analysis(
+                    session, analysis, image.content_sha256, model_versions
+                )
+                if source:
+                    _complete_from_reuse(
+                        session, job, image, analysis, source, pipeline_start,
+                        experiment_id, variant_id,
+                    )
+                    return
 
-            from ml.services.inference import run_classification
+            near_duplicate = None
+            if settings.near_duplicate_reuse and not force_recompute and not resuming:
+                near_duplicate = find_near_duplicate_analysis(
+                    session, analysis, image.perceptual_hash, model_versions,
+                    settings.near_duplicate_max_distance,
+                )
 
-            classification = run_classification(image_tensor, version=clf_version)
+            if near_duplicate:
+                # ---- Steps 2-3: taken over from a near-duplicate ----
+                source, distance = near_duplicate
+                logger.info(
+                    f"Reusing classification of analysis={source.id} for image={image_id} "
+                    f"(distance={distance})"
+                )
+                copy_classification(session, source, analysis, image)
+                session.commit()
 
-            analysis.classification_label = classification["label"]
-            analysis.classification_confidence = classification["confidence"]
-            analysis.classification_scores = classification["scores"]
-            session.commit()
+                reuse_data = {"near_duplicate_of": str(source.id), "distance": distance}
+                for step_name in (StepName.CLASSIFY, StepName.EXTRACT_ATTRIBUTES):
+                    update_step_status(
+                        session, job_id, image_id, step_name.value, StepStatus.SKIPPED.value,
+                        result_data=reuse_data,
+                    )
+                done |= {StepName.CLASSIFY.value, StepName.EXTRACT_ATTRIBUTES.value}
+                publish_step_update(
+                    job_id, image_id, "extract_attributes", "skipped",
+                    progress={"completed": 3, "total": 5},
+                    data=reuse_data,
+                )
 
-            step_ms = int((time.time() - step_start) * 1000)
-            update_step_status(
-                session, job_id, image_id, StepName.CLASSIFY.value,
-                StepStatus.COMPLETED.value, duration_ms=step_ms,
-                result_data={"label": classification["label"], "confidence": classification["confidence"]},
-            )
-            publish_step_update(
-                job_id, image_id, "classify", "completed",
-                progress={"completed": 2, "total": 5},
-                data={"label": classification["label"], "confidence": classification["confidence"]},
-            )
+            # ---- Step 2: Classification ----
+            raise_if_cancelled(job_id)
+            if StepName.CLASSIFY.value not in done:
+                with _stage_span(StepName.CLASSIFY.value):
+                    step_start = time.time()
+                    update_step_status(
+                        session, job_id, image_id, StepName.CLASSIFY.value, StepStatus.RUNNING.value
+                    )
+                    publish_step_update(job_id, image_id, "classify", "running")
+
+                    from ml.services.inference import run_classification
+
+                    if image_tensor is None:
+                        image_tensor = _load_image_tensor(image)
+                    classification = run_classification(image_tensor, version=clf_version)
+
+                    analysis.classification_label = classification["label"]
+                    analysis.classification_confidence = classification["confidence"]
+                    analysis.classification_scores = classification["scores"]
+                    analysis.model_version = classification.get(
+                        "model_version", "efficientnet-b4-v1"
+                    )
+                    session.commit()
+
+                    step_ms = int((time.time() - step_start) * 1000)
+                    summary = {
+                        "label": classification["label"],
+                        "confidence": classification["confidence"],
+                    }
+                    update_step_status(
+                        session, job_id, image_id, StepName.CLASSIFY.value,
+                        StepStatus.COMPLETED.value, duration_ms=step_ms, result_data=summary,
+                    )
+                    publish_step_update(
+                        job_id, image_id, "classify", "completed",
+                        progress={"completed": 2, "total": 5},
+                        data=summary,
+                    )
 
             # ---- Step 3: Attribute Extraction ----
-            step_start = time.time()
-            update_step_status(
-                session, job_id, image_id, StepName.EXTRACT_ATTRIBUTES.value,
-                StepStatus.RUNNING.value,
-            )
-            publish_step_update(job_id, image_id, "extract_attributes", "running")
-
-            from ml.services.inference import run_attribute_extraction
-            from shared.models.analysis import ExtractedAttribute
-
-            attributes = run_attribute_extraction(image_tensor, version=fe_version)
-            for attr in attributes:
-                session.add(ExtractedAttribute(
-                    analysis_result_id=analysis.id,
-                    attribute_name=attr["name"],
-                    attribute_value=attr["value"],
-                    confidence=attr["confidence"],
-                ))
-            session.commit()
+            raise_if_cancelled(job_id)
+            if StepName.EXTRACT_ATTRIBUTES.value in done:
+                attributes = _checkpointed_attributes(session, analysis)
+            else:
+                with _stage_span(StepName.EXTRACT_ATTRIBUTES.value):
+                    step_start = time.time()
+                    update_step_status(
+                        session, job_id, image_id, StepName.EXTRACT_ATTRIBUTES.value,
+                        StepStatus.RUNNING.value,
+                    )
+                    publish_step_update(job_id, image_id, "extract_attributes", "running")
 
-            step_ms = int((time.time() - step_start) * 1000)
-            update_step_status(
-                session, job_id, image_id, StepName.EXTRACT_ATTRIBUTES.value,
-                StepStatus.COMPLETED.value, duration_ms=step_ms,
-                result_data={"attributes_count": len(attributes)},
-            )
-            publish_step_update(
-                job_id, image_id, "extract_attributes", "completed",
-                progress={"completed": 3, "total": 5},
-                data={"attributes": attributes},
-            )
+                    from ml.services.inference import (
+                        run_attribute_extraction,
+                        run_feature_extraction,
+                    )
+                    from shared.image_embeddings import (
+                        load_image_embedding,
+                        upsert_image_embedding,
+                    )
 
-            # ---- Step 4: Defect Detection ----
-            step_start = time.time()
-            update_step_status(
-                session, job_id, image_id, StepName.DETECT_DEFECTS.value,
-                StepStatus.RUNNING.value,
-            )
-            publish_step_update(job_id, image_id, "detect_defects", "running")
-
-            from ml.services.inference import run_defect_detection
-            from shared.models.analysis import DetectedDefect
-
-            defects = run_defect_detection(image_tensor, version=dd_version)
-            for defect in defects:
-                session.add(DetectedDefect(
-                    analysis_result_id=analysis.id,
-                    defect_type=defect["type"],
-                    severity=defect["severity"],
-                    confidence=defect["confidence"],
-                    bounding_box=defect.get("bounding_box"),
-                    description=defect.get("description"),
-                ))
-            session.commit()
+                    if image_tensor is None:
+                        image_tensor = _load_image_tensor(image)
+
+                    # Reuse the stored backbone features when this extractor version produced them
+                    features = load_image_embedding(session, image.id, fe_version)
+                    embedding_reused = features is not None
+                    if not embedding_reused:
+                        features = run_feature_extraction(image_tensor, version=fe_version)
+                        session.execute(upsert_image_embedding(
+                            image.id, image.product_id, analysis.organization_id, fe_version,
+                            features,
+                        ))
+
+                    attributes = run_attribute_extraction(
+                        image_tensor, version=fe_version, features=features
+                    )
+                    # Replace rather than append, so a retried attempt leaves one set of rows
+                    session.execute(delete(ExtractedAttribute).where(
+                        ExtractedAttribute.analysis_result_id == analysis.id
+                    ))
+                    for attr in attributes:
+                        session.add(ExtractedAttribute(
+                            analysis_result_id=analysis.id,
+                            attribute_name=attr["name"],
+                            attribute_value=attr["value"],
+                            confidence=attr["confidence"],
+                        ))
+                    session.commit()
+
+                    step_ms = int((time.time() - step_start) * 1000)
+                    update_step_status(
+                        session, job_id, image_id, StepName.EXTRACT_ATTRIBUTES.value,
+                        StepStatus.COMPLETED.value, duration_ms=step_ms,
+                        result_data={
+                            "attributes_count": len(attributes),
+                            "embedding_reused": embedding_reused,
+                        },
+                    )
+                    publish_step_update(
+                        job_id, image_id, "extract_attributes", "completed",
+                        progress={"completed": 3, "total": 5},
+                        data={"attributes": attributes},
+                    )
 
-            step_ms = int((time.time() - step_start) * 1000)
-            update_step_status(
-                session, job_id, image_id, StepName.DETECT_DEFECTS.value,
-                StepStatus.COMPLETED.value, duration_ms=step_ms,
-                result_data={"defects_count": len(defects)},
-            )
-            publish_step_update(
-                job_id, image_id, "detect_defects", "completed",
-                progress={"completed": 4, "total": 5},
-                data={"defects_count": len(defects)},
-            )
+            # ---- Step 4: Defect Detection ----
+            raise_if_cancelled(job_id)
+            if StepName.DETECT_DEFECTS.value in done:
+                defects = _checkpointed_defects(session, analysis)
+            else:
+                with _stage_span(StepName.DETECT_DEFECTS.value):
+                    step_start = time.time()
+                    update_step_status(
+                        session, job_id, image_id, StepName.DETECT_DEFECTS.value,
+                        StepStatus.RUNNING.value,
+                    )
+                    publish_step_update(job_id, image_id, "detect_defects", "running")
+
+                    from ml.services.inference import run_defect_detection
+
+                    if image_tensor is None:
+                        image_tensor = _load_image_tensor(image)
+                    defects = run_defect_detection(image_tensor, version=dd_version)
+
+                    session.execute(delete(DetectedDefect).where(
+                        DetectedDefect.analysis_result_id == analysis.id
+                    ))
+                    for defect in defects:
+                        session.add(DetectedDefect(
+                            organization_id=analysis.organization_id,
+                            analysis_result_id=analysis.id,
+                            defect_type=defect["type"],
+                            severity=defect["severity"],
+                            confidence=defect["confidence"],
+                            bounding_box=defect.get("bounding_box"),
+                            description=defect.get("description"),
+                        ))
+                    session.commit()
+
+                    step_ms = int((time.time() - step_start) * 1000)
+                    update_step_status(
+                        session, job_id, image_id, StepName.DETECT_DEFECTS.value,
+                        StepStatus.COMPLETED.value, duration_ms=step_ms,
+                        result_data={"defects_count": len(defects)},
+                    )
+                    publish_step_update(
+                        job_id, image_id, "detect_defects", "completed",
+                        progress={"completed": 4, "total": 5},
+                        data={"defects_count": len(defects)},
+                    )
 
             # ---- Step 5: Description Generation ----
-            step_start = time.time()
-            update_step_status(
-                session, job_id, image_id, StepName.GENERATE_DESCRIPTION.value,
-                StepStatus.RUNNING.value,
-            )
-            publish_step_update(job_id, image_id, "generate_description", "running")
+            raise_if_cancelled(job_id)
+            with _stage_span(StepName.GENERATE_DESCRIPTION.value):
+                step_start = time.time()
+                update_step_status(
+                    session, job_id, image_id, StepName.GENERATE_DESCRIPTION.value,
+                    StepStatus.RUNNING.value,
+                )
+                publish_step_update(job_id, image_id, "generate_description", "running")
 
-            from ml.services.description_generator import generate_description
+                from ml.services.description_generator import generate_description
 
-            description_result = generate_description(
-                category=classification["label"],
-                attributes=attributes,
-                defects=defects,
-                s3_bucket=image.s3_bucket,
-                s3_key=image.s3_key,
-            )
+                description_result = generate_description(
+                    category=analysis.classification_label,
+                    attributes=attributes,
+                    defects=defects,
+                    s3_bucket=image.s3_bucket,
+                    s3_key=image.s3_key,
+                )
 
-            analysis.description_text = description_result["description"]
-            analysis.description_model = description_result["model"]
-            session.commit()
+                analysis.description_text = description_result["description"]
+                analysis.description_model = description_result["model"]
+                session.commit()
 
-            # Update product with AI data
-            product = session.execute(
-                select(Product).where(Product.id == image.product_id)
-            ).scalar_one()
-            product.category = classification["label"]
-            product.ai_description = description_result["description"]
-            product.status = "active"
-            session.commit()
+                _apply_to_product(session, image, analysis)
+                session.commit()
 
-            step_ms = int((time.time() - step_start) * 1000)
-            update_step_status(
-                session, job_id, image_id, StepName.GENERATE_DESCRIPTION.value,
-                StepStatus.COMPLETED.value, duration_ms=step_ms,
-            )
-            publish_step_update(
-                job_id, image_id, "generate_description", "completed",
-                progress={"completed": 5, "total": 5},
-            )
+                step_ms = int((time.time() - step_start) * 1000)
+                update_step_status(
+                    session, job_id, image_id, StepName.GENERATE_DESCRIPTION.value,
+                    StepStatus.COMPLETED.value, duration_ms=step_ms,
+                )
+                publish_step_update(
+                    job_id, image_id, "generate_description", "completed",
+                    progress={"completed": 5, "total": 5},
+                )
 
             # ---- Finalize ----
-            total_ms = int((time.time() - pipeline_start) * 1000)
-            analysis.processing_time_ms = total_ms
-            analysis.status = AnalysisStatus.COMPLETED.value
-            analysis.model_version = classification.get("model_version", "efficientnet-b4-v1")
-            if experiment_id:
-                analysis.experiment_id = experiment_id
-            if variant_id:
-                analysis.variant_id = variant_id
-
-            job.status = JobStatus.COMPLETED.value
-            job.processed_images = job.processed_images + 1
-            job.completed_at = datetime.now(UTC)
-            session.commit()
-
-            publish_job_complete(
-                job_id,
-                progress={"completed": job.processed_images, "total": job.total_images},
-            )
+            analysis.model_versions = model_versions
+            analysis.reused_from_id = None
+            if near_duplicate:
+                source = near_duplicate[0]
+                analysis.model_versions = near_duplicate_versions(model_versions, source)
+                analysis.reused_from_id = source.id
+            with _stage_span("finalize"):
+                _finalize(
+                    session, job, image, analysis, pipeline_start,
+                    defects_count=len(defects),
+                    experiment_id=experiment_id,
+                    variant_id=variant_id,
+                )
 
-            logger.info(
-                f"Completed processing for image={image_id} in {total_ms}ms"
-            )
+        except JobCancelledError:
+            logger.info(f"Job={job_id} was cancelled, stopping image={image_id}")
+            session.rollback()
+            _abandon_cancelled(session, job_id, image_id)
 
         except Exception as exc:
-            logger.exception(f"Failed processing image={image_id}: {exc}")
+            failure = classify_failure(exc)
+            # Permanent failures and exhausted retries are dead-lettered instead of retried
+            dead = failure.is_permanent or self.request.retries >= self.max_retries
+            logger.exception(
+                f"Failed processing image={image_id} "
+                f"({failure.kind.value}/{failure.category}, dead={dead}): {exc}"
+            )
             session.rollback()
 
-            # Mark as failed
+            job_finished = True
             try:
+                # The interrupted step is re-run on retry; completed ones are kept
+                failed_step = None
+                for step in session.execute(
+                    select(JobStep).where(
+                        JobStep.job_id == job_id,
+                        JobStep.product_image_id == image_id,
+                        JobStep.status == StepStatus.RUNNING.value,
+                    )
+                ).scalars():
+                    step.status = StepStatus.FAILED.value
+                    step.completed_at = datetime.now(UTC)
+                    step.error_message = str(exc)
+                    failed_step = step.step_name
+
                 analysis = session.execute(
                     select(AnalysisResult).where(
                         AnalysisResult.product_image_id == image_id
                     )
                 ).scalar_one_or_none()
                 if analysis:
-                    analysis.status = AnalysisStatus.FAILED.value
                     analysis.error_message = str(exc)
+                    if dead:
+                        analysis.status = AnalysisStatus.FAILED.value
+                        analysis.completed_at = datetime.now(UTC)
 
                 job = session.execute(
-                    select(ProcessingJob).where(ProcessingJob.id == job_id)
+                    select(ProcessingJob).where(ProcessingJob.id == job_id).with_for_update()
                 ).scalar_one_or_none()
-                if job:
-                    job.failed_images = job.failed_images + 1
-                    # Only mark job as failed if all images have been processed
-                    if job.processed_images + job.failed_images >= job.total_images:
-                        job.status = JobStatus.FAILED.value
-                        job.completed_at = datetime.now(UTC)
-                        job.error_message = str(exc)
+                if dead:
+                    session.add(DeadLetter(
+                        organization_id=(
+                            analysis.organization_id if analysis
+                            else job.organization_id if job else None
+                        ),
+                        job_id=job.id if job else None,
+                        product_image_id=analysis.product_image_id if analysis else None,
+                        task_name=self.name,
+                        task_kwargs={"user_id": user_id, "force_recompute": force_recompute},
+                        failure_kind=failure.kind.value,
+                        error_category=failure.category,
+                        error_type=type(exc).__name__,
+                        error_message=str(exc),
+                        traceback=format_traceback(exc),
+                        failed_step=failed_step,
+                        attempts=self.request.retries + 1,
+                    ))
+                    if job:
+                        job.failed_images = job.failed_images + 1
+                        # Only mark job as failed if all images have been processed
+                        finished = job.processed_images + job.failed_images >= job.total_images
+                        if finished and job.status != JobStatus.CANCELLED.value:
+                            job.status = JobStatus.FAILED.value
+                            job.completed_at = datetime.now(UTC)
+                            job.error_message = str(exc)
+                        job_finished = finished
                 session.commit()
             except Exception:
                 session.rollback()
 
-            publish_job_failed(job_id, str(exc))
+            if dead:
+                if job_finished:
+                    publish_job_failed(job_id, str(exc))
+                else:
+                    publish_image_failed(job_id, image_id, str(exc))
+                return
 
-            # Retry with exponential backoff for transient errors
+            # Retry transient errors with exponential backoff
             backoff = 2 ** self.request.retries * 30
+            retrying = True
             raise self.retry(exc=exc, countdown=backoff)
+
+        finally:
+            if org_id:
+                release_org_slot(org_id, lease_id)
+            if not retrying:
+                record_lane_completion(_task_lane(self))
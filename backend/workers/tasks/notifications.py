@@ -5,6 +5,7 @@ from datetime import UTC, datetime
 import redis
 
 from shared.config import get_settings
+from shared.job_events import job_events_key
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -14,6 +15,31 @@ def get_sync_redis():
     return redis.from_url(settings.redis_url, decode_responses=True)
 
 
+def append_job_event(job_id: str, message: dict) -> str:
+    """
+    Append an event to the job's capped Redis Stream.
+
+    The stream is the durable source for WebSocket and SSE consumers, so a
+    client that connects late or reconnects can replay from any offset.
+    Returns the assigned stream ID.
+    """
+    key = job_events_key(job_id)
+    r = get_sync_redis()
+    try:
+        pipe = r.pipeline()
+        pipe.xadd(
+            key,
+            {"data": json.dumps(message)},
+            maxlen=settings.job_events_stream_maxlen,
+            approximate=True,
+        )
+        pipe.expire(key, settings.job_events_ttl_seconds)
+        event_id, _ = pipe.execute()
+        return event_id
+    finally:
+        r.close()
+
+
 def publish_step_update(
     job_id: str,
     image_id: str | None,
@@ -22,7 +48,7 @@ def publish_step_update(
     progress: dict | None = None,
     data: dict | None = None,
 ):
-    """Publish a processing step update to Redis pub/sub."""
+    """Publish a processing step update to the job event stream."""
     message = {
         "type": "step_update",
         "job_id": job_id,
@@ -33,9 +59,33 @@ def publish_step_update(
         "data": data,
         "timestamp": datetime.now(UTC).isoformat(),
     }
-    r = get_sync_redis()
-    r.publish(f"job:{job_id}", json.dumps(message))
-    r.close()
+    append_job_event(job_id, message)
+
+
+def publish_image_complete(job_id: str, image_id: str, progress: dict | None = None):
+    """Publish the completion of one image of a job that still has images pending."""
+    message = {
+        "type": "image_complete",
+        "job_id": job_id,
+        "image_id": image_id,
+        "status": "completed",
+        "progress": progress,
+        "timestamp": datetime.now(UTC).isoformat(),
+    }
+    append_job_event(job_id, message)
+
+
+def publish_image_failed(job_id: str, image_id: str, error: str):
+    """Publish the failure of one image of a job that still has images pending."""
+    message = {
+        "type": "image_failed",
+        "job_id": job_id,
+        "image_id": image_id,
+        "status": "failed",
+        "data": {"error": error},
+        "timestamp": datetime.now(UTC).isoformat(),
+    }
+    append_job_event(job_id, message)
 
 
 def publish_job_complete(job_id: str, progress: dict | None = None):
@@ -47,9 +97,7 @@ def publish_job_complete(job_id: str, progress: dict | None = None):
         "progress": progress,
         "timestamp": datetime.now(UTC).isoformat(),
     }
-    r = get_sync_redis()
-    r.publish(f"job:{job_id}", json.dumps(message))
-    r.close()
+    append_job_event(job_id, message)
 
     # Dispatch webhooks for job completion
     _dispatch_job_webhooks(job_id, "job.completed", progress)
@@ -64,9 +112,7 @@ def publish_job_failed(job_id: str, error: str):
         "data": {"error": error},
         "timestamp": datetime.now(UTC).isoformat(),
     }
-    r = get_sync_redis()
-    r.publish(f"job:{job_id}", json.dumps(message))
-    r.close()
+    append_job_event(job_id, message)
 
     # Dispatch webhooks for job failure
     _dispatch_job_webhooks(job_id, "job.failed", {"error": error})
@@ -78,34 +124,17 @@ def _dispatch_job_webhooks(job_id: str, event_type: str, data: dict | None = Non
         from sqlalchemy import select
 
         from shared.models.pipeline import ProcessingJob
-        from shared.models.product import Product, ProductImage
         from shared.models.webhook import WebhookEndpoint
         from workers.celery_app import get_sync_session
         from workers.tasks.webhook_delivery import deliver_webhook
 
         with get_sync_session() as session:
-            job = session.execute(
-                select(ProcessingJob).where(ProcessingJob.id == job_id)
-            ).scalar_one_or_none()
-            if not job:
-                return
-
-            # Find org via the first image's product
-            image = session.execute(
-                select(ProductImage).where(ProductImage.id == job.product_image_ids[0])
-            ).scalar_one_or_none() if job.product_image_ids else None
-
-            if not image:
-                return
-
-            product = session.execute(
-                select(Product).where(Product.id == image.product_id)
+            org_id = session.execute(
+                select(ProcessingJob.organization_id).where(ProcessingJob.id == job_id)
             ).scalar_one_or_none()
-            if not product or not product.organization_id:
+            if not org_id:
                 return
 
-            org_id = product.organization_id
-
             # Find active webhooks that subscribe to this event
             webhooks = session.execute(
                 select(WebhookEndpoint).where(
@@ -0,0 +1,230 @@
+import logging
+from datetime import UTC, datetime, timedelta
+
+from celery import shared_task
+
+from shared.config import get_settings
+from workers.celery_app import get_sync_session
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@shared_task
+def reconcile_org_stats():
+    """
+    Recompute every organization's dashboard counters from source tables.
+
+    Incremental updates keep the counters current between runs; this pass
+    corrects any drift (failed pipeline runs, manual data fixes, increments
+    racing with a previous reconcile).
+    """
+    from sqlalchemy import select
+
+    from shared.models.organization import Organization
+    from shared.org_stats import merge_stats_rows, set_org_stats, stats_queries
+
+    with get_sync_session() as session:
+        org_ids = session.execute(select(Organization.id)).scalars().all()
+
+        rows = []
+        for query in stats_queries():
+            rows.extend(session.execute(query).all())
+
+        stats = merge_stats_rows(rows, org_ids)
+        for org_id, values in stats.items():
+            session.execute(set_org_stats(org_id, values))
+        session.commit()
+
+    logger.info(f"Reconciled dashboard stats for {len(stats)} organizations")
+    return len(stats)
+
+
+def _aggregate_hourly(session, start, end) -> dict:
+    """
+    Aggregate analysis results finished in ``[start, end)`` per hour bucket.
+
+    Results are bucketed by ``completed_at``, which later edits of the row do
+    not move, so a result is never counted again in a later hour.
+
+    Returns ``{(org_id, bucket_start, category): values}`` where values hold
+    the rollup counters and the latency histogram.
+    """
+    from sqlalchemy import Integer, bindparam, func, select
+    from sqlalchemy.dialects.postgresql import ARRAY
+
+    from shared.analytics import (
+        FALLBACK_DESCRIPTION_MODEL,
+        LATENCY_BUCKET_BOUNDS_MS,
+        UNCATEGORIZED,
+        empty_histogram,
+    )
+    from shared.constants import AnalysisStatus
+    from shared.models.analysis import AnalysisResult, DetectedDefect
+    from shared.models.product import Product, ProductImage
+
+    completed = AnalysisStatus.COMPLETED.value
+    defect_count = (
+        select(func.count(DetectedDefect.id))
+        .where(DetectedDefect.analysis_result_id == AnalysisResult.id)
+        .scalar_subquery()
+    )
+    finished = (
+        select(
+            AnalysisResult.organization_id.label("organization_id"),
+            func.date_trunc("hour", AnalysisResult.completed_at).label("bucket_start"),
+            func.coalesce(Product.category, UNCATEGORIZED).label("category"),
+            AnalysisResult.status.label("status"),
+            AnalysisResult.processing_time_ms.label("processing_time_ms"),
+            AnalysisResult.description_model.label("description_model"),
+            defect_count.label("defect_count"),
+        )
+        .join(ProductImage, AnalysisResult.product_image_id == ProductImage.id)
+        .join(Product, ProductImage.product_id == Product.id)
+        .where(
+            AnalysisResult.completed_at >= start,
+            AnalysisResult.completed_at < end,
+            AnalysisResult.status.in_([completed, AnalysisStatus.FAILED.value]),
+        )
+        .subquery()
+    )
+    is_completed = finished.c.status == completed
+    keys = (finished.c.organization_id, finished.c.bucket_start, finished.c.category)
+
+    counters = session.execute(
+        select(
+            *keys,
+            func.count().filter(is_completed).label("images_processed"),
+            func.count().filter(finished.c.status != completed).label("images_failed"),
+            func.count().filter(is_completed, finished.c.defect_count > 0).label(
+                "images_with_defects"
+            ),
+            func.coalesce(func.sum(finished.c.defect_count).filter(is_completed), 0).label(
+                "defect_count"
+            ),
+            func.count()
+            .filter(is_completed, finished.c.description_model == FALLBACK_DESCRIPTION_MODEL)
+            .label("fallback_descriptions"),
+            func.coalesce(func.sum(finished.c.processing_time_ms).filter(is_completed), 0).label(
+                "processing_time_total_ms"
+            ),
+        ).group_by(*keys)
+    ).all()
+
+    latency_bucket = func.width_bucket(
+        finished.c.processing_time_ms,
+        bindparam("latency_bounds", list(LATENCY_BUCKET_BOUNDS_MS), type_=ARRAY(Integer)),
+    )
+    histogram_rows = session.execute(
+        select(*keys, latency_bucket.label("latency_bucket"), func.count().label("count"))
+        .where(is_completed, finished.c.processing_time_ms.isnot(None))
+        .group_by(*keys, latency_bucket)
+    ).all()
+
+    rollups = {}
+    for row in counters:
+        values = dict(row._mapping)
+        key = (values.pop("organization_id"), values.pop("bucket_start"), values.pop("category"))
+        values["latency_histogram"] = empty_histogram()
+        rollups[key] = values
+    for row in histogram_rows:
+        key = (row.organization_id, row.bucket_start, row.category)
+        if key in rollups:
+            rollups[key]["latency_histogram"][row.latency_bucket] += row.count
+    return rollups
+
+
+def _aggregate_daily(hourly_rows) -> dict:
+    """Fold hourly rollup rows into UTC day buckets."""
+    from shared.analytics import ROLLUP_COUNTERS, merge_histograms
+
+    daily = {}
+    for row in hourly_rows:
+        day = row.bucket_start.astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        values = daily.setdefault(
+            (row.organization_id, day, row.category),
+            {name: 0 for name in ROLLUP_COUNTERS} | {"latency_histogram": None},
+        )
+        for name in ROLLUP_COUNTERS:
+            values[name] += getattr(row, name)
+        values["latency_histogram"] = merge_histograms(
+            [values["latency_histogram"], row.latency_histogram]
+        )
+    return daily
+
+
+@shared_task
+def rollup_analytics(lookback_hours: int | None = None):
+    """
+    Rebuild the hourly and daily analytics rollups for a recent window.
+
+    The last ``lookback_hours`` hour buckets are recomputed from
+    ``analysis_results`` and the UTC days they touch are re-derived from the
+    hourly rows, all in one transaction, so the task is idempotent and late
+    finishing results are picked up by the next run. Pass a larger
+    ``lookback_hours`` to backfill history.
+    """
+    from sqlalchemy import delete, select
+
+    from shared.constants import RollupGranularity
+    from shared.models.stats import AnalyticsRollup
+
+    lookback = lookback_hours or settings.analytics_rollup_lookback_hours
+    end = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    start = end - timedelta(hours=lookback)
+    day_start = start.replace(hour=0)
+    day_end = (end - timedelta(microseconds=1)).replace(hour=0) + timedelta(days=1)
+
+    hour = RollupGranularity.HOUR.value
+    day = RollupGranularity.DAY.value
+
+    with get_sync_session() as session:
+        hourly = _aggregate_hourly(session, start, end)
+
+        session.execute(
+            delete(AnalyticsRollup).where(
+                AnalyticsRollup.granularity == hour,
+                AnalyticsRollup.bucket_start >= start,
+                AnalyticsRollup.bucket_start < end,
+            )
+        )
+        for (org_id, bucket_start, category), values in hourly.items():
+            session.add(AnalyticsRollup(
+                organization_id=org_id,
+                granularity=hour,
+                bucket_start=bucket_start,
+                category=category,
+                **values,
+            ))
+        session.flush()
+
+        hourly_rows = session.execute(
+            select(AnalyticsRollup).where(
+                AnalyticsRollup.granularity == hour,
+                AnalyticsRollup.bucket_start >= day_start,
+                AnalyticsRollup.bucket_start < day_end,
+            )
+        ).scalars().all()
+        daily = _aggregate_daily(hourly_rows)
+
+        session.execute(
+            delete(AnalyticsRollup).where(
+                AnalyticsRollup.granularity == day,
+                AnalyticsRollup.bucket_start >= day_start,
+                AnalyticsRollup.bucket_start < day_end,
+            )
+        )
+        for (org_id, bucket_start, category), values in daily.items():
+            session.add(AnalyticsRollup(
+                organization_id=org_id,
+                granularity=day,
+                bucket_start=bucket_start,
+                category=category,
+                **values,
+            ))
+        session.commit()
+
+    logger.info(
+        f"Rolled up analytics for {len(hourly)} hourly and {len(daily)} daily buckets"
+    )
+    return {"hourly": len(hourly), "daily": len(daily)}
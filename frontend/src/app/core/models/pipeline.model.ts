@@ -1,5 +1,6 @@
 export interface JobStep {
   id: string;
+  product_image_id: string | null;
   step_name: string;
   status: string;
   started_at: string | null;
@@ -9,6 +10,14 @@ export interface JobStep {
   result_data: Record<string, unknown>;
 }
 
+export interface JobStepSummary {
+  step_name: string;
+  total: number;
+  counts: Record<string, number>;
+  p50_duration_ms: number | null;
+  p95_duration_ms: number | null;
+}
+
 export interface ProcessingJob {
   id: string;
   user_id: string;
@@ -21,13 +30,14 @@ export interface ProcessingJob {
   started_at: string | null;
   completed_at: string | null;
   error_message: string | null;
-  steps: JobStep[];
+  step_summary: JobStepSummary[];
   created_at: string;
   updated_at: string;
 }
 
 export interface ProcessingUpdate {
-  type: 'step_update' | 'job_complete' | 'job_failed';
+  type: 'step_update' | 'image_complete' | 'image_failed' | 'job_complete' | 'job_failed';
+  event_id?: string;
   job_id: string;
   image_id?: string;
   step?: string;
@@ -44,6 +54,8 @@ export interface DashboardStats {
   total_defects: number;
   active_jobs: number;
   avg_processing_time_ms: number | null;
+  reused_analyses?: number;
+  analysis_reuse_rate?: number | null;
 }
 
 export interface CategoryDistribution {
@@ -22,6 +22,7 @@ export interface Product {
   ai_description: string | null;
   status: string;
   metadata_: Record<string, unknown>;
+  facets?: Record<string, string[]>;
   images: ProductImage[];
   created_at: string;
   updated_at: string;
@@ -30,9 +31,37 @@ export interface Product {
 export interface ProductListResponse {
   items: Product[];
   total: number;
+  total_is_estimate?: boolean;
   page: number;
   page_size: number;
   pages: number;
+  next_cursor?: string | null;
+  facet_counts?: Record<string, FacetCount[]>;
+}
+
+export interface FacetCount {
+  value: string;
+  count: number;
+}
+
+export interface SimilarProduct {
+  product: Product;
+  similarity: number;
+}
+
+export interface SimilarProductsResponse {
+  items: SimilarProduct[];
+}
+
+export interface DuplicateGroup {
+  image_ids: string[];
+  products: Product[];
+}
+
+export interface DuplicateReportResponse {
+  groups: DuplicateGroup[];
+  next_cursor: string | null;
+  max_distance: number;
 }
 
 export interface ProductCreate {
@@ -2,9 +2,15 @@ import { Injectable } from '@angular/core';
 import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
 import { environment } from '../../../environments/environment';
-import { Product, ProductCreate, ProductListResponse } from '../models/product.model';
+import {
+  DuplicateReportResponse,
+  Product,
+  ProductCreate,
+  ProductListResponse,
+  SimilarProductsResponse,
+} from '../models/product.model';
 import { AnalysisResult } from '../models/analysis.model';
-import { ProcessingJob, DashboardStats, CategoryDistribution } from '../models/pipeline.model';
+import { ProcessingJob, JobStep, DashboardStats, CategoryDistribution } from '../models/pipeline.model';
 
 @Injectable({ providedIn: 'root' })
 export class ApiService {
@@ -43,6 +49,32 @@ export class ApiService {
     return this.http.get<AnalysisResult[]>(`${this.apiUrl}/products/${productId}/analysis`);
   }
 
+  getSimilarProducts(productId: string, limit = 10): Observable<SimilarProductsResponse> {
+    const params = new HttpParams().set('limit', limit);
+    return this.http.get<SimilarProductsResponse>(
+      `${this.apiUrl}/products/${productId}/similar`, { params }
+    );
+  }
+
+  getDuplicateProducts(
+    maxDistance?: number, limit = 50, cursor?: string
+  ): Observable<DuplicateReportResponse> {
+    let params = new HttpParams().set('limit', limit);
+    if (maxDistance !== undefined) params = params.set('max_distance', maxDistance);
+    if (cursor) params = params.set('cursor', cursor);
+    return this.http.get<DuplicateReportResponse>(`${this.apiUrl}/products/duplicates`, { params });
+  }
+
+  // --- Search ---
+  searchByImage(file: File, limit = 10): Observable<SimilarProductsResponse> {
+    const formData = new FormData();
+    formData.append('file', file);
+    const params = new HttpParams().set('limit', limit);
+    return this.http.post<SimilarProductsResponse>(
+      `${this.apiUrl}/search/by-image`, formData, { params }
+    );
+  }
+
   // --- Uploads ---
   getPresignedUrl(data: {
     product_id: string;
@@ -99,6 +131,16 @@ export class ApiService {
     return this.http.get<ProcessingJob>(`${this.apiUrl}/jobs/${id}`);
   }
 
+  getJobSteps(id: string, params?: Record<string, string>): Observable<{ items: JobStep[]; total: number }> {
+    let httpParams = new HttpParams();
+    if (params) {
+      Object.entries(params).forEach(([key, value]) => {
+        if (value) httpParams = httpParams.set(key, value);
+      });
+    }
+    return this.http.get<any>(`${this.apiUrl}/jobs/${id}/steps`, { params: httpParams });
+  }
+
   // --- Dashboard ---
   getDashboardStats(): Observable<DashboardStats> {
     return this.http.get<DashboardStats>(`${this.apiUrl}/dashboard/stats`);
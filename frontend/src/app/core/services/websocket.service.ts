@@ -8,13 +8,16 @@ import { ProcessingUpdate } from '../models/pipeline.model';
 @Injectable({ providedIn: 'root' })
 export class WebSocketService {
   private socket: WebSocket | null = null;
+  private lastEventIds = new Map<string, string>();
 
   constructor(private authService: AuthService) {}
 
   connect(jobId: string): Observable<ProcessingUpdate> {
     const subject = new Subject<ProcessingUpdate>();
     const token = this.authService.getToken();
-    const wsUrl = `${environment.wsUrl}/processing/${jobId}?token=${token}`;
+    const lastEventId = this.lastEventIds.get(jobId);
+    const resume = lastEventId ? `&last_event_id=${encodeURIComponent(lastEventId)}` : '';
+    const wsUrl = `${environment.wsUrl}/processing/${jobId}?token=${token}${resume}`;
 
     this.disconnect();
 
@@ -23,9 +26,13 @@ export class WebSocketService {
     this.socket.onmessage = (event) => {
       try {
         const data: ProcessingUpdate = JSON.parse(event.data);
+        if (data.event_id) {
+          this.lastEventIds.set(jobId, data.event_id);
+        }
         subject.next(data);
 
         if (data.type === 'job_complete' || data.type === 'job_failed') {
+          this.lastEventIds.delete(jobId);
           subject.complete();
           this.disconnect();
         }
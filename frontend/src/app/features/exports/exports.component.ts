@@ -28,6 +28,9 @@ import { ExportJob } from '../../core/models/export.model';
           <button mat-menu-item (click)="createExport('analysis_csv')">
             <mat-icon>analytics</mat-icon> Analysis Results (CSV)
           </button>
+          <button mat-menu-item (click)="createExport('analysis_parquet')">
+            <mat-icon>table_chart</mat-icon> Analysis Results (Parquet)
+          </button>
           <button mat-menu-item (click)="createExport('products_csv')">
             <mat-icon>inventory_2</mat-icon> Products (CSV)
           </button>
@@ -1,7 +1,8 @@
 """
 Seed data script for ImagineAI development environment.
 
-Creates demo users, products, images, analysis results, and processing jobs.
+Creates demo users, an organization, products, images, analysis results, and
+processing jobs.
 Designed to be run inside the FastAPI Docker container:
 
     docker compose exec fastapi python scripts/seed_data.py
@@ -27,6 +28,7 @@ sys.path.insert(0, "/app/backend")
 
 from fastapi_app.services.auth_service import hash_password
 from shared.config import get_settings
+from shared.constants import OrgRole
 from shared.database import async_session_factory, engine
 from shared.models import (
     AnalysisResult,
@@ -35,6 +37,8 @@ from shared.models import (
     ExtractedAttribute,
     ProcessingJob,
     JobStep,
+    Organization,
+    OrganizationMember,
     Product,
     ProductImage,
     User,
@@ -46,6 +50,8 @@ settings = get_settings()
 # Seed data definitions
 # ---------------------------------------------------------------------------
 
+ORGANIZATION = {"name": "ImagineAI Demo", "slug": "imagineai-demo", "plan": "pro"}
+
 USERS = [
     {
         "email": "admin@imagineai.com",
@@ -255,16 +261,32 @@ async def seed_users(session: AsyncSession) -> dict[str, User]:
     return users
 
 
+async def seed_organization(session: AsyncSession, owner: User) -> Organization:
+    """Create the demo organization, owned by the given user."""
+    org = Organization(id=uuid.uuid4(), **ORGANIZATION)
+    session.add(org)
+    await session.flush()
+
+    session.add(
+        OrganizationMember(organization_id=org.id, user_id=owner.id, role=OrgRole.OWNER.value)
+    )
+    await session.flush()
+    print(f"  [+] Organization: {org.name} (owner={owner.email})")
+    return org
+
+
 async def seed_products(
     session: AsyncSession,
     owner: User,
+    org: Organization,
 ) -> list[Product]:
-    """Create demo products assigned to the given user."""
+    """Create demo products assigned to the given user and organization."""
     products: list[Product] = []
     for product_data in PRODUCTS:
         product = Product(
             id=uuid.uuid4(),
             user_id=owner.id,
+            organization_id=org.id,
             title=product_data["title"],
             description=product_data["description"],
             category=product_data["category"],
@@ -317,6 +339,7 @@ async def seed_images(
 
 async def seed_analysis_results(
     session: AsyncSession,
+    org: Organization,
     images_map: dict[int, list[ProductImage]],
 ) -> dict[int, AnalysisResult]:
     """Create analysis results for products that have analysis data defined."""
@@ -327,6 +350,7 @@ async def seed_analysis_results(
         primary_image = images_map[product_idx][0]
         analysis = AnalysisResult(
             id=uuid.uuid4(),
+            organization_id=org.id,
             product_image_id=primary_image.id,
             model_version="v1.2.0",
             classification_label=data["label"],
@@ -389,6 +413,7 @@ async def seed_defects(
             session.add(
                 DetectedDefect(
                     id=uuid.uuid4(),
+                    organization_id=analysis.organization_id,
                     analysis_result_id=analysis.id,
                     defect_type=defect["defect_type"],
                     severity=defect["severity"],
@@ -406,6 +431,7 @@ async def seed_defects(
 async def seed_processing_jobs(
     session: AsyncSession,
     demo_user: User,
+    org: Organization,
     images_map: dict[int, list[ProductImage]],
 ) -> None:
     """Create processing jobs in various statuses."""
@@ -415,6 +441,7 @@ async def seed_processing_jobs(
     job1 = ProcessingJob(
         id=uuid.uuid4(),
         user_id=demo_user.id,
+        organization_id=org.id,
         job_type="batch",
         status="completed",
         total_images=5,
@@ -433,6 +460,7 @@ async def seed_processing_jobs(
         session.add(
             JobStep(
                 id=uuid.uuid4(),
+                organization_id=org.id,
                 job_id=job1.id,
                 product_image_id=images_map[0][0].id,
                 step_name=step_name,
@@ -449,6 +477,7 @@ async def seed_processing_jobs(
     job2 = ProcessingJob(
         id=uuid.uuid4(),
         user_id=demo_user.id,
+        organization_id=org.id,
         job_type="batch",
         status="processing",
         total_images=3,
@@ -465,6 +494,7 @@ async def seed_processing_jobs(
         session.add(
             JobStep(
                 id=uuid.uuid4(),
+                organization_id=org.id,
                 job_id=job2.id,
                 product_image_id=images_map[2][0].id,
                 step_name=step_name,
@@ -481,6 +511,7 @@ async def seed_processing_jobs(
     job3 = ProcessingJob(
         id=uuid.uuid4(),
         user_id=demo_user.id,
+        organization_id=org.id,
         job_type="single",
         status="queued",
         total_images=1,
@@ -496,6 +527,7 @@ async def seed_processing_jobs(
         session.add(
             JobStep(
                 id=uuid.uuid4(),
+                organization_id=org.id,
                 job_id=job3.id,
                 product_image_id=images_map[5][0].id,
                 step_name=step_name,
@@ -528,33 +560,37 @@ async def main() -> None:
                 return
 
             # Seed users
-            print("[1/7] Seeding users...")
+            print("[1/8] Seeding users...")
             users = await seed_users(session)
             demo_user = users["demo@imagineai.com"]
 
+            # Seed the organization (owned by demo user)
+            print("\n[2/8] Seeding organization...")
+            org = await seed_organization(session, demo_user)
+
             # Seed products (assigned to demo user)
-            print("\n[2/7] Seeding products...")
-            products = await seed_products(session, demo_user)
+            print("\n[3/8] Seeding products...")
+            products = await seed_products(session, demo_user, org)
 
             # Seed product images
-            print("\n[3/7] Seeding product images...")
+            print("\n[4/8] Seeding product images...")
             images_map = await seed_images(session, products)
 
             # Seed analysis results
-            print("\n[4/7] Seeding analysis results...")
-            analysis_map = await seed_analysis_results(session, images_map)
+            print("\n[5/8] Seeding analysis results...")
+            analysis_map = await seed_analysis_results(session, org, images_map)
 
             # Seed extracted attributes
-            print("\n[5/7] Seeding extracted attributes...")
+            print("\n[6/8] Seeding extracted attributes...")
             await seed_attributes(session, analysis_map)
 
             # Seed detected defects
-            print("\n[6/7] Seeding detected defects...")
+            print("\n[7/8] Seeding detected defects...")
             await seed_defects(session, analysis_map)
 
             # Seed processing jobs
-            print("\n[7/7] Seeding processing jobs...")
-            await seed_processing_jobs(session, demo_user, images_map)
+            print("\n[8/8] Seeding processing jobs...")
+            await seed_processing_jobs(session, demo_user, org, images_map)
 
             # Commit all changes
             await session.commit()